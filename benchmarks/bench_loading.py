@@ -0,0 +1,15 @@
+"""Benchmarks of the player loading."""
+
+from kickeststats.player import Player
+
+from .conftest import get_players
+
+
+def bench_from_jsonl(benchmark, players_jsonl_filepath):
+    """Player.from_jsonl."""
+    benchmark(Player.from_jsonl, players_jsonl_filepath)
+
+
+def bench_from_list_to_df(benchmark, number_of_players):
+    """Player.from_list_to_df."""
+    benchmark(Player.from_list_to_df, get_players(number_of_players))
@@ -0,0 +1,72 @@
+"""Benchmarks of the HTML parsers, on the saved and synthetic tables."""
+
+from typing import Dict
+
+import pytest
+
+from kickeststats.helpers.parsers import (
+    ElementParser,
+    HeaderParser,
+    RowParser,
+    TableParser,
+)
+from kickeststats.helpers.synthetic import render_stats_table
+
+from .conftest import TABLE_FILEPATH, get_players_data
+
+TABLE_HEADER_ID = "statsTableTHead"
+TABLE_DATA_ID = "statsTableTBody"
+
+
+def _get_table(html: str) -> Dict[str, str]:
+    parser = ElementParser(TABLE_HEADER_ID, TABLE_DATA_ID)
+    parser.feed(html)
+    return {"header": parser.out(TABLE_HEADER_ID), "data": parser.out(TABLE_DATA_ID)}
+
+
+@pytest.fixture(scope="session")
+def saved_table():
+    """Saved statistics table."""
+    with open(TABLE_FILEPATH) as fp:
+        return fp.read()
+
+
+@pytest.fixture(scope="session")
+def synthetic_table(number_of_players):
+    """Synthetic statistics table."""
+    return render_stats_table(get_players_data(number_of_players))
+
+
+def _parse_table(table: Dict[str, str]) -> list:
+    parser = TableParser()
+    parser.feed(table["header"])
+    parser.feed(table["data"])
+    return parser.out()
+
+
+def _parse_table_legacy(table: Dict[str, str]) -> list:
+    header_parser = HeaderParser()
+    header_parser.feed(table["header"])
+    row_parser = RowParser()
+    row_parser.feed(table["data"])
+    return row_parser.out(header_parser.out())
+
+
+def bench_element_parser(benchmark, saved_table):
+    """ElementParser extracting the table from the saved page."""
+    benchmark(_get_table, saved_table)
+
+
+def bench_table_parser(benchmark, saved_table):
+    """TableParser on the saved table."""
+    benchmark(_parse_table, _get_table(saved_table))
+
+
+def bench_table_parser_legacy(benchmark, saved_table):
+    """HeaderParser and RowParser on the saved table."""
+    benchmark(_parse_table_legacy, _get_table(saved_table))
+
+
+def bench_table_parser_synthetic(benchmark, synthetic_table):
+    """TableParser on synthetic tables."""
+    benchmark(_parse_table, _get_table(synthetic_table))
@@ -0,0 +1,24 @@
+"""Benchmarks of the team scoring."""
+
+import pytest
+
+from kickeststats.match_day import MatchDay
+from kickeststats.team import SUPPORTED_ENGINES, score_teams
+
+from .conftest import get_players, get_teams
+
+
+@pytest.mark.parametrize("engine", sorted(SUPPORTED_ENGINES))
+def bench_team_points(benchmark, engine, number_of_players):
+    """Team.points against a list of players, indexed at each call."""
+    team = get_teams(1, engine)[0]
+    players = get_players(number_of_players)
+    benchmark(team.points, players)
+
+
+@pytest.mark.parametrize("engine", sorted(SUPPORTED_ENGINES))
+def bench_score_teams(benchmark, engine, number_of_teams):
+    """score_teams against a match day shared across teams."""
+    teams = get_teams(number_of_teams, engine)
+    players = get_players(550)
+    benchmark(lambda: score_teams(teams, MatchDay(players)))
@@ -0,0 +1,81 @@
+"""Fixtures for the benchmarks, sizes are configurable with env variables."""
+
+import os
+from functools import lru_cache
+from typing import List
+
+import pkg_resources
+import pytest
+
+from kickeststats.helpers.data import iter_jsonl
+from kickeststats.helpers.synthetic import (
+    generate_players_data,
+    generate_teams,
+    write_players_jsonl,
+)
+from kickeststats.player import Player
+from kickeststats.team import Team
+
+TEST_CASE_JSONL_FILEPATH = pkg_resources.resource_filename(
+    "kickeststats", "resources/tests/players_test_case.jsonl"
+)
+TABLE_FILEPATH = pkg_resources.resource_filename(
+    "kickeststats", "resources/tests/stats_table.html"
+)
+BENCHMARK_PLAYERS = [
+    int(number_of_players)
+    for number_of_players in os.environ.get(
+        "KICKESTSTATS_BENCHMARK_PLAYERS", "550,50000"
+    ).split(",")
+]
+BENCHMARK_TEAMS = [
+    int(number_of_teams)
+    for number_of_teams in os.environ.get(
+        "KICKESTSTATS_BENCHMARK_TEAMS", "1,100"
+    ).split(",")
+]
+RANDOM_STATE = 42
+
+
+@lru_cache(maxsize=None)
+def get_players_data(number_of_players: int) -> List[dict]:
+    """Synthetic player statistics, resampled from the test case."""
+    return generate_players_data(
+        next(iter_jsonl(TEST_CASE_JSONL_FILEPATH)),
+        number_of_players,
+        random_state=RANDOM_STATE,
+    )
+
+
+@lru_cache(maxsize=None)
+def get_players(number_of_players: int) -> List[Player]:
+    """Synthetic players."""
+    return [Player.from_dict(player) for player in get_players_data(number_of_players)]
+
+
+@lru_cache(maxsize=None)
+def get_teams(number_of_teams: int, engine: str) -> List[Team]:
+    """Synthetic teams, picked from the test case players."""
+    return generate_teams(
+        get_players(550), number_of_teams, random_state=RANDOM_STATE, engine=engine
+    )
+
+
+@pytest.fixture(scope="session", params=BENCHMARK_PLAYERS)
+def number_of_players(request):
+    """Number of players in a match day."""
+    return request.param
+
+
+@pytest.fixture(scope="session", params=BENCHMARK_TEAMS)
+def number_of_teams(request):
+    """Number of teams evaluated."""
+    return request.param
+
+
+@pytest.fixture(scope="session")
+def players_jsonl_filepath(tmp_path_factory, number_of_players):
+    """JSONL file with synthetic player statistics."""
+    filepath = str(tmp_path_factory.mktemp("players") / f"{number_of_players}.jsonl")
+    write_players_jsonl(get_players_data(number_of_players), filepath)
+    return filepath
@@ -0,0 +1,144 @@
+"""Page cache utilities for resumable downloads."""
+
+import json
+import os
+import shutil
+from hashlib import md5
+from typing import List, NamedTuple, Optional
+
+from .helpers.parsers import PaginationParser, TableParser
+
+
+class Page(NamedTuple):
+    """Inner HTML of the statistics table elements in a page."""
+
+    header: str
+    data: str
+    pagination: str
+
+
+def parse_pages(pages: List[Page]) -> List[dict]:
+    """
+    Parse the players statistics in pages.
+
+    Args:
+        pages (List[Page]): pages, the header is read from the first one.
+
+    Returns:
+        List[dict]: list of player statistics.
+    """
+    if not pages:
+        return []
+    header_parser = TableParser()
+    header_parser.feed(pages[0].header)
+    header_parser.close()
+    players_data = []
+    for page in pages:
+        parser = TableParser(header_parser.header)
+        parser.feed(page.data)
+        players_data.extend(parser.out())
+    return players_data
+
+
+class PageCache:
+    """Cache of the pages of the statistics table on disk, by URL and page."""
+
+    def __init__(self, dirpath: str) -> None:
+        """
+        Initialize the cache.
+
+        Args:
+            dirpath (str): path to the cache directory.
+        """
+        self.dirpath = dirpath
+        os.makedirs(dirpath, exist_ok=True)
+
+    def _get_dirpath(self, url: str) -> str:
+        """Directory for the pages of a URL, the URL includes the match day."""
+        return os.path.join(self.dirpath, md5(url.encode("utf-8")).hexdigest())
+
+    def _get_filepath(self, url: str, page: int) -> str:
+        return os.path.join(self._get_dirpath(url), f"{page}.json")
+
+    def get(self, url: str, page: int) -> Optional[Page]:
+        """
+        Get a page.
+
+        Args:
+            url (str): statistics URL, see get_url.
+            page (int): page number.
+
+        Returns:
+            Optional[Page]: the page, None if not cached.
+        """
+        filepath = self._get_filepath(url, page)
+        if not os.path.exists(filepath):
+            return None
+        with open(filepath) as fp:
+            return Page(**json.load(fp)["page"])
+
+    def put(self, url: str, page: int, content: Page) -> None:
+        """
+        Put a page, atomically.
+
+        Args:
+            url (str): statistics URL, see get_url.
+            page (int): page number.
+            content (Page): the page.
+        """
+        filepath = self._get_filepath(url, page)
+        os.makedirs(os.path.dirname(filepath), exist_ok=True)
+        temporary_filepath = f"{filepath}.tmp"
+        with open(temporary_filepath, "wt") as fp:
+            json.dump({"url": url, "page": content._asdict()}, fp)
+        os.replace(temporary_filepath, filepath)
+
+    def pages(self, url: str) -> List[int]:
+        """
+        Get the cached pages.
+
+        Args:
+            url (str): statistics URL, see get_url.
+
+        Returns:
+            List[int]: sorted page numbers.
+        """
+        dirpath = self._get_dirpath(url)
+        if not os.path.isdir(dirpath):
+            return []
+        return sorted(
+            int(filename[: -len(".json")])
+            for filename in os.listdir(dirpath)
+            if filename.endswith(".json")
+        )
+
+    def load(self, url: str) -> Optional[List[dict]]:
+        """
+        Load a complete download.
+
+        Args:
+            url (str): statistics URL, see get_url.
+
+        Returns:
+            Optional[List[dict]]: list of player statistics, None if some pages
+                are not cached.
+        """
+        cached_pages = self.pages(url)
+        first_page = self.get(url, cached_pages[0]) if cached_pages else None
+        if first_page is None:
+            return None
+        parser = PaginationParser()
+        parser.feed(first_page.pagination)
+        pages = [self.get(url, page) for page in parser.out()]
+        if any(page is None for page in pages):
+            return None
+        return parse_pages([page for page in pages if page is not None])
+
+    def clear(self, url: str) -> None:
+        """
+        Remove the pages of a URL, e.g., for a stale match day.
+
+        Args:
+            url (str): statistics URL, see get_url.
+        """
+        shutil.rmtree(self._get_dirpath(url), ignore_errors=True)
@@ -0,0 +1,143 @@
+"""Columnar storage utilities for match day statistics."""
+
+from __future__ import annotations
+
+import json
+import os
+from numbers import Number
+from typing import TYPE_CHECKING, Dict, List, Optional, Sequence
+
+import numpy as np
+
+from .helpers.imports import LazyImport
+
+if TYPE_CHECKING:
+    import pandas as pd
+    from typing_extensions import Literal
+
+    MmapMode = Literal["r+", "r", "w+", "c"]
+else:
+    pd = LazyImport("pandas")
+
+METADATA_FILENAME = "columns.json"
+
+
+def _to_array(values: list) -> np.ndarray:
+    """
+    Convert column values to a typed array.
+
+    Args:
+        values (list): column values, None for missing ones.
+
+    Returns:
+        np.ndarray: a float array if all values are numbers, otherwise a
+            fixed-width string array.
+    """
+    if all(
+        isinstance(value, Number) and not isinstance(value, bool)
+        for value in values
+        if value is not None
+    ):
+        return np.array(
+            [np.nan if value is None else value for value in values], dtype=float
+        )
+    return np.array(["" if value is None else str(value) for value in values])
+
+
+def write_columns(records: Sequence[dict], dirpath: str) -> None:
+    """
+    Write records, e.g., from download_data, in columnar format.
+
+    Each column is stored in a .npy file, so it can be memory-mapped and
+    loaded independently from the others.
+
+    Args:
+        records (Sequence[dict]): records to write.
+        dirpath (str): path to the directory for the columns.
+    """
+    os.makedirs(dirpath, exist_ok=True)
+    names: List[str] = list(
+        dict.fromkeys(name for record in records for name in record.keys())
+    )
+    columns = []
+    for index, name in enumerate(names):
+        filename = f"{index}.npy"
+        np.save(
+            os.path.join(dirpath, filename),
+            _to_array([record.get(name) for record in records]),
+            allow_pickle=False,
+        )
+        columns.append({"name": name, "filename": filename})
+    with open(os.path.join(dirpath, METADATA_FILENAME), "wt") as fp:
+        json.dump({"length": len(records), "columns": columns}, fp)
+
+
+def read_columns(
+    dirpath: str,
+    columns: Optional[Sequence[str]] = None,
+    mmap_mode: Optional[MmapMode] = "r",
+) -> Dict[str, np.ndarray]:
+    """
+    Read columns written with write_columns.
+
+    Args:
+        dirpath (str): path to the directory for the columns.
+        columns (Sequence[str], optional): columns to read, missing ones are
+            ignored. Defaults to None, a.k.a., all columns.
+        mmap_mode (str, optional): memory-map mode passed to np.load.
+            Defaults to "r", read-only memory-mapping.
+
+    Returns:
+        Dict[str, np.ndarray]: arrays by column name.
+    """
+    with open(os.path.join(dirpath, METADATA_FILENAME)) as fp:
+        metadata = json.load(fp)
+    filenames = {column["name"]: column["filename"] for column in metadata["columns"]}
+    if columns is None:
+        columns = list(filenames)
+    return {
+        name: np.load(
+            os.path.join(dirpath, filenames[name]),
+            mmap_mode=mmap_mode,
+            allow_pickle=False,
+        )
+        for name in columns
+        if name in filenames
+    }
+
+
+def read_columns_df(
+    dirpath: str, columns: Optional[Sequence[str]] = None
+) -> pd.DataFrame:
+    """
+    Read columns written with write_columns in a data-frame.
+
+    Args:
+        dirpath (str): path to the directory for the columns.
+        columns (Sequence[str], optional): columns to read, missing ones are
+            ignored. Defaults to None, a.k.a., all columns.
+
+    Returns:
+        pd.DataFrame: a data-frame with the columns.
+    """
+    return pd.DataFrame(read_columns(dirpath, columns=columns), copy=False)
+
+
+def read_records(dirpath: str, columns: Optional[Sequence[str]] = None) -> List[dict]:
+    """
+    Read columns written with write_columns as records.
+
+    Args:
+        dirpath (str): path to the directory for the columns.
+        columns (Sequence[str], optional): columns to read, missing ones are
+            ignored. Defaults to None, a.k.a., all columns.
+
+    Returns:
+        List[dict]: records, with missing numbers as NaN.
+    """
+    arrays = read_columns(dirpath, columns=columns)
+    names = list(arrays)
+    return [
+        dict(zip(names, values))
+        for values in zip(*[array.tolist() for array in arrays.values()])
+    ]
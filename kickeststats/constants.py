@@ -1,18 +1,43 @@
 """Contants for the kickeststats."""
-import os
 
-import pkg_resources
+import os
+from functools import lru_cache
+from typing import Any
 
 from .exceptions import EnvVariableNotSet
 
-CHROMEDRIVER_EXECUTABLE_PATH = os.environ.get(
-    "CHROMEDRIVER_EXECUTABLE_PATH",
-    pkg_resources.resource_filename("kickeststats", "resources/drivers/chromedriver"),
-)
-
-if not CHROMEDRIVER_EXECUTABLE_PATH:
-    raise EnvVariableNotSet("CHROMEDRIVER_EXECUTABLE_PATH")
-
 KICKEST_URL = (
     "https://www.kickest.it/it/serie-a/statistiche/giocatori/tabellone?iframe=yes"
 )
+
+
+@lru_cache(maxsize=None)
+def get_chromedriver_executable_path() -> str:
+    """
+    Get the path to the chromedriver executable, resolved once on first use.
+
+    Raises:
+        EnvVariableNotSet: CHROMEDRIVER_EXECUTABLE_PATH is set but empty.
+
+    Returns:
+        str: the path from CHROMEDRIVER_EXECUTABLE_PATH, defaults to the
+            chromedriver in the package resources.
+    """
+    chromedriver_executable_path = os.environ.get("CHROMEDRIVER_EXECUTABLE_PATH")
+    if chromedriver_executable_path is None:
+        # NOTE: pkg_resources is slow to import, only needed for the default
+        import pkg_resources
+
+        chromedriver_executable_path = pkg_resources.resource_filename(
+            "kickeststats", "resources/drivers/chromedriver"
+        )
+    if not chromedriver_executable_path:
+        raise EnvVariableNotSet("CHROMEDRIVER_EXECUTABLE_PATH")
+    return chromedriver_executable_path
+
+
+def __getattr__(name: str) -> Any:
+    """Resolve CHROMEDRIVER_EXECUTABLE_PATH on access, see PEP 562."""
+    if name == "CHROMEDRIVER_EXECUTABLE_PATH":
+        return get_chromedriver_executable_path()
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
@@ -0,0 +1,174 @@
+"""Conversion utilities."""
+
+import glob
+import os
+import shutil
+import tempfile
+from concurrent.futures import ProcessPoolExecutor
+from functools import partial
+from typing import List, Optional
+
+from .columnar import write_columns
+from .helpers.data import CHUNK_SIZE, iter_jsonl
+from .player import Player
+
+
+def resolve_jsonl_filepaths(path: str) -> List[str]:
+    """
+    Resolve JSONL files from a file, a directory or a glob pattern.
+
+    Args:
+        path (str): path to a JSONL file, to a directory containing .jsonl
+            files or a glob pattern.
+
+    Raises:
+        FileNotFoundError: no file matches the path.
+
+    Returns:
+        List[str]: sorted list of JSONL files.
+    """
+    if os.path.isdir(path):
+        path = os.path.join(path, "*.jsonl")
+    filepaths = sorted(
+        filepath for filepath in glob.glob(path) if os.path.isfile(filepath)
+    )
+    if not filepaths:
+        raise FileNotFoundError(f"No JSONL file found for {path}.")
+    return filepaths
+
+
+def jsonl_to_csv(
+    jsonl_filepath: str, csv_filepath: str, chunk_size: int = CHUNK_SIZE
+) -> int:
+    """
+    Convert a JSONL players file to a .csv, streaming it in chunks.
+
+    Args:
+        jsonl_filepath (str): path to the JSONL file.
+        csv_filepath (str): path to the .csv file.
+        chunk_size (int, optional): maximum number of players in memory.
+            Defaults to CHUNK_SIZE.
+
+    Returns:
+        int: number of players converted.
+    """
+    number_of_players = 0
+    with open(csv_filepath, "wt", newline="") as fp:
+        for players in Player.iter_jsonl(jsonl_filepath, chunk_size=chunk_size):
+            players_df = Player.from_list_to_df(players)
+            # NOTE: keep the index continuous across chunks
+            players_df.index = range(
+                number_of_players, number_of_players + players_df.shape[0]
+            )
+            # NOTE: integer identifiers are only valid within the process
+            players_df.drop(columns="_uid").to_csv(fp, header=number_of_players == 0)
+            number_of_players += players_df.shape[0]
+        if not number_of_players:
+            Player.from_list_to_df([]).drop(columns="_uid").to_csv(fp)
+    return number_of_players
+
+
+def jsonl_to_columns(jsonl_filepath: str, dirpath: str) -> int:
+    """
+    Convert a JSONL file, e.g., from kickeststats-download-data, to columnar format.
+
+    Args:
+        jsonl_filepath (str): path to the JSONL file.
+        dirpath (str): path to the directory for the columns.
+
+    Returns:
+        int: number of records converted.
+    """
+    records = [record for chunk in iter_jsonl(jsonl_filepath) for record in chunk]
+    write_columns(records, dirpath)
+    return len(records)
+
+
+def _concatenate_csvs(csv_filepaths: List[str], csv_filepath: str) -> None:
+    """
+    Concatenate .csv files written by jsonl_to_csv keeping the index continuous.
+
+    Args:
+        csv_filepaths (List[str]): paths to the .csv files to concatenate.
+        csv_filepath (str): path to the resulting .csv file.
+    """
+    number_of_players = 0
+    with open(csv_filepath, "wt", newline="") as output_fp:
+        for index, filepath in enumerate(csv_filepaths):
+            with open(filepath, newline="") as input_fp:
+                header = input_fp.readline()
+                if index == 0:
+                    output_fp.write(header)
+                file_number_of_players = 0
+                for line in input_fp:
+                    row_index, row = line.split(",", 1)
+                    output_fp.write(f"{number_of_players + int(row_index)},{row}")
+                    file_number_of_players += 1
+                number_of_players += file_number_of_players
+
+
+def jsonl_files_to_csv(
+    jsonl_filepaths: List[str],
+    output_path: str,
+    combine: bool = True,
+    jobs: Optional[int] = None,
+    chunk_size: int = CHUNK_SIZE,
+) -> List[str]:
+    """
+    Convert JSONL players files to .csv in parallel.
+
+    Args:
+        jsonl_filepaths (List[str]): paths to the JSONL files.
+        output_path (str): path to the combined .csv file or, if combine is
+            False, to the directory where a .csv per JSONL file is written.
+        combine (bool, optional): write a single .csv following the order of
+            jsonl_filepaths. Defaults to True.
+        jobs (int, optional): number of processes. Defaults to None, a.k.a.,
+            the number of CPUs.
+        chunk_size (int, optional): maximum number of players in memory per
+            process. Defaults to CHUNK_SIZE.
+
+    Returns:
+        List[str]: paths to the .csv files written.
+    """
+    converter = partial(_jsonl_to_csv_star, chunk_size=chunk_size)
+    if not combine:
+        os.makedirs(output_path, exist_ok=True)
+        csv_filepaths = [
+            os.path.join(
+                output_path, f"{os.path.splitext(os.path.basename(filepath))[0]}.csv"
+            )
+            for filepath in jsonl_filepaths
+        ]
+        _run(converter, list(zip(jsonl_filepaths, csv_filepaths)), jobs)
+        return csv_filepaths
+    if len(jsonl_filepaths) == 1:
+        jsonl_to_csv(jsonl_filepaths[0], output_path, chunk_size=chunk_size)
+        return [output_path]
+    temporary_directory = tempfile.mkdtemp()
+    try:
+        csv_filepaths = [
+            os.path.join(temporary_directory, f"{index}.csv")
+            for index in range(len(jsonl_filepaths))
+        ]
+        _run(converter, list(zip(jsonl_filepaths, csv_filepaths)), jobs)
+        _concatenate_csvs(csv_filepaths, output_path)
+    finally:
+        shutil.rmtree(temporary_directory)
+    return [output_path]
+
+
+def _jsonl_to_csv_star(filepaths: tuple, chunk_size: int = CHUNK_SIZE) -> int:
+    """Call jsonl_to_csv on a pair of paths, to be used with a process pool."""
+    jsonl_filepath, csv_filepath = filepaths
+    return jsonl_to_csv(jsonl_filepath, csv_filepath, chunk_size=chunk_size)
+
+
+def _run(converter: partial, filepaths: List[tuple], jobs: Optional[int]) -> None:
+    """Run the converter on the given paths, in parallel when needed."""
+    if jobs == 1 or len(filepaths) == 1:
+        for pair in filepaths:
+            converter(pair)
+    else:
+        with ProcessPoolExecutor(max_workers=jobs) as executor:
+            list(executor.map(converter, filepaths))
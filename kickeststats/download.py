@@ -1,20 +1,137 @@
+from __future__ import annotations
+
+import http.client
+import json
+import os
+import threading
 import time
-from typing import List, Optional
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, field
+from queue import Empty, LifoQueue
+from typing import TYPE_CHECKING, Callable, Dict, Iterable, List, Optional, Tuple
+from urllib.parse import urlsplit
+
+from .cache import Page, PageCache, parse_pages
+from .constants import KICKEST_URL, get_chromedriver_executable_path
+from .exceptions import (
+    DownloadFailed,
+    FetchFailed,
+    UnsupportedDownloadBackend,
+    WaitTimeout,
+)
+from .helpers.parsers import ElementParser, PaginationParser, TableParser
+from .helpers.imports import LazyImport
+
+if TYPE_CHECKING:
+    from loguru import logger
+    from splinter.driver.webdriver import WebDriverElement
+    from splinter.driver.webdriver.chrome import WebDriver as ChromeWebDriver
+else:
+    logger = LazyImport("loguru", "logger")
+
+DOWNLOAD_WORKERS = int(os.environ.get("KICKESTSTATS_DOWNLOAD_WORKERS", 4))
+DOWNLOAD_RETRIES = int(os.environ.get("KICKESTSTATS_DOWNLOAD_RETRIES", 2))
+WAIT_TIMEOUT = float(os.environ.get("KICKESTSTATS_WAIT_TIMEOUT", 30))
+WAIT_POLL_INTERVAL = float(os.environ.get("KICKESTSTATS_WAIT_POLL_INTERVAL", 0.1))
+DOWNLOAD_BACKEND = os.environ.get("KICKESTSTATS_DOWNLOAD_BACKEND", "browser")
+SUPPORTED_DOWNLOAD_BACKENDS = {"http", "browser"}
+HTTP_TIMEOUT = float(os.environ.get("KICKESTSTATS_HTTP_TIMEOUT", 30))
+HTTP_CONNECTIONS = int(os.environ.get("KICKESTSTATS_HTTP_CONNECTIONS", 4))
+PAGE_PARAMETER = os.environ.get("KICKESTSTATS_PAGE_PARAMETER", "page")
+HTTP_HEADERS = {
+    "User-Agent": "Mozilla/5.0 (X11; Linux x86_64) kickeststats",
+    "Accept": "text/html",
+    "Connection": "keep-alive",
+}
+TABLE_HEADER_ID = "statsTableTHead"
+TABLE_DATA_ID = "statsTableTBody"
+PAGINATION_ID = "statsTablePagination"
+
+
+@dataclass
+class WaitMetrics:
+    """Time spent waiting for the pages, shared across threads."""
+
+    waits: int = 0
+    timeouts: int = 0
+    seconds: float = 0.0
+    _lock: threading.Lock = field(
+        default_factory=threading.Lock, repr=False, compare=False
+    )
+
+    def record(self, seconds: float, timed_out: bool = False) -> None:
+        """
+        Record a wait.
+
+        Args:
+            seconds (float): time spent waiting.
+            timed_out (bool, optional): whether the wait timed out. Defaults to
+                False.
+        """
+        with self._lock:
+            self.waits += 1
+            self.timeouts += int(timed_out)
+            self.seconds += seconds
+
+    def reset(self) -> None:
+        """Reset the metrics."""
+        with self._lock:
+            self.waits = 0
+            self.timeouts = 0
+            self.seconds = 0.0
+
+
+WAIT_METRICS = WaitMetrics()
+
+
+def wait_for(
+    condition: Callable[[], bool],
+    timeout: float = WAIT_TIMEOUT,
+    poll_interval: float = WAIT_POLL_INTERVAL,
+    metrics: Optional[WaitMetrics] = None,
+) -> float:
+    """
+    Wait for a condition polling it.
+
+    Errors raised by the condition, e.g., for elements not rendered yet, count
+    as the condition not being met.
+
+    Args:
+        condition (Callable[[], bool]): the condition.
+        timeout (float, optional): maximum time to wait in seconds. Defaults to
+            WAIT_TIMEOUT.
+        poll_interval (float, optional): minimum time between two checks in
+            seconds. Defaults to WAIT_POLL_INTERVAL.
+        metrics (WaitMetrics, optional): metrics to update. Defaults to None,
+            a.k.a., WAIT_METRICS.
 
-from loguru import logger
-from splinter import Browser  # type: ignore
-from splinter.driver.webdriver import WebDriverElement  # type: ignore
-from splinter.driver.webdriver.chrome import (
-    WebDriver as ChromeWebDriver,
-)  # type: ignore
+    Raises:
+        WaitTimeout: the condition is not met before the timeout.
 
-from .constants import CHROMEDRIVER_EXECUTABLE_PATH, KICKEST_URL
-from .helpers.parsers import HeaderParser, PaginationParser, RowParser
+    Returns:
+        float: time spent waiting in seconds.
+    """
+    metrics = WAIT_METRICS if metrics is None else metrics
+    start = time.monotonic()
+    while True:
+        check_start = time.monotonic()
+        try:
+            ready = bool(condition())
+        except Exception:
+            ready = False
+        elapsed = time.monotonic() - start
+        if ready:
+            metrics.record(elapsed)
+            return elapsed
+        if elapsed >= timeout:
+            metrics.record(elapsed, timed_out=True)
+            raise WaitTimeout(timeout)
+        time.sleep(max(0.0, poll_interval - (time.monotonic() - check_start)))
 
 
 class TableHeader:
 
-    xpath = '//*[@id="statsTableTHead"]/tr'
+    xpath = f'//*[@id="{TABLE_HEADER_ID}"]/tr'
 
     def __init__(self, browser: ChromeWebDriver):
         self._data = self.find_data(browser)
@@ -24,9 +141,10 @@ class TableHeader:
 
     @property
     def data(self) -> List[str]:
-        parser = HeaderParser()
+        parser = TableParser()
         parser.feed(self._data)
-        return parser.out()
+        parser.close()
+        return parser.header
 
     @classmethod
     def from_browser(cls, browser: ChromeWebDriver) -> List[str]:
@@ -35,7 +153,7 @@ class TableHeader:
 
 class TableData:
 
-    xpath = '//*[@id="statsTableTBody"]'
+    xpath = f'//*[@id="{TABLE_DATA_ID}"]'
 
     def __init__(self, browser: ChromeWebDriver, header: List[str]):
         self._data = self.find_data(browser)
@@ -46,9 +164,9 @@ class TableData:
 
     @property
     def data(self) -> List[dict]:
-        parser = RowParser()
+        parser = TableParser(self._header)
         parser.feed(self._data)
-        return parser.out(self._header)
+        return parser.out()
 
     @classmethod
     def from_browser(cls, browser: ChromeWebDriver, header: List[str]) -> List[dict]:
@@ -57,7 +175,7 @@ class TableData:
 
 class Pagination:
 
-    xpath = '//*[@id="statsTablePagination"]/div/div'
+    xpath = f'//*[@id="{PAGINATION_ID}"]/div/div'
 
     def __init__(self, browser: ChromeWebDriver):
         self._data = self.find_data(browser)
@@ -78,7 +196,7 @@ class Pagination:
 
 class NextPage:
 
-    xpath = '//*[@id="statsTablePagination"]/div/div/ul/li[{}]/a'
+    xpath = f'//*[@id="{PAGINATION_ID}"]/div/div/ul/li[{{}}]/a'
 
     def __init__(self, browser: ChromeWebDriver):
         self._next = self.find_data(browser)
@@ -93,45 +211,464 @@ class NextPage:
         self._next.click()
 
 
+class HTTPFetcher:
+    """Fetch pages over HTTP reusing keep-alive connections, thread-safe."""
+
+    def __init__(
+        self,
+        timeout: float = HTTP_TIMEOUT,
+        max_connections: int = HTTP_CONNECTIONS,
+    ) -> None:
+        """
+        Initialize the fetcher.
+
+        Args:
+            timeout (float, optional): timeout of the connections in seconds.
+                Defaults to HTTP_TIMEOUT.
+            max_connections (int, optional): idle connections kept for each
+                host. Defaults to HTTP_CONNECTIONS.
+        """
+        self.timeout = timeout
+        self.max_connections = max_connections
+        self._pools: Dict[Tuple[str, str], LifoQueue] = {}
+        self._lock = threading.Lock()
+
+    def _pool(self, scheme: str, netloc: str) -> LifoQueue:
+        with self._lock:
+            return self._pools.setdefault(
+                (scheme, netloc), LifoQueue(maxsize=self.max_connections)
+            )
+
+    def _connect(self, scheme: str, netloc: str) -> http.client.HTTPConnection:
+        if scheme == "https":
+            return http.client.HTTPSConnection(netloc, timeout=self.timeout)
+        return http.client.HTTPConnection(netloc, timeout=self.timeout)
+
+    def get(self, url: str) -> str:
+        """
+        Get a page.
+
+        Args:
+            url (str): page URL.
+
+        Raises:
+            FetchFailed: the response status is not 200.
+
+        Returns:
+            str: the page.
+        """
+        split_url = urlsplit(url)
+        path = split_url.path or "/"
+        if split_url.query:
+            path = f"{path}?{split_url.query}"
+        pool = self._pool(split_url.scheme, split_url.netloc)
+        try:
+            connection, reused = pool.get_nowait(), True
+        except Empty:
+            connection, reused = (
+                self._connect(split_url.scheme, split_url.netloc),
+                False,
+            )
+        try:
+            try:
+                connection.request("GET", path, headers=HTTP_HEADERS)
+                response = connection.getresponse()
+            except (http.client.HTTPException, ConnectionError):
+                # NOTE: idle connections might have been closed by the server
+                connection.close()
+                if not reused:
+                    raise
+                connection = self._connect(split_url.scheme, split_url.netloc)
+                connection.request("GET", path, headers=HTTP_HEADERS)
+                response = connection.getresponse()
+            body = response.read()
+        except Exception:
+            connection.close()
+            raise
+        if response.will_close:
+            connection.close()
+        else:
+            try:
+                pool.put_nowait(connection)
+            except Exception:
+                connection.close()
+        if response.status != 200:
+            raise FetchFailed(url, response.status)
+        return body.decode(response.headers.get_content_charset() or "utf-8")
+
+    def close(self) -> None:
+        """Close the idle connections."""
+        with self._lock:
+            pools = list(self._pools.values())
+            self._pools = {}
+        for pool in pools:
+            while True:
+                try:
+                    pool.get_nowait().close()
+                except Empty:
+                    break
+
+    def __enter__(self) -> "HTTPFetcher":
+        return self
+
+    def __exit__(self, *args) -> None:
+        self.close()
+
+
+def get_page_url(url: str, page: int) -> str:
+    """
+    Get the URL of a page of the statistics table.
+
+    Args:
+        url (str): statistics URL, see get_url.
+        page (int): page number.
+
+    Returns:
+        str: the page URL.
+    """
+    separator = "&" if urlsplit(url).query else "?"
+    return f"{url}{separator}{PAGE_PARAMETER}={page}"
+
+
+def _parse_pagination(page: Page) -> range:
+    """Get the page numbers from a page."""
+    parser = PaginationParser()
+    parser.feed(page.pagination)
+    return parser.out()
+
+
+def download_from_http(
+    url: str,
+    fetcher: Optional[HTTPFetcher] = None,
+    cache: Optional[PageCache] = None,
+) -> List[dict]:
+    """
+    Download data fetching all the pages of the statistics table over HTTP.
+
+    Pages after the first one are requested with the PAGE_PARAMETER query
+    parameter. With a cache, only the pages not cached are fetched.
+
+    Args:
+        url (str): statistics URL, see get_url.
+        fetcher (HTTPFetcher, optional): fetcher to use. Defaults to None,
+            a.k.a., a new fetcher closed at the end.
+        cache (PageCache, optional): cache for the pages. Defaults to None,
+            a.k.a., no cache.
+
+    Raises:
+        ParsingException: the table is not found in a page.
+        FetchFailed: a page can not be fetched or is the same as the previous
+            one, e.g., when paging is not supported.
+
+    Returns:
+        List[dict]: list of player statistics.
+    """
+    if fetcher is None:
+        with HTTPFetcher() as fetcher:
+            return download_from_http(url, fetcher, cache)
+
+    http_fetcher = fetcher
+
+    def fetch_page(page_url: str) -> Page:
+        # NOTE: all the elements are extracted in a single pass over the page
+        parser = ElementParser(TABLE_HEADER_ID, TABLE_DATA_ID, PAGINATION_ID)
+        parser.feed(http_fetcher.get(page_url))
+        return Page(
+            header=parser.out(TABLE_HEADER_ID),
+            data=parser.out(TABLE_DATA_ID),
+            pagination=parser.out(PAGINATION_ID),
+        )
+
+    logger.info(f"Downloading data from {url} over HTTP")
+    cached_pages = cache.pages(url) if cache is not None else []
+    first_page: Optional[Page] = None
+    if cache is not None and cached_pages:
+        first_page = cache.get(url, cached_pages[0])
+    if first_page is None:
+        first_page = fetch_page(url)
+    pagination = _parse_pagination(first_page)
+    pages: List[Page] = []
+    for current_page in pagination:
+        page = cache.get(url, current_page) if cache is not None else None
+        if page is None:
+            logger.info(f"Fetching page {current_page} of {pagination[-1]}")
+            if current_page == pagination[0] and not cached_pages:
+                page = first_page
+            else:
+                page = fetch_page(get_page_url(url, current_page))
+            if pages and page.data == pages[-1].data:
+                raise FetchFailed(get_page_url(url, current_page), 200)
+            if cache is not None:
+                cache.put(url, current_page, page)
+        pages.append(page)
+    return parse_pages(pages)
+
+
+def create_browser() -> ChromeWebDriver:
+    """
+    Create a headless Chrome session.
+
+    Returns:
+        ChromeWebDriver: the browser.
+    """
+    # NOTE: splinter and selenium are slow to import, only needed for browsers
+    from splinter import Browser
+
+    return Browser(
+        driver_name="chrome",
+        executable_path=get_chromedriver_executable_path(),
+        headless=True,
+        incognito=True,
+    )
+
+
+def get_url(match_day: Optional[int] = None, raw_query: Optional[str] = None) -> str:
+    """
+    Get the statistics URL.
+
+    Args:
+        match_day (int): day of the match. Default to None, non specific day.
+        raw_query (str): pass a raw query. Default to None, no raw query.
+            It by-passes match day.
+
+    Returns:
+        str: the URL.
+    """
+    url = KICKEST_URL
+    if match_day is not None:
+        url = f"{KICKEST_URL}&matchdays={match_day}"
+    if raw_query is not None:
+        url = f"{KICKEST_URL}&{raw_query}"
+    return url
+
+
+def download_from_browser(
+    browser: ChromeWebDriver,
+    url: str,
+    timeout: float = WAIT_TIMEOUT,
+    poll_interval: float = WAIT_POLL_INTERVAL,
+    cache: Optional[PageCache] = None,
+) -> List[dict]:
+    """
+    Download data visiting all the pages of the statistics table.
+
+    Instead of fixed sleeps, it waits for the table to be rendered and, after
+    moving to the next page, for the table or the pagination to change.
+    With a cache, a complete download is loaded without visiting the URL and
+    an incomplete one resumes from the first page not cached.
+
+    Args:
+        browser (ChromeWebDriver): browser session.
+        url (str): statistics URL, see get_url.
+        timeout (float, optional): maximum time to wait for a page in seconds.
+            Defaults to WAIT_TIMEOUT.
+        poll_interval (float, optional): minimum time between two checks of a
+            page in seconds. Defaults to WAIT_POLL_INTERVAL.
+        cache (PageCache, optional): cache for the pages. Defaults to None,
+            a.k.a., no cache.
+
+    Raises:
+        WaitTimeout: a page is not rendered before the timeout.
+
+    Returns:
+        List[dict]: list of player statistics.
+    """
+    if cache is not None:
+        players_data = cache.load(url)
+        if players_data is not None:
+            logger.info(f"Loading data for {url} from the cache")
+            return players_data
+
+    def page_state() -> Tuple[str, str]:
+        return (
+            browser.find_by_xpath(TableData.xpath).first.html,
+            browser.find_by_xpath(Pagination.xpath).first.html,
+        )
+
+    logger.info(f"Downloading data from {url}")
+    browser.visit(url)
+    wait_for(
+        lambda: all(page_state()) and len(Pagination.from_browser(browser)) > 0,
+        timeout=timeout,
+        poll_interval=poll_interval,
+    )
+    pagination = Pagination.from_browser(browser)
+    pages: List[Page] = []
+    for current_page in pagination:
+        page = cache.get(url, current_page) if cache is not None else None
+        if page is None:
+            logger.info(f"Parsing page {current_page} of {pagination[-1]}")
+            page = Page(
+                header=browser.find_by_xpath(TableHeader.xpath).first.html,
+                data=browser.find_by_xpath(TableData.xpath).first.html,
+                pagination=browser.find_by_xpath(Pagination.xpath).first.html,
+            )
+            if cache is not None:
+                cache.put(url, current_page, page)
+        pages.append(page)
+        if current_page == pagination[-1]:
+            break
+        previous_state = page_state()
+        NextPage(browser).visit()
+        wait_for(
+            lambda: page_state() != previous_state,
+            timeout=timeout,
+            poll_interval=poll_interval,
+        )
+    return parse_pages(pages)
+
+
 def download_data(
-    match_day: Optional[int] = None, raw_query: Optional[str] = None
+    match_day: Optional[int] = None,
+    raw_query: Optional[str] = None,
+    backend: str = DOWNLOAD_BACKEND,
+    cache: Optional[PageCache] = None,
 ) -> List[dict]:
     """
     Download data for a given match day.
 
+    With a cache, a complete download is loaded without fetching any page and
+    an interrupted one resumes from the pages not cached.
+
     Args:
         match_day (int): day of the match. Default to None, download
             non specific day.
         raw_query (str): pass a raw query. Default to None, no raw query.
             It by-passes match day.
+        backend (str, optional): "http" to fetch the pages without a browser,
+            falling back to "browser" if it fails. Defaults to DOWNLOAD_BACKEND.
+        cache (PageCache, optional): cache for the pages. Defaults to None,
+            a.k.a., no cache.
+
+    Raises:
+        UnsupportedDownloadBackend: in case the backend is not supported.
 
     Returns:
         List[dict]: list of player statistics.
     """
-    with Browser(
-        driver_name="chrome",
-        executable_path=CHROMEDRIVER_EXECUTABLE_PATH,
-        headless=True,
-        incognito=True,
-    ) as browser:
-        players_data = []
-        url = KICKEST_URL
-        if match_day is not None:
-            url = f"{KICKEST_URL}&matchdays={match_day}"
-        if raw_query is not None:
-            url = f"{KICKEST_URL}&{raw_query}"
-        logger.info(f"Downloading data from {url}")
-        browser.visit(url)
-        # required sleep due to interaction with webdriver
-        time.sleep(2)
-        pagination = Pagination.from_browser(browser)
-        header = TableHeader.from_browser(browser)
-        for current_page in pagination:
-            logger.info(f"Parsing page {current_page} of {pagination[-1]}")
-            data = TableData.from_browser(browser, header)
-            players_data.extend(data)
-            NextPage(browser).visit()
-            # required sleep due to interaction with webdriver
-            time.sleep(1)
+    if backend not in SUPPORTED_DOWNLOAD_BACKENDS:
+        raise UnsupportedDownloadBackend(backend)
+    url = get_url(match_day, raw_query)
+    players_data = cache.load(url) if cache is not None else None
+    if players_data is not None:
+        logger.info(f"Loading data for {url} from the cache")
+        return players_data
+    if backend == "http":
+        try:
+            return download_from_http(url, cache=cache)
+        except Exception:
+            logger.exception(f"Downloading {url} over HTTP failed, using a browser")
+    with create_browser() as browser:
+        return download_from_browser(browser, url, cache=cache)
+
+
+def download_match_days(
+    match_days: Iterable[int],
+    workers: int = DOWNLOAD_WORKERS,
+    retries: int = DOWNLOAD_RETRIES,
+    output_dirpath: Optional[str] = None,
+    browser_factory: Callable[[], ChromeWebDriver] = create_browser,
+    backend: str = DOWNLOAD_BACKEND,
+    cache: Optional[PageCache] = None,
+) -> Dict[int, List[dict]]:
+    """
+    Download data for many match days with a pool of workers.
 
+    With the "http" backend, workers share pooled HTTP connections and a match
+    day failing over HTTP falls back to a browser session. Each worker keeps
+    its own browser session across match days. A failed download closes the
+    session and is retried with a new one, resuming from the pages cached, if
+    any.
+
+    Args:
+        match_days (Iterable[int]): days of the match.
+        workers (int, optional): maximum number of concurrent browser
+            sessions. Defaults to DOWNLOAD_WORKERS.
+        retries (int, optional): retries for each match day. Defaults to
+            DOWNLOAD_RETRIES.
+        output_dirpath (str, optional): directory where a <match_day>.jsonl
+            is written as soon as a match day is downloaded. Defaults to None,
+            a.k.a., nothing is written.
+        browser_factory (Callable[[], ChromeWebDriver], optional): function
+            creating a browser session. Defaults to create_browser.
+        backend (str, optional): "http" to fetch the pages without a browser,
+            falling back to "browser" if it fails. Defaults to DOWNLOAD_BACKEND.
+        cache (PageCache, optional): cache for the pages. Defaults to None,
+            a.k.a., no cache.
+
+    Raises:
+        UnsupportedDownloadBackend: in case the backend is not supported.
+        DownloadFailed: a match day failed after all the retries.
+
+    Returns:
+        Dict[int, List[dict]]: list of player statistics by match day.
+    """
+    if backend not in SUPPORTED_DOWNLOAD_BACKENDS:
+        raise UnsupportedDownloadBackend(backend)
+    match_days = list(match_days)
+    fetcher = HTTPFetcher(max_connections=max(1, workers))
+    if output_dirpath is not None:
+        os.makedirs(output_dirpath, exist_ok=True)
+    sessions = threading.local()
+    browsers: List[ChromeWebDriver] = []
+    lock = threading.Lock()
+
+    def get_browser() -> ChromeWebDriver:
+        if getattr(sessions, "browser", None) is None:
+            sessions.browser = browser_factory()
+            with lock:
+                browsers.append(sessions.browser)
+        return sessions.browser
+
+    def close_browser() -> None:
+        with lock:
+            browsers.remove(sessions.browser)
+        try:
+            sessions.browser.quit()
+        except Exception:
+            logger.exception("Closing the browser failed")
+        sessions.browser = None
+
+    def download(match_day: int) -> List[dict]:
+        url = get_url(match_day)
+        cached_players_data = cache.load(url) if cache is not None else None
+        if cached_players_data is not None:
+            logger.info(f"Loading data for {url} from the cache")
+            return write(match_day, cached_players_data)
+        if backend == "http":
+            try:
+                players_data = download_from_http(url, fetcher, cache)
+            except Exception:
+                logger.exception(f"Downloading {url} over HTTP failed, using a browser")
+            else:
+                return write(match_day, players_data)
+        for attempt in range(retries + 1):
+            try:
+                players_data = download_from_browser(get_browser(), url, cache=cache)
+                break
+            except Exception:
+                logger.exception(
+                    f"Downloading match day {match_day} failed, "
+                    f"attempt {attempt + 1} of {retries + 1}"
+                )
+                if getattr(sessions, "browser", None) is not None:
+                    close_browser()
+        else:
+            raise DownloadFailed(match_day, retries + 1)
+        return write(match_day, players_data)
+
+    def write(match_day: int, players_data: List[dict]) -> List[dict]:
+        if output_dirpath is not None:
+            with open(os.path.join(output_dirpath, f"{match_day}.jsonl"), "wt") as fp:
+                fp.writelines(
+                    [f"{json.dumps(player)}{os.linesep}" for player in players_data]
+                )
         return players_data
+
+    try:
+        with ThreadPoolExecutor(max_workers=max(1, workers)) as executor:
+            return dict(zip(match_days, executor.map(download, match_days)))
+    finally:
+        fetcher.close()
+        for browser in browsers:
+            browser.quit()
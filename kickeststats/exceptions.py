@@ -23,3 +23,40 @@ class UnsupportedLineUp(Exception):
 
 class InvalidTeamLineup(Exception):
     pass
+
+
+class UnsupportedEngine(Exception):
+    def __init__(self, engine_name: str) -> None:
+        super(UnsupportedEngine, self).__init__(
+            f"Engine [{engine_name}] is not supported."
+        )
+
+
+class DownloadFailed(Exception):
+    def __init__(self, match_day: int, attempts: int) -> None:
+        super(DownloadFailed, self).__init__(
+            f"Download of match day [{match_day}] failed after {attempts} attempts."
+        )
+
+
+class WaitTimeout(Exception):
+    def __init__(self, timeout: float) -> None:
+        super(WaitTimeout, self).__init__(f"Waited more than [{timeout}] seconds.")
+
+
+class FetchFailed(Exception):
+    def __init__(self, url: str, status: int) -> None:
+        super(FetchFailed, self).__init__(
+            f"Fetching [{url}] failed with status [{status}]."
+        )
+
+
+class UnsupportedDownloadBackend(Exception):
+    def __init__(self, backend_name: str) -> None:
+        super(UnsupportedDownloadBackend, self).__init__(
+            f"Download backend [{backend_name}] is not supported."
+        )
+
+
+class InvalidTeamRequest(Exception):
+    pass
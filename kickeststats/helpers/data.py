@@ -1,5 +1,13 @@
-from itertools import zip_longest
-from typing import Any, Iterable
+import ast
+import json
+import os
+from itertools import islice, zip_longest
+from typing import Any, Iterable, Iterator, List
+
+from ..exceptions import ParsingException
+
+CHUNK_SIZE = int(os.environ.get("KICKESTSTATS_CHUNK_SIZE", 10000))
+_JSON_DECODER = json.JSONDecoder()
 
 
 def grouper(iterable: Iterable, n: int, fillvalue: Any = None) -> Iterable:
@@ -8,3 +16,52 @@ def grouper(iterable: Iterable, n: int, fillvalue: Any = None) -> Iterable:
     """
     args = [iter(iterable)] * n
     return zip_longest(*args, fillvalue=fillvalue)
+
+
+def parse_json_line(line: str) -> dict:
+    """
+    Parse a JSONL line, handling single quotes from Python reprs.
+
+    Args:
+        line (str): a line from a JSONL file.
+
+    Raises:
+        ParsingException: the line can not be parsed.
+
+    Returns:
+        dict: the parsed line.
+    """
+    try:
+        return _JSON_DECODER.decode(line)
+    except ValueError as error:
+        if "'" not in line:
+            raise ParsingException(f"Invalid JSON line: {error}")
+    # NOTE: literal evaluation does not execute code, differently from eval
+    try:
+        return ast.literal_eval(line)
+    except (SyntaxError, ValueError) as error:
+        raise ParsingException(f"Invalid JSON line: {error}")
+
+
+def iter_jsonl(filepath: str, chunk_size: int = CHUNK_SIZE) -> Iterator[List[dict]]:
+    """
+    Stream a JSONL file in chunks, skipping blank lines.
+
+    Args:
+        filepath (str): path to the JSONL file.
+        chunk_size (int, optional): maximum number of lines per chunk.
+            Defaults to CHUNK_SIZE.
+
+    Yields:
+        List[dict]: parsed lines.
+    """
+    with open(filepath) as fp:
+        lines = (line.strip() for line in fp)
+        non_blank_lines = (line for line in lines if line)
+        while True:
+            chunk = [
+                parse_json_line(line) for line in islice(non_blank_lines, chunk_size)
+            ]
+            if not chunk:
+                break
+            yield chunk
@@ -0,0 +1,45 @@
+"""Lazy import utilities, keeping the package import fast."""
+
+from importlib import import_module
+from typing import Any, Optional
+
+
+class LazyImport:
+    """
+    Module, or module attribute, imported on the first attribute access.
+
+    Use it for heavy dependencies only needed by some code paths, e.g.:
+
+        if TYPE_CHECKING:
+            import pandas as pd
+        else:
+            pd = LazyImport("pandas")
+    """
+
+    def __init__(self, module_name: str, attribute_name: Optional[str] = None) -> None:
+        """
+        Initialize the lazy import.
+
+        Args:
+            module_name (str): name of the module.
+            attribute_name (str, optional): name of the module attribute.
+                Defaults to None, a.k.a., the module itself.
+        """
+        self._module_name = module_name
+        self._attribute_name = attribute_name
+        self._imported: Any = None
+
+    def _import(self) -> Any:
+        """Import the module, and get the attribute, once."""
+        if self._imported is None:
+            module = import_module(self._module_name)
+            self._imported = (
+                module
+                if self._attribute_name is None
+                else getattr(module, self._attribute_name)
+            )
+        return self._imported
+
+    def __getattr__(self, name: str) -> Any:
+        """Get an attribute of the imported module or attribute."""
+        return getattr(self._import(), name)
@@ -1,8 +1,61 @@
+from __future__ import annotations
+
+import re
+from html import unescape
 from html.parser import HTMLParser
-from typing import List, Union
+from math import isnan
+from typing import TYPE_CHECKING, Any, Dict, List, Optional, Tuple, Union
+
+import numpy as np
 
 from ..exceptions import ParsingException
 from .data import grouper
+from .imports import LazyImport
+
+if TYPE_CHECKING:
+    import pandas as pd
+else:
+    pd = LazyImport("pandas")
+
+# NOTE: columns kept as text, all the others are converted to numbers.
+TEXT_COLUMNS = {"Giocatore", "Pos", "Squadra", "name", "position", "team"}
+# NOTE: columns of numbers, possibly with a few cells kept as text, e.g., "n.d."
+NUMBER_COLUMNS = {
+    "#",
+    "PTS",
+    "CR",
+    "Plus",
+    "Presenze",
+    "Titolare",
+    "Minuti",
+    "Goal",
+    "Tiri",
+    "Tiri Porta",
+    "Goal Rig",
+    "Dribb Riusciti",
+    "Ass",
+    "Pass Riusciti",
+    "Pass Chiave",
+    "Falli",
+    "Falli Subiti",
+    "Gialli",
+    "Rossi",
+    "Pall Rubati",
+    "Tackle",
+    "Clean Sheet",
+    "Parate",
+    "value",
+    "points",
+    "minutes",
+}
+TAG_PATTERN = re.compile(r"<(/?)([a-zA-Z][a-zA-Z0-9]*)[^>]*>|<!--.*?-->", re.DOTALL)
+# NOTE: attribute values might contain ">"
+ELEMENT_TAG_PATTERN = re.compile(
+    r"<(/?)([a-zA-Z][a-zA-Z0-9]*)((?:[^>\"']|\"[^\"]*\"|'[^']*')*)>|<!--.*?-->",
+    re.DOTALL,
+)
+ID_PATTERN = re.compile(r"""(?:^|\s)id\s*=\s*(?:"([^"]*)"|'([^']*)'|([^\s"'>]+))""")
+RAW_TEXT_TAGS = {"script", "style"}
 
 
 class HeaderParser(HTMLParser):
@@ -70,3 +123,285 @@ class PaginationParser(HTMLParser):
 
     def error(self, message) -> None:
         raise ParsingException(message)
+
+
+class ElementParser:
+    """
+    Extract the inner HTML of the elements with the given ids.
+
+    All the elements are extracted in a single pass over the tags, skipping
+    comments and the content of <script> and <style>. The first element with
+    an id is used.
+    """
+
+    def __init__(self, element_id: str, *element_ids: str) -> None:
+        self.element_id = element_id
+        self.element_ids = (element_id,) + element_ids
+        self._source = ""
+        self._spans: Optional[Dict[str, Tuple[int, int]]] = None
+
+    def feed(self, data: str) -> None:
+        self._source += data
+        self._spans = None
+
+    def _parse(self) -> Dict[str, Tuple[int, int]]:
+        spans: Dict[str, Tuple[int, int]] = {}
+        # NOTE: tag, depth of the nested tags with the same name and start by id
+        opened: Dict[str, List[Any]] = {}
+        raw_text_tag: Optional[str] = None
+        for match in ELEMENT_TAG_PATTERN.finditer(self._source):
+            closing, tag, attributes = match.groups()
+            if tag is None:
+                continue
+            tag = tag.lower()
+            if raw_text_tag is not None:
+                if closing and tag == raw_text_tag:
+                    raw_text_tag = None
+                continue
+            self_closing = not closing and attributes.rstrip().endswith("/")
+            if not self_closing:
+                for element_id, element in list(opened.items()):
+                    if element[0] == tag:
+                        element[1] += -1 if closing else 1
+                        if not element[1]:
+                            spans[element_id] = (element[2], match.start())
+                            del opened[element_id]
+            if not closing:
+                tag_id = _get_attribute_value(ID_PATTERN.search(attributes))
+                if (
+                    tag_id is not None
+                    and tag_id in self.element_ids
+                    and tag_id not in spans
+                    and tag_id not in opened
+                ):
+                    if self_closing:
+                        spans[tag_id] = (match.end(), match.end())
+                    else:
+                        opened[tag_id] = [tag, 1, match.end()]
+                if tag in RAW_TEXT_TAGS and not self_closing:
+                    raw_text_tag = tag
+            if len(spans) == len(self.element_ids):
+                break
+        return spans
+
+    def out(self, element_id: Optional[str] = None) -> str:
+        """
+        Get the inner HTML of an element.
+
+        Args:
+            element_id (str, optional): element identifier. Defaults to None,
+                a.k.a., the first one given.
+
+        Raises:
+            ParsingException: the element is not found.
+
+        Returns:
+            str: the inner HTML.
+        """
+        if element_id is None:
+            element_id = self.element_id
+        if self._spans is None:
+            self._spans = self._parse()
+        if element_id not in self._spans:
+            raise ParsingException(f"Element [{element_id}] not found.")
+        start, end = self._spans[element_id]
+        return self._source[start:end]
+
+
+def _get_attribute_value(match: Optional[re.Match]) -> Optional[str]:
+    """Value of an attribute matched, quoted or not."""
+    if match is None:
+        return None
+    return next(group for group in match.groups() if group is not None)
+
+
+class TableParser:
+    """
+    Parse table rows in a single pass over the <tr>, <th> and <td> tags.
+
+    Cells are written in a buffer per column, missing cells are None, extra
+    cells are ignored and the text of a cell, including nested tags, is joined
+    and stripped. The header is learned from the first row of <th> cells,
+    unless given, and the type of each column from its name: columns in
+    TEXT_COLUMNS are kept as text, columns in NUMBER_COLUMNS are converted to
+    numbers at once, keeping as text only the cells that are not numbers.
+    Other columns are converted to numbers only if all the cells are numbers.
+    """
+
+    def __init__(self, header: Optional[List[str]] = None) -> None:
+        self.header: List[str] = []
+        self.column_types: Dict[str, Optional[type]] = {}
+        self._indices: Dict[str, int] = {}
+        self._buffers: Dict[str, List[Optional[str]]] = {}
+        if header is not None:
+            self._set_header(header)
+        self._pending = ""
+        self._row: Optional[List[Optional[str]]] = None
+        self._row_is_header = True
+        self._cell: Optional[List[str]] = None
+        self._length = 0
+
+    def _set_header(self, header: List[str]) -> None:
+        self.header = list(header)
+        # NOTE: with repeated names the last column wins, like a dict
+        self._indices = {name: index for index, name in enumerate(self.header)}
+        self._buffers = {name: [] for name in self._indices}
+        # NOTE: None for the columns typed by their values
+        self.column_types = {
+            name: (
+                str
+                if name in TEXT_COLUMNS
+                else float if name in NUMBER_COLUMNS else None
+            )
+            for name in self._indices
+        }
+
+    def _end_cell(self) -> None:
+        if self._cell is None or self._row is None:
+            return
+        text = "".join(self._cell)
+        if "&" in text:
+            text = unescape(text)
+        self._row.append(text.strip() or None)
+        self._cell = None
+
+    def _end_row(self) -> None:
+        self._end_cell()
+        if self._row:
+            if self._row_is_header and not self.header:
+                self._set_header([cell or "" for cell in self._row])
+            elif not self._row_is_header:
+                row_length = len(self._row)
+                for name, index in self._indices.items():
+                    self._buffers[name].append(
+                        self._row[index] if index < row_length else None
+                    )
+                self._length += 1
+        self._row = None
+
+    def feed(self, data: str) -> None:
+        """
+        Feed HTML, possibly in chunks.
+
+        Args:
+            data (str): HTML.
+        """
+        self._parse(self._pending + data, final=False)
+
+    def _parse(self, data: str, final: bool) -> None:
+        """
+        Parse HTML, keeping an incomplete tag at the end for the next chunk.
+
+        Args:
+            data (str): HTML.
+            final (bool): whether no chunk follows, hence nothing is kept.
+        """
+        end = len(data)
+        last_open = data.rfind("<")
+        if not final and last_open > data.rfind(">"):
+            end = last_open
+        self._pending = data[end:]
+        position = 0
+        for match in TAG_PATTERN.finditer(data, 0, end):
+            if self._cell is not None and match.start() > position:
+                self._cell.append(data[position : match.start()])
+            position = match.end()
+            tag = match.group(2)
+            if tag is None:
+                continue
+            tag = tag.lower()
+            if tag == "td" or tag == "th":
+                self._end_cell()
+                if not match.group(1):
+                    # NOTE: cells without a row, e.g., the inner HTML of a row
+                    if self._row is None:
+                        self._row = []
+                        self._row_is_header = True
+                    self._row_is_header &= tag == "th"
+                    self._cell = []
+            elif tag == "tr":
+                self._end_row()
+                if not match.group(1):
+                    self._row = []
+                    self._row_is_header = True
+            elif match.group(1) and tag in {"thead", "tbody", "table"}:
+                self._end_row()
+        if self._cell is not None and end > position:
+            self._cell.append(data[position:end])
+
+    def close(self) -> None:
+        """Close the parser, parsing the pending text and ending any open row."""
+        self._parse(self._pending, final=True)
+        self._end_row()
+
+    def __len__(self) -> int:
+        return self._length
+
+    def _to_array(self, name: str, values: List[Optional[str]]) -> np.ndarray:
+        """
+        Convert a column buffer to an array.
+
+        Args:
+            name (str): column name.
+            values (List[Optional[str]]): column values.
+
+        Returns:
+            np.ndarray: float array for numbers, with NaN for missing values,
+                otherwise an object array.
+        """
+        column_type = self.column_types[name]
+        if column_type is not str:
+            try:
+                return np.array(
+                    ["nan" if value is None else value for value in values],
+                    dtype=float,
+                )
+            except ValueError:
+                pass
+        if column_type is float:
+            converted: List[Union[str, float, None]] = []
+            for value in values:
+                try:
+                    converted.append(None if value is None else float(value))
+                except ValueError:
+                    converted.append(value)
+            return np.array(converted, dtype=object)
+        return np.array(values, dtype=object)
+
+    def columns(self) -> Dict[str, np.ndarray]:
+        """
+        Get the table by column, closing the parser.
+
+        Returns:
+            Dict[str, np.ndarray]: arrays by column name.
+        """
+        self.close()
+        return {
+            name: self._to_array(name, values) for name, values in self._buffers.items()
+        }
+
+    def to_df(self) -> pd.DataFrame:
+        """
+        Get the table as a data-frame, closing the parser.
+
+        Returns:
+            pd.DataFrame: a data-frame with a column per header name.
+        """
+        return pd.DataFrame(self.columns(), columns=list(self._indices))
+
+    def out(self) -> List[dict]:
+        """
+        Get the table as records, like RowParser, closing the parser.
+
+        Returns:
+            List[dict]: a dictionary per row, with None for missing cells.
+        """
+        columns = self.columns()
+        names = list(columns)
+        return [
+            {
+                name: None if isinstance(value, float) and isnan(value) else value
+                for name, value in zip(names, values)
+            }
+            for values in zip(*[array.tolist() for array in columns.values()])
+        ]
@@ -0,0 +1,153 @@
+"""Synthetic data generation utilities, e.g., for benchmarks."""
+
+import json
+import os
+from dataclasses import replace
+from typing import Dict, List, Mapping, Optional
+
+import numpy as np
+
+from ..line_up import LINE_UP_FACTORY, POSITION_NAMES_TO_ATTRIBUTES, SORTED_LINE_UPS
+from ..player import Player, Position
+from ..team import Team
+from .parsers import TEXT_COLUMNS
+
+BENCH = {"GOALKEEPER": 1, "DEFENDER": 2, "MIDFIELDER": 2, "FORWARD": 2}
+
+
+def generate_players_data(
+    template: List[dict],
+    number_of_players: int,
+    random_state: Optional[int] = None,
+) -> List[dict]:
+    """
+    Generate player statistics resampling the records of a match day.
+
+    Statistics are drawn with replacement from the template records, so their
+    distributions are preserved, and names are made unique by appending the
+    record index.
+
+    Args:
+        template (List[dict]): player statistics, e.g., from a JSONL file.
+        number_of_players (int): number of players to generate.
+        random_state (int, optional): seed for the sampling. Defaults to None.
+
+    Returns:
+        List[dict]: list of player statistics, with the keys of the template.
+    """
+    generator = np.random.default_rng(random_state)
+    name_key = next(key for key in ("Giocatore", "name") if key in template[0])
+    players_data = []
+    for index, template_index in enumerate(
+        generator.integers(len(template), size=number_of_players)
+    ):
+        player_data = dict(template[template_index])
+        player_data[name_key] = f"{player_data[name_key]} {index}"
+        if "#" in player_data:
+            player_data["#"] = float(index + 1)
+        players_data.append(player_data)
+    return players_data
+
+
+def write_players_jsonl(players_data: List[dict], filepath: str) -> None:
+    """
+    Write player statistics to JSONL.
+
+    Args:
+        players_data (List[dict]): list of player statistics.
+        filepath (str): path to the JSONL file.
+    """
+    with open(filepath, "wt") as fp:
+        fp.writelines(f"{json.dumps(player)}{os.linesep}" for player in players_data)
+
+
+def render_stats_table(players_data: List[dict]) -> str:
+    """
+    Render player statistics as the table in the statistics page.
+
+    Args:
+        players_data (List[dict]): list of player statistics.
+
+    Returns:
+        str: HTML of the table, see download.TABLE_HEADER_ID and
+            download.TABLE_DATA_ID.
+    """
+    # NOTE: local import, download depends on the browser packages
+    from ..download import TABLE_DATA_ID, TABLE_HEADER_ID
+
+    columns = list(players_data[0]) if players_data else []
+
+    def format_value(column: str, value) -> str:
+        if column in TEXT_COLUMNS or isinstance(value, str):
+            return str(value)
+        return f"{value:g}"
+
+    header = "".join(f"<th>{column}</th>" for column in columns)
+    rows = "".join(
+        "<tr>"
+        + "".join(
+            f"<td>{format_value(column, player[column])}</td>" for column in columns
+        )
+        + "</tr>"
+        for player in players_data
+    )
+    return (
+        '<table class="table">'
+        f'<thead id="{TABLE_HEADER_ID}"><tr>{header}</tr></thead>'
+        f'<tbody id="{TABLE_DATA_ID}">{rows}</tbody>'
+        "</table>"
+    )
+
+
+def generate_teams(
+    players: List[Player],
+    number_of_teams: int,
+    bench: Mapping[str, int] = BENCH,
+    random_state: Optional[int] = None,
+    **kwargs,
+) -> List[Team]:
+    """
+    Generate teams with random line-ups, players, captains and substitutes.
+
+    Args:
+        players (List[Player]): players to pick from, enough for a full squad
+            per position.
+        number_of_teams (int): number of teams to generate.
+        bench (Mapping[str, int], optional): number of substitutes by position
+            name. Defaults to BENCH.
+        random_state (int, optional): seed for the sampling. Defaults to None.
+        kwargs: additional arguments for Team, e.g., engine.
+
+    Returns:
+        List[Team]: the generated teams.
+    """
+    generator = np.random.default_rng(random_state)
+    players_by_position: Dict[str, List[Player]] = {
+        position.name: [] for position in Position
+    }
+    for player in players:
+        players_by_position[player.position.name].append(player)
+    teams = []
+    for line_up in generator.choice(SORTED_LINE_UPS, size=number_of_teams):
+        line_up_object = LINE_UP_FACTORY[line_up]
+        starters: List[Player] = []
+        substitutes: List[Player] = []
+        for position_name, position_players in players_by_position.items():
+            number_of_starters = getattr(
+                line_up_object, POSITION_NAMES_TO_ATTRIBUTES[position_name]
+            )
+            picked = generator.choice(
+                len(position_players),
+                size=number_of_starters + bench.get(position_name, 0),
+                replace=False,
+            )
+            starters.extend(
+                position_players[index] for index in picked[:number_of_starters]
+            )
+            substitutes.extend(
+                position_players[index] for index in picked[number_of_starters:]
+            )
+        captain_index = generator.integers(len(starters))
+        starters[captain_index] = replace(starters[captain_index], captain=True)
+        teams.append(Team(starters, str(line_up), substitutes, **kwargs))
+    return teams
@@ -1,4 +1,5 @@
 """Soccer line-up types."""
+
 from dataclasses import dataclass
 
 from .player import Position
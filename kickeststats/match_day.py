@@ -0,0 +1,211 @@
+"""Match day utilities."""
+
+from __future__ import annotations
+
+from typing import TYPE_CHECKING, Dict, Iterable, List, NamedTuple, Optional
+
+from .helpers.imports import LazyImport
+from .player import PLAYER_REGISTRY, Player, get_player_id
+
+if TYPE_CHECKING:
+    import pandas as pd
+else:
+    pd = LazyImport("pandas")
+
+
+class MatchDayRecord(NamedTuple):
+    """Statistics of a player in a match day, as used by the native engine."""
+
+    player_id: int
+    row: int
+    position_name: str
+    points: float
+    minutes: float
+    captain: bool
+
+
+class MatchDay:
+    """
+    Players statistics for a match day, indexed by player identifier.
+
+    The data-frame, the index and the records are built lazily and only once,
+    so a match day can be shared across many teams. Lookups use the integer
+    identifiers from PLAYER_REGISTRY.
+    """
+
+    def __init__(
+        self,
+        players: Optional[List[Player]] = None,
+        players_df: Optional[pd.DataFrame] = None,
+    ) -> None:
+        """
+        Initialize the match day.
+
+        Args:
+            players (List[Player], optional): players with statistics.
+                Defaults to None, players_df is used.
+            players_df (pd.DataFrame, optional): players with statistics, as
+                returned by Player.from_list_to_df. Defaults to None, players
+                is used.
+
+        Raises:
+            ValueError: neither players nor players_df are provided.
+        """
+        if players is None and players_df is None:
+            raise ValueError("Provide either players or players_df.")
+        self._players = players
+        self._players_df = players_df
+        self._rows_by_id: Optional[Dict[int, List[int]]] = None
+        self._records: Optional[Dict[int, MatchDayRecord]] = None
+
+    @staticmethod
+    def from_jsonl(filepath: str) -> "MatchDay":
+        """
+        Parse a match day from JSONL.
+
+        Args:
+            filepath (str): path to the JSONL file containing players
+                information.
+
+        Returns:
+            MatchDay: the match day.
+        """
+        return MatchDay(players=Player.from_jsonl(filepath))
+
+    @staticmethod
+    def from_columns(dirpath: str) -> "MatchDay":
+        """
+        Load a match day from columnar format, see columnar.write_columns.
+
+        The data-frame is built from the memory-mapped columns, without
+        creating a player per row, see Player.from_columns_to_df.
+
+        Args:
+            dirpath (str): path to the directory containing players
+                information in columnar format.
+
+        Returns:
+            MatchDay: the match day.
+        """
+        return MatchDay(players_df=Player.from_columns_to_df(dirpath))
+
+    @property
+    def players_df(self) -> pd.DataFrame:
+        """Data-frame with players data."""
+        if self._players_df is None:
+            self._players_df = Player.from_list_to_df(self._players or [])
+        return self._players_df
+
+    @property
+    def rows_by_id(self) -> Dict[int, List[int]]:
+        """Data-frame rows indexed by integer identifier."""
+        if self._rows_by_id is None:
+            self._rows_by_id = {}
+            for row, player_id in enumerate(self.players_df["_uid"].tolist()):
+                self._rows_by_id.setdefault(player_id, []).append(row)
+        return self._rows_by_id
+
+    @property
+    def records(self) -> Dict[int, MatchDayRecord]:
+        """Records indexed by integer identifier, first occurrence wins."""
+        if self._records is None:
+            self._records = {}
+            if self._players is not None:
+                uids = PLAYER_REGISTRY.intern(
+                    get_player_id(player.name, player.position.name, player.team)
+                    for player in self._players
+                ).tolist()
+                for row, (player_id, player) in enumerate(zip(uids, self._players)):
+                    if player_id not in self._records:
+                        self._records[player_id] = MatchDayRecord(
+                            player_id,
+                            row,
+                            player.position.name,
+                            float(player.points),
+                            float(player.minutes),
+                            bool(player.captain),
+                        )
+            else:
+                for row, (
+                    player_id,
+                    position_name,
+                    points,
+                    minutes,
+                    captain,
+                ) in enumerate(
+                    zip(
+                        self.players_df["_uid"].tolist(),
+                        self.players_df["position_name"],
+                        self.players_df["points"],
+                        self.players_df["minutes"],
+                        self.players_df["captain"],
+                    )
+                ):
+                    if player_id not in self._records:
+                        self._records[player_id] = MatchDayRecord(
+                            player_id,
+                            row,
+                            position_name,
+                            float(points),
+                            float(minutes),
+                            bool(captain),
+                        )
+        return self._records
+
+    def __len__(self) -> int:
+        """Number of players in the match day."""
+        if self._players is not None:
+            return len(self._players)
+        return self.players_df.shape[0]
+
+    def __contains__(self, player_id: object) -> bool:
+        """Check whether a player identifier, see get_player_id, is in the match day."""
+        return (
+            isinstance(player_id, str)
+            and PLAYER_REGISTRY.get(player_id) in self.rows_by_id
+        )
+
+    def rows(self, player_ids: Iterable[int]) -> pd.DataFrame:
+        """
+        Get the rows for the given players, keeping the match day order.
+
+        Args:
+            player_ids (Iterable[int]): integer identifiers. Missing ones are
+                ignored.
+
+        Returns:
+            pd.DataFrame: players data.
+        """
+        rows_by_id = self.rows_by_id
+        rows = sorted(
+            {row for player_id in player_ids for row in rows_by_id.get(player_id, [])}
+        )
+        return self.players_df.iloc[rows]
+
+    def select(
+        self, player_ids: Iterable[str], captain_id: Optional[str] = None
+    ) -> "MatchDay":
+        """
+        Select players in the given order, e.g., to build a team line-up or bench.
+
+        Args:
+            player_ids (Iterable[str]): player identifiers, see get_player_id.
+            captain_id (str, optional): identifier of the captain. Defaults to
+                None, no captain.
+
+        Raises:
+            KeyError: a player identifier is not in the match day.
+
+        Returns:
+            MatchDay: the selected players.
+        """
+        rows_by_id = self.rows_by_id
+        rows = []
+        for player_id in player_ids:
+            uid = PLAYER_REGISTRY.get(player_id)
+            if uid not in rows_by_id:
+                raise KeyError(player_id)
+            rows.append(rows_by_id[uid][0])
+        players_df = self.players_df.iloc[rows].reset_index(drop=True)
+        players_df["captain"] = players_df["_id"] == captain_id
+        return MatchDay(players_df=players_df)
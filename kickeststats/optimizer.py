@@ -0,0 +1,467 @@
+"""Line-up and squad optimization utilities."""
+
+from dataclasses import dataclass, replace
+from typing import Dict, List, Mapping, Optional, Sequence, Tuple
+
+import numpy as np
+
+from .exceptions import InvalidLineUp
+from .line_up import (
+    LINE_UP_FACTORY,
+    POSITION_MAXIMUM,
+    POSITION_MINIMUM,
+    POSITION_NAMES_TO_ATTRIBUTES,
+    SORTED_LINE_UPS,
+)
+from .player import Player, Position, get_player_id
+from .team import CAPTAIN_MODIFIER, ENGINE, Team
+
+POSITION_NAMES = [position.name for position in Position]
+
+
+@dataclass
+class Squad:
+    """Squad built by the optimizer."""
+
+    players: List[Player]
+    substitutes: List[Player]
+    line_up: str
+    points: float
+    value: float
+
+    def to_team(self, engine: str = ENGINE) -> Team:
+        """
+        Get the team for the squad.
+
+        Args:
+            engine (str, optional): engine used to compute the points.
+                Defaults to ENGINE.
+
+        Returns:
+            Team: the team.
+        """
+        return Team(
+            players=self.players,
+            line_up=self.line_up,
+            substitutes=self.substitutes,
+            engine=engine,
+        )
+
+
+def _prune(
+    points: np.ndarray, costs: np.ndarray, indices: np.ndarray, max_count: int
+) -> np.ndarray:
+    """
+    Drop players that can never be picked for a position.
+
+    A player is dominated when at least max_count other players have no more
+    cost and no less points, so it can always be swapped with one of them.
+
+    Args:
+        points (np.ndarray): points of all players.
+        costs (np.ndarray): costs of all players.
+        indices (np.ndarray): indices of the players for the position.
+        max_count (int): maximum number of players picked for the position.
+
+    Returns:
+        np.ndarray: indices of the players to keep, sorted by index.
+    """
+    # NOTE: sorting makes ties dominated only by the players sorted before
+    order = indices[np.lexsort((indices, -points[indices], costs[indices]))]
+    kept = [
+        index
+        for rank, index in enumerate(order)
+        if np.count_nonzero(points[order[:rank]] >= points[index]) < max_count
+    ]
+    return np.sort(np.array(kept, dtype=int))
+
+
+def _position_table(
+    points: np.ndarray,
+    costs: np.ndarray,
+    max_count: int,
+    capacity: int,
+    captain_modifier: Optional[float],
+) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Knapsack over the players of a position.
+
+    Args:
+        points (np.ndarray): points of the players.
+        costs (np.ndarray): integer costs of the players.
+        max_count (int): maximum number of players picked.
+        capacity (int): maximum total cost.
+        captain_modifier (float, optional): modifier for the captain points,
+            None to disable the captain.
+
+    Returns:
+        Tuple[np.ndarray, np.ndarray]: best points by number of players,
+            captain picked and maximum total cost, and the choices for each
+            player by the same state (0 not picked, 1 picked, 2 captain).
+    """
+    table = np.full((max_count + 1, 2, capacity + 1), -np.inf)
+    table[0, 0, :] = 0.0
+    choices = np.zeros((len(points), max_count + 1, 2, capacity + 1), dtype=np.int8)
+    for index, (player_points, cost) in enumerate(zip(points, costs)):
+        if cost > capacity:
+            continue
+        width = capacity + 1 - cost
+        # NOTE: descending counts so each player is picked at most once
+        for count in range(min(index + 1, max_count), 0, -1):
+            updates = [(0, 0, player_points, 1), (1, 1, player_points, 1)]
+            if captain_modifier is not None:
+                updates.append((0, 1, captain_modifier * player_points, 2))
+            for previous_flag, flag, value, choice in updates:
+                candidates = table[count - 1, previous_flag, :width] + value
+                better = candidates > table[count, flag, cost:]
+                table[count, flag, cost:][better] = candidates[better]
+                choices[index, count, flag, cost:][better] = choice
+    return table, choices
+
+
+def _position_backtrack(
+    choices: np.ndarray, costs: np.ndarray, count: int, flag: int, capacity: int
+) -> Tuple[List[int], Optional[int]]:
+    """
+    Recover the players picked from a position table.
+
+    Args:
+        choices (np.ndarray): choices returned by _position_table.
+        costs (np.ndarray): integer costs of the players.
+        count (int): number of players picked.
+        flag (int): whether the captain is picked.
+        capacity (int): maximum total cost.
+
+    Returns:
+        Tuple[List[int], Optional[int]]: positions of the picked players and
+            of the captain, if any.
+    """
+    picked: List[int] = []
+    captain: Optional[int] = None
+    for index in range(len(costs) - 1, -1, -1):
+        if not count:
+            break
+        choice = choices[index, count, flag, capacity]
+        if choice:
+            picked.append(index)
+            if choice == 2:
+                captain = index
+                flag = 0
+            count -= 1
+            capacity -= costs[index]
+    return picked[::-1], captain
+
+
+def _combine(
+    first: np.ndarray, second: np.ndarray
+) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """
+    Max-plus convolution over the cost of two tables with a captain flag.
+
+    Args:
+        first (np.ndarray): best points by captain picked and maximum cost.
+        second (np.ndarray): best points by captain picked and maximum cost.
+
+    Returns:
+        Tuple[np.ndarray, np.ndarray, np.ndarray]: best points by captain
+            picked and maximum cost, with the cost and the captain flag
+            assigned to the first table.
+    """
+    capacity = first.shape[1] - 1
+    combined = np.full_like(first, -np.inf)
+    splits = np.zeros(first.shape, dtype=int)
+    flags = np.zeros(first.shape, dtype=np.int8)
+    for first_flag, second_flag in [(0, 0), (0, 1), (1, 0)]:
+        flag = first_flag + second_flag
+        values = first[first_flag]
+        # NOTE: tables are non-decreasing in the cost, only increments matter
+        steps = np.flatnonzero(
+            np.isfinite(values) & (values > np.concatenate([[-np.inf], values[:-1]]))
+        )
+        for cost in steps:
+            candidates = values[cost] + second[second_flag, : capacity + 1 - cost]
+            better = candidates > combined[flag, cost:]
+            combined[flag, cost:][better] = candidates[better]
+            splits[flag, cost:][better] = cost
+            flags[flag, cost:][better] = first_flag
+    return combined, splits, flags
+
+
+def _valid_line_ups(line_ups: Sequence[str]) -> List[str]:
+    """Line-ups respecting the position limits."""
+    valid_line_ups = []
+    for line_up in line_ups:
+        line_up_object = LINE_UP_FACTORY[line_up]()
+        if all(
+            POSITION_MINIMUM[position_name]
+            <= getattr(line_up_object, POSITION_NAMES_TO_ATTRIBUTES[position_name])
+            <= POSITION_MAXIMUM[position_name]
+            for position_name in POSITION_NAMES
+        ):
+            valid_line_ups.append(line_up)
+    return valid_line_ups
+
+
+def _best_selection(
+    points: np.ndarray,
+    costs: np.ndarray,
+    candidates: Dict[str, np.ndarray],
+    formations: Dict[str, Tuple[int, ...]],
+    capacity: int,
+    captain_modifier: Optional[float],
+) -> Optional[Tuple[str, float, List[int], Optional[int]]]:
+    """
+    Pick the best players for one of the formations.
+
+    Args:
+        points (np.ndarray): points of all players.
+        costs (np.ndarray): integer costs of all players.
+        candidates (Dict[str, np.ndarray]): indices of the players by position.
+        formations (Dict[str, Tuple[int, ...]]): number of players by position,
+            in the order of POSITION_NAMES, by formation name. Ties are broken
+            following the order of the dictionary.
+        capacity (int): maximum total cost.
+        captain_modifier (float, optional): modifier for the captain points,
+            None to disable the captain.
+
+    Returns:
+        Optional[Tuple[str, float, List[int], Optional[int]]]: formation name,
+            points, indices of the players and of the captain. None if no
+            formation fits the capacity.
+    """
+    flag = 0 if captain_modifier is None else 1
+    tables = {}
+    for position_index, position_name in enumerate(POSITION_NAMES):
+        indices = candidates[position_name]
+        max_count = max(counts[position_index] for counts in formations.values())
+        tables[position_name] = (
+            indices,
+            *_position_table(
+                points[indices],
+                costs[indices],
+                max_count,
+                capacity,
+                captain_modifier,
+            ),
+        )
+    # NOTE: partial combinations are shared across formations
+    combinations: Dict[Tuple[int, ...], Tuple[np.ndarray, np.ndarray, np.ndarray]] = {}
+
+    def combination(counts: Tuple[int, ...]) -> np.ndarray:
+        if len(counts) == 1:
+            return tables[POSITION_NAMES[0]][1][counts[0]]
+        if counts not in combinations:
+            combinations[counts] = _combine(
+                combination(counts[:-1]),
+                tables[POSITION_NAMES[len(counts) - 1]][1][counts[-1]],
+            )
+        return combinations[counts][0]
+
+    best: Optional[Tuple[str, Tuple[int, ...], float]] = None
+    for name, counts in formations.items():
+        value = combination(counts)[flag, capacity]
+        if np.isfinite(value) and (best is None or value > best[2]):
+            best = (name, counts, value)
+    if best is None:
+        return None
+    name, counts, value = best
+    # NOTE: backtrack from the last position to the first one
+    picked: List[int] = []
+    captain: Optional[int] = None
+    remaining_capacity = capacity
+    for length in range(len(counts), 0, -1):
+        position_name = POSITION_NAMES[length - 1]
+        if length > 1:
+            _, splits, flags = combinations[counts[:length]]
+            first_capacity = int(splits[flag, remaining_capacity])
+            first_flag = int(flags[flag, remaining_capacity])
+            position_capacity = remaining_capacity - first_capacity
+            position_flag = flag - first_flag
+        else:
+            first_capacity, first_flag = 0, 0
+            position_capacity, position_flag = remaining_capacity, flag
+        indices, _, choices = tables[position_name]
+        position_picked, position_captain = _position_backtrack(
+            choices,
+            costs[indices],
+            counts[length - 1],
+            position_flag,
+            position_capacity,
+        )
+        picked = [int(indices[index]) for index in position_picked] + picked
+        if position_captain is not None:
+            captain = int(indices[position_captain])
+        remaining_capacity, flag = first_capacity, first_flag
+    return name, float(value), picked, captain
+
+
+def _bench_reserve(
+    costs: np.ndarray,
+    indices_by_position: Dict[str, np.ndarray],
+    substitutes: Mapping[str, int],
+    excluded: List[int],
+) -> int:
+    """
+    Cost of the cheapest bench.
+
+    Args:
+        costs (np.ndarray): integer costs of all players.
+        indices_by_position (Dict[str, np.ndarray]): indices of the players by
+            position name.
+        substitutes (Mapping[str, int]): number of substitutes by position name.
+        excluded (List[int]): indices of the players not available, e.g., the
+            starters.
+
+    Returns:
+        int: total cost of the cheapest substitutes.
+    """
+    available = np.ones(len(costs), dtype=bool)
+    available[excluded] = False
+    reserve = 0
+    for position_name, count in substitutes.items():
+        indices = indices_by_position[position_name]
+        reserve += int(np.sort(costs[indices[available[indices]]])[:count].sum())
+    return reserve
+
+
+def build_squad(
+    players: List[Player],
+    budget: float,
+    line_ups: Sequence[str] = SORTED_LINE_UPS,
+    substitutes: Optional[Mapping[str, int]] = None,
+    projected_points: Optional[Sequence[float]] = None,
+    precision: int = 1,
+) -> Squad:
+    """
+    Build the squad maximizing the points under a budget.
+
+    Starters, formation and captain are picked with a dynamic programming
+    over positions and costs. The substitutes are then picked with the
+    remaining budget, keeping aside enough budget for the cheapest bench of
+    the players not starting.
+
+    Args:
+        players (List[Player]): pool of players, duplicates are ignored.
+        budget (float): maximum total value of the squad.
+        line_ups (Sequence[str], optional): line-ups to consider, ties are
+            broken following their order. Defaults to SORTED_LINE_UPS.
+        substitutes (Mapping[str, int], optional): number of substitutes by
+            position name, e.g., {"GOALKEEPER": 1, "DEFENDER": 2}. Defaults to
+            None, a.k.a., no substitutes.
+        projected_points (Sequence[float], optional): points to maximize, one
+            per player. Defaults to None, players points are used.
+        precision (int, optional): number of decimals of the values considered.
+            Defaults to 1.
+
+    Raises:
+        InvalidLineUp: no squad fits the budget.
+
+    Returns:
+        Squad: the squad, substitutes are sorted by descending points.
+    """
+    if projected_points is not None and len(projected_points) != len(players):
+        raise ValueError(
+            f"Expected {len(players)} projected points, got {len(projected_points)}."
+        )
+    substitutes = dict(substitutes or {})
+    # NOTE: unique players, keeping the first occurrence
+    unique_indices = list(
+        {
+            get_player_id(player.name, player.position.name, player.team): index
+            for index, player in reversed(list(enumerate(players)))
+        }.values()
+    )[::-1]
+    pool = [players[index] for index in unique_indices]
+    points = np.array(
+        [
+            player.points if projected_points is None else projected_points[index]
+            for index, player in zip(unique_indices, pool)
+        ],
+        dtype=float,
+    )
+    scale = 10**precision
+    costs = np.array([int(round(player.value * scale)) for player in pool], dtype=int)
+    capacity = int(np.floor(budget * scale + 1e-9))
+    positions = np.array([player.position.name for player in pool])
+    indices_by_position = {
+        position_name: np.flatnonzero(positions == position_name)
+        for position_name in POSITION_NAMES
+    }
+    formations = {}
+    for line_up in _valid_line_ups(line_ups):
+        line_up_object = LINE_UP_FACTORY[line_up]()
+        formations[line_up] = tuple(
+            getattr(line_up_object, POSITION_NAMES_TO_ATTRIBUTES[position_name])
+            for position_name in POSITION_NAMES
+        )
+    candidates = {
+        position_name: _prune(
+            points,
+            costs,
+            indices,
+            max(counts[position_index] for counts in formations.values()),
+        )
+        for position_index, (position_name, indices) in enumerate(
+            indices_by_position.items()
+        )
+    }
+    # NOTE: keep aside the budget for the cheapest bench, the starters might
+    # take the cheapest players, hence pick them again with the bench left
+    starters_capacity = capacity - _bench_reserve(
+        costs, indices_by_position, substitutes, []
+    )
+    while True:
+        if not formations or starters_capacity < 0:
+            raise InvalidLineUp(f"No line-up fits the budget {budget}.")
+        starters = _best_selection(
+            points, costs, candidates, formations, starters_capacity, CAPTAIN_MODIFIER
+        )
+        if starters is None:
+            raise InvalidLineUp(f"No line-up fits the budget {budget}.")
+        line_up, starters_points, starters_indices, captain_index = starters
+        starters_cost = int(costs[starters_indices].sum())
+        reserve = _bench_reserve(
+            costs, indices_by_position, substitutes, starters_indices
+        )
+        if starters_cost + reserve <= capacity:
+            break
+        # NOTE: strictly below the cost of the starters, so it terminates
+        starters_capacity = capacity - reserve
+    bench_indices: List[int] = []
+    if substitutes:
+        available = np.ones(len(pool), dtype=bool)
+        available[starters_indices] = False
+        bench_counts = tuple(
+            substitutes.get(position_name, 0) for position_name in POSITION_NAMES
+        )
+        bench = _best_selection(
+            points,
+            costs,
+            {
+                position_name: _prune(
+                    points,
+                    costs,
+                    indices[available[indices]],
+                    max(substitutes.get(position_name, 0), 1),
+                )
+                for position_name, indices in indices_by_position.items()
+            },
+            {"bench": bench_counts},
+            capacity - starters_cost,
+            None,
+        )
+        if bench is None:
+            raise InvalidLineUp(f"No bench fits the budget {budget}.")
+        bench_indices = sorted(bench[2], key=lambda index: (-points[index], index))
+    return Squad(
+        players=[
+            replace(pool[index], captain=index == captain_index)
+            for index in starters_indices
+        ],
+        substitutes=[replace(pool[index], captain=False) for index in bench_indices],
+        line_up=line_up,
+        points=round(starters_points, 2),
+        value=round(
+            sum(pool[index].value for index in starters_indices + bench_indices), 2
+        ),
+    )
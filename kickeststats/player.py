@@ -1,10 +1,35 @@
 """Player utitlities."""
+
+from __future__ import annotations
+
 import hashlib
-from dataclasses import dataclass
+import sys
+import threading
+from array import array
+from dataclasses import dataclass, fields
 from enum import Enum, auto
-from typing import Any, Callable, Dict, List
+from functools import lru_cache
+from typing import (
+    TYPE_CHECKING,
+    Any,
+    Callable,
+    Dict,
+    Iterable,
+    Iterator,
+    List,
+    Optional,
+)
+
+import numpy as np
 
-import pandas as pd
+from .columnar import read_columns, read_records
+from .helpers.data import CHUNK_SIZE, iter_jsonl
+from .helpers.imports import LazyImport
+
+if TYPE_CHECKING:
+    import pandas as pd
+else:
+    pd = LazyImport("pandas")
 
 
 class Position(Enum):
@@ -42,8 +67,15 @@ POSITION_MAPPINGS = {
     "FORWARD": Position.FORWARD,
 }
 
-PLAYER_NAME_FN: Callable[[Any], str] = str.__call__
-TEAM_FN: Callable[[Any], str] = str.__call__
+
+def _intern(value: Any) -> str:
+    """Convert a value to an interned string, shared across records."""
+    return sys.intern(str(value))
+
+
+# NOTE: names and teams repeat across match days, interning them saves memory.
+PLAYER_NAME_FN: Callable[[Any], str] = _intern
+TEAM_FN: Callable[[Any], str] = _intern
 PLAYER_POSITION_FN: Callable[[Any], Position] = POSITION_MAPPINGS.__getitem__
 PLAYER_VALUE_FN: Callable[[Any], float] = float.__call__
 PLAYER_POINTS_FN: Callable[[Any], float] = float.__call__
@@ -58,6 +90,127 @@ PLAYER_DICTIONARY_KEYS_FORMATTER_FN = {
 }
 
 
+@lru_cache(maxsize=None)
+def get_player_id(name: str, position_name: str, team: str) -> str:
+    """
+    Get the identifier of a player.
+
+    The identifier is stable across processes and used as external key,
+    see PlayerRegistry for the compact identifiers used in joins.
+
+    Args:
+        name (str): name of the player.
+        position_name (str): name of the player position.
+        team (str): team of the player.
+
+    Returns:
+        str: the player identifier.
+    """
+    return hashlib.md5(f"{name}{position_name}{team}".encode()).hexdigest()
+
+
+class PlayerRegistry:
+    """
+    Registry interning player identifiers to compact integers.
+
+    Integer identifiers are assigned in order of appearance and are reused
+    across match days, but they are only valid within the process. Interning
+    is thread-safe.
+    """
+
+    def __init__(self) -> None:
+        """Initialize the registry."""
+        self._uids: Dict[str, int] = {}
+        self._player_ids: List[str] = []
+        self._lock = threading.Lock()
+
+    def intern(self, player_ids: Iterable[str]) -> np.ndarray:
+        """
+        Get integer identifiers, registering the unknown players.
+
+        Args:
+            player_ids (Iterable[str]): player identifiers, see get_player_id.
+
+        Returns:
+            np.ndarray: integer identifiers.
+        """
+        player_ids = list(player_ids)
+        uids = self._uids
+        # NOTE: identifiers are assigned from the registry size, concurrent
+        # registrations would assign the same one to different players
+        with self._lock:
+            new_player_ids = [
+                player_id
+                for player_id in dict.fromkeys(player_ids)
+                if player_id not in uids
+            ]
+            if new_player_ids:
+                uids.update(
+                    zip(
+                        new_player_ids,
+                        range(len(uids), len(uids) + len(new_player_ids)),
+                    )
+                )
+                self._player_ids.extend(new_player_ids)
+        return np.array([uids[player_id] for player_id in player_ids], dtype=np.int32)
+
+    def get(self, player_id: str) -> Optional[int]:
+        """
+        Get the integer identifier of a registered player.
+
+        Args:
+            player_id (str): player identifier, see get_player_id.
+
+        Returns:
+            Optional[int]: the integer identifier, None if not registered.
+        """
+        return self._uids.get(player_id)
+
+    def player_id(self, uid: int) -> str:
+        """
+        Get the player identifier from an integer one.
+
+        Args:
+            uid (int): integer identifier.
+
+        Returns:
+            str: the player identifier.
+        """
+        return self._player_ids[uid]
+
+    def __len__(self) -> int:
+        """Number of registered players."""
+        return len(self._player_ids)
+
+
+PLAYER_REGISTRY = PlayerRegistry()
+POSITIONS_BY_VALUE = {position.value: position for position in Position}
+
+
+def _add_slots(cls: type) -> type:
+    """
+    Recreate a dataclass with __slots__, like dataclass(slots=True) in Python 3.10.
+
+    Instances have no __dict__, saving memory when loading many records.
+
+    Args:
+        cls (type): a dataclass.
+
+    Returns:
+        type: the slotted dataclass.
+    """
+    class_dictionary = dict(cls.__dict__)
+    field_names = tuple(field.name for field in fields(cls))
+    class_dictionary["__slots__"] = field_names
+    # NOTE: defaults are already in __init__, class attributes clash with slots
+    for field_name in field_names:
+        class_dictionary.pop(field_name, None)
+    class_dictionary.pop("__dict__", None)
+    class_dictionary.pop("__weakref__", None)
+    return type(cls)(cls.__name__, cls.__bases__, class_dictionary)
+
+
+@_add_slots
 @dataclass
 class Player:
 
@@ -106,13 +259,132 @@ class Player:
         Returns:
             List[Player]: list of players.
         """
-        with open(filepath) as fp:
-            players = [
-                # NOTE: using eval to handle single quotes
-                Player.from_dict(eval(line.strip()))
-                for line in fp
-            ]
-        return players
+        return [player for players in Player.iter_jsonl(filepath) for player in players]
+
+    @staticmethod
+    def iter_jsonl(
+        filepath: str, chunk_size: int = CHUNK_SIZE
+    ) -> Iterator[List["Player"]]:
+        """
+        Stream players from JSONL in chunks.
+
+        Args:
+            filepath (str): path to the JSONL file containing players
+                information.
+            chunk_size (int, optional): maximum number of players per chunk.
+                Defaults to CHUNK_SIZE.
+
+        Yields:
+            List[Player]: chunk of players.
+        """
+        for chunk in iter_jsonl(filepath, chunk_size=chunk_size):
+            yield [Player.from_dict(player_dictionary) for player_dictionary in chunk]
+
+    @staticmethod
+    def from_columns(dirpath: str) -> List["Player"]:
+        """
+        Parse players from columnar format, see columnar.write_columns.
+
+        Only the columns needed for the players are loaded.
+
+        Args:
+            dirpath (str): path to the directory containing players
+                information in columnar format.
+
+        Returns:
+            List[Player]: list of players.
+        """
+        return [
+            Player.from_dict(player_dictionary)
+            for player_dictionary in read_records(
+                dirpath,
+                columns=[
+                    key
+                    for keys in PLAYER_DICTIONARY_KEYS_MAPPING.values()
+                    for key in keys
+                ],
+            )
+        ]
+
+    @staticmethod
+    def from_columns_to_df(dirpath: str) -> pd.DataFrame:
+        """
+        Parse players from columnar format to a data-frame, see
+        columnar.write_columns.
+
+        The memory-mapped columns are converted at once, without creating a
+        player per row, and only the distinct names, positions and teams are
+        formatted.
+
+        Args:
+            dirpath (str): path to the directory containing players
+                information in columnar format.
+
+        Raises:
+            ValueError: the name, position or team column is missing.
+
+        Returns:
+            pd.DataFrame: a data-frame with players data, as
+                Player.from_list_to_df.
+        """
+        arrays = read_columns(
+            dirpath,
+            columns=[
+                key for keys in PLAYER_DICTIONARY_KEYS_MAPPING.values() for key in keys
+            ],
+        )
+        length = len(next(iter(arrays.values()), []))
+        if not length:
+            return Player.from_list_to_df([])
+        columns: Dict[str, np.ndarray] = {}
+        for argument, keys in PLAYER_DICTIONARY_KEYS_MAPPING.items():
+            # NOTE: we pick one if multiples are matching
+            mapped_arguments = keys & set(arrays)
+            if not mapped_arguments:
+                if argument in {"value", "points", "minutes"}:
+                    columns[argument] = np.zeros(length)
+                    continue
+                raise ValueError(f"Expected a column for [{argument}].")
+            column = arrays[next(iter(mapped_arguments))]
+            if argument in {"value", "points", "minutes"}:
+                columns[argument] = np.asarray(column, dtype=float)
+                continue
+            values, columns[f"{argument}_code"] = np.unique(column, return_inverse=True)
+            columns[argument] = np.array(
+                [
+                    PLAYER_DICTIONARY_KEYS_FORMATTER_FN[argument](value)
+                    for value in values.tolist()
+                ],
+                dtype=object,
+            )
+        position_codes = columns["position_code"]
+        positions = columns["position"]
+        position_names = np.array(
+            [position.name for position in positions], dtype=object
+        )[position_codes]
+        names = columns["name"][columns["name_code"]]
+        teams = columns["team"][columns["team_code"]]
+        player_ids = [
+            get_player_id(name, position_name, team)
+            for name, position_name, team in zip(names, position_names, teams)
+        ]
+        return pd.DataFrame(
+            {
+                "name": names,
+                "position": positions[position_codes],
+                "team": teams,
+                "captain": np.zeros(length, dtype=bool),
+                "value": columns["value"],
+                "points": columns["points"],
+                "minutes": columns["minutes"],
+                "position_name": position_names,
+                "position_value": np.array(
+                    [position.value for position in positions], dtype=np.int64
+                )[position_codes],
+                "_id": player_ids,
+                "_uid": PLAYER_REGISTRY.intern(player_ids),
+            }
+        )
 
     @staticmethod
     def from_list_to_df(players: List["Player"]) -> pd.DataFrame:
@@ -138,6 +410,7 @@ class Player:
                 "position_name",
                 "position_value",
                 "_id",
+                "_uid",
             ],
         )
         if not players_df.empty:
@@ -148,11 +421,12 @@ class Player:
                 ]
             )
             players_df["_id"] = [
-                hashlib.md5(
-                    f"{row['name']}{row['position_name']}{row['team']}".encode()
-                ).hexdigest()
-                for _, row in players_df.iterrows()
+                get_player_id(name, position_name, team)
+                for name, position_name, team in zip(
+                    players_df["name"], players_df["position_name"], players_df["team"]
+                )
             ]
+            players_df["_uid"] = PLAYER_REGISTRY.intern(players_df["_id"])
         return players_df
 
     @staticmethod
@@ -171,3 +445,201 @@ class Player:
             Player.from_dict(player_row.to_dict())
             for _, player_row in players_df.iterrows()
         ]
+
+
+class PlayerBatch:
+    """
+    Many players stored as parallel arrays.
+
+    Names and teams are stored as codes into shared tables, positions as small
+    integers, see Position, and statistics as floats. Player objects are
+    created on demand, e.g., when indexing or iterating.
+    """
+
+    def __init__(self, players: Iterable[Player] = ()) -> None:
+        """
+        Initialize the batch.
+
+        Args:
+            players (Iterable[Player], optional): players, consumed once, e.g.,
+                a generator. Defaults to (), a.k.a., no players.
+        """
+        names: Dict[str, int] = {}
+        teams: Dict[str, int] = {}
+        # NOTE: typed buffers keep the memory compact while consuming players
+        name_codes = array("i")
+        team_codes = array("h")
+        positions = array("b")
+        captains = array("b")
+        values = array("d")
+        points = array("d")
+        minutes = array("d")
+        for player in players:
+            name_codes.append(names.setdefault(player.name, len(names)))
+            team_codes.append(teams.setdefault(player.team, len(teams)))
+            positions.append(player.position.value)
+            captains.append(player.captain)
+            values.append(player.value)
+            points.append(player.points)
+            minutes.append(player.minutes)
+        self.names: List[str] = list(names)
+        self.teams: List[str] = list(teams)
+        self.name_codes = np.array(name_codes, dtype=np.int32)
+        self.team_codes = np.array(team_codes, dtype=np.int16)
+        self.positions = np.array(positions, dtype=np.int8)
+        self.captains = np.array(captains, dtype=bool)
+        self.values = np.array(values, dtype=float)
+        self.points = np.array(points, dtype=float)
+        self.minutes = np.array(minutes, dtype=float)
+
+    @staticmethod
+    def from_jsonl(filepath: str, chunk_size: int = CHUNK_SIZE) -> "PlayerBatch":
+        """
+        Parse players from JSONL, streaming them in chunks.
+
+        Args:
+            filepath (str): path to the JSONL file containing players
+                information.
+            chunk_size (int, optional): maximum number of players parsed at
+                once. Defaults to CHUNK_SIZE.
+
+        Returns:
+            PlayerBatch: the batch of players.
+        """
+        return PlayerBatch(
+            player
+            for players in Player.iter_jsonl(filepath, chunk_size=chunk_size)
+            for player in players
+        )
+
+    @staticmethod
+    def concatenate(batches: Iterable["PlayerBatch"]) -> "PlayerBatch":
+        """
+        Concatenate batches, e.g., match days of many seasons.
+
+        Args:
+            batches (Iterable[PlayerBatch]): batches to concatenate.
+
+        Returns:
+            PlayerBatch: the batch of players, with merged name and team tables.
+        """
+        batches = list(batches)
+        names: Dict[str, int] = {}
+        teams: Dict[str, int] = {}
+
+        def recode(table: List[str], codes: Dict[str, int]) -> np.ndarray:
+            return np.array(
+                [codes.setdefault(value, len(codes)) for value in table], dtype=int
+            )
+
+        concatenated = PlayerBatch()
+        concatenated.name_codes = np.concatenate(
+            [concatenated.name_codes]
+            + [recode(batch.names, names)[batch.name_codes] for batch in batches]
+        ).astype(np.int32)
+        concatenated.team_codes = np.concatenate(
+            [concatenated.team_codes]
+            + [recode(batch.teams, teams)[batch.team_codes] for batch in batches]
+        ).astype(np.int16)
+        concatenated.names = list(names)
+        concatenated.teams = list(teams)
+        for attribute in ("positions", "captains", "values", "points", "minutes"):
+            setattr(
+                concatenated,
+                attribute,
+                np.concatenate(
+                    [getattr(concatenated, attribute)]
+                    + [getattr(batch, attribute) for batch in batches]
+                ),
+            )
+        return concatenated
+
+    def __len__(self) -> int:
+        """Number of players."""
+        return len(self.positions)
+
+    def __getitem__(self, index: int) -> Player:
+        """
+        Get a player.
+
+        Args:
+            index (int): index of the player.
+
+        Returns:
+            Player: the player.
+        """
+        return Player(
+            name=self.names[self.name_codes[index]],
+            position=POSITIONS_BY_VALUE[self.positions[index]],
+            team=self.teams[self.team_codes[index]],
+            captain=bool(self.captains[index]),
+            value=float(self.values[index]),
+            points=float(self.points[index]),
+            minutes=float(self.minutes[index]),
+        )
+
+    def __iter__(self) -> Iterator[Player]:
+        """Iterate over the players, creating them on demand."""
+        return (self[index] for index in range(len(self)))
+
+    @property
+    def nbytes(self) -> int:
+        """Bytes used by the arrays, the name and team tables excluded."""
+        return sum(
+            getattr(self, attribute).nbytes
+            for attribute in (
+                "name_codes",
+                "team_codes",
+                "positions",
+                "captains",
+                "values",
+                "points",
+                "minutes",
+            )
+        )
+
+    def to_players(self) -> List[Player]:
+        """
+        Batch of players to list.
+
+        Returns:
+            List[Player]: list of players.
+        """
+        return list(self)
+
+    def to_df(self) -> pd.DataFrame:
+        """
+        Batch of players to a data-frame, as Player.from_list_to_df.
+
+        The data-frame can be used for a MatchDay, see MatchDay.players_df.
+
+        Returns:
+            pd.DataFrame: a data-frame with players data.
+        """
+        if not len(self):
+            return Player.from_list_to_df([])
+        positions = np.array([None] + list(Position), dtype=object)[self.positions]
+        position_names = np.array(
+            [None] + [position.name for position in Position], dtype=object
+        )[self.positions]
+        names = np.array(self.names, dtype=object)[self.name_codes]
+        teams = np.array(self.teams, dtype=object)[self.team_codes]
+        player_ids = [
+            get_player_id(name, position_name, team)
+            for name, position_name, team in zip(names, position_names, teams)
+        ]
+        return pd.DataFrame(
+            {
+                "name": names,
+                "position": positions,
+                "team": teams,
+                "captain": self.captains,
+                "value": self.values,
+                "points": self.points,
+                "minutes": self.minutes,
+                "position_name": position_names,
+                "position_value": self.positions.astype(np.int64),
+                "_id": player_ids,
+                "_uid": PLAYER_REGISTRY.intern(player_ids),
+            }
+        )
@@ -0,0 +1,485 @@
+"""Scoring service utilities, batching team submissions on a shared match day."""
+
+from __future__ import annotations
+
+import asyncio
+import json
+import os
+from dataclasses import replace
+from http import HTTPStatus
+from typing import TYPE_CHECKING, Any, Dict, List, NamedTuple, Optional, Tuple, Union
+
+from .exceptions import InvalidTeamRequest, UnsupportedEngine, UnsupportedLineUp
+from .helpers.imports import LazyImport
+from .match_day import MatchDay
+from .player import Player
+from .team import ENGINE, SUPPORTED_ENGINES, Team, score_teams
+
+if TYPE_CHECKING:
+    from loguru import logger
+else:
+    logger = LazyImport("loguru", "logger")
+
+SERVICE_HOST = os.environ.get("KICKESTSTATS_SERVICE_HOST", "127.0.0.1")
+SERVICE_PORT = int(os.environ.get("KICKESTSTATS_SERVICE_PORT", 8000))
+# NOTE: seconds waited for more submissions after the first one of a batch
+SERVICE_BATCH_WINDOW = float(os.environ.get("KICKESTSTATS_SERVICE_BATCH_WINDOW", 0.01))
+SERVICE_MAX_BATCH_SIZE = int(os.environ.get("KICKESTSTATS_SERVICE_MAX_BATCH_SIZE", 256))
+SERVICE_MAX_BODY_SIZE = int(
+    os.environ.get("KICKESTSTATS_SERVICE_MAX_BODY_SIZE", 1024 * 1024)
+)
+
+
+class TeamRequest(NamedTuple):
+    """Team submission to score."""
+
+    players: List[Player]
+    line_up: str
+    substitutes: List[Player]
+    is_away: bool
+
+
+def _parse_players(payload: Any, key: str) -> List[Player]:
+    """Parse a list of players from a submission field."""
+    if not isinstance(payload, list) or not all(
+        isinstance(player, dict) for player in payload
+    ):
+        raise InvalidTeamRequest(f"[{key}] must be a list of players.")
+    try:
+        return [Player.from_dict(player) for player in payload]
+    except (KeyError, TypeError, ValueError) as exception:
+        raise InvalidTeamRequest(f"[{key}] contains an invalid player: {exception}")
+
+
+def parse_team_request(payload: Any) -> TeamRequest:
+    """
+    Parse a team submission.
+
+    The submission is a JSON object, e.g.:
+
+        {
+            "players": [{"name": "L. Muriel", "position": "FORWARD", "team": "ATA"}],
+            "line_up": "4-4-2",
+            "substitutes": [],
+            "captain": "L. Muriel",
+            "is_away": true
+        }
+
+    where players are parsed with Player.from_dict, the captain is the name of
+    one of the players and substitutes, captain and is_away are optional.
+
+    Args:
+        payload (Any): the decoded JSON submission.
+
+    Raises:
+        InvalidTeamRequest: the submission is not a valid team.
+
+    Returns:
+        TeamRequest: the parsed submission.
+    """
+    if not isinstance(payload, dict):
+        raise InvalidTeamRequest("A team must be a JSON object.")
+    if not isinstance(payload.get("line_up"), str):
+        raise InvalidTeamRequest("[line_up] must be a string, e.g., 4-4-2.")
+    players = _parse_players(payload.get("players"), "players")
+    substitutes = _parse_players(payload.get("substitutes", []), "substitutes")
+    captain = payload.get("captain")
+    if captain is not None:
+        try:
+            index = next(
+                index for index, player in enumerate(players) if player.name == captain
+            )
+        except StopIteration:
+            raise InvalidTeamRequest(f"Captain [{captain}] is not in [players].")
+        players[index] = replace(players[index], captain=True)
+    is_away = payload.get("is_away", True)
+    if not isinstance(is_away, bool):
+        raise InvalidTeamRequest("[is_away] must be a boolean.")
+    return TeamRequest(players, payload["line_up"], substitutes, is_away)
+
+
+class ScoringService:
+    """
+    Long-running scoring service keeping a match day in memory.
+
+    Team submissions are queued and the ones arriving within the batch window
+    are scored together, with score_teams on the shared match day, in a
+    worker thread so the event loop keeps accepting connections.
+
+    Endpoints, all exchanging JSON:
+    - GET /health: status, number of players, requests and batches served.
+    - POST /points: score a team, see parse_team_request, returns the points.
+    - PUT /match_day: replace the match day with a list of players.
+    """
+
+    def __init__(
+        self,
+        match_day: MatchDay,
+        batch_window: float = SERVICE_BATCH_WINDOW,
+        max_batch_size: int = SERVICE_MAX_BATCH_SIZE,
+        engine: str = ENGINE,
+    ) -> None:
+        """
+        Initialize the service.
+
+        Args:
+            match_day (MatchDay): match day used to score the teams.
+            batch_window (float, optional): seconds waited for more submissions
+                after the first one of a batch. Defaults to SERVICE_BATCH_WINDOW.
+            max_batch_size (int, optional): maximum number of submissions in a
+                batch. Defaults to SERVICE_MAX_BATCH_SIZE.
+            engine (str, optional): engine used to compute the points, see
+                Team. Defaults to ENGINE.
+
+        Raises:
+            UnsupportedEngine: the engine requested is not supported.
+        """
+        if engine not in SUPPORTED_ENGINES:
+            raise UnsupportedEngine(engine)
+        self.match_day = match_day
+        self.batch_window = batch_window
+        self.max_batch_size = max_batch_size
+        self.engine = engine
+        self.stats = {"requests": 0, "batches": 0}
+        self._queue: Optional[asyncio.Queue] = None
+        self._batcher: Optional[asyncio.Task] = None
+        self._server: Optional[asyncio.Server] = None
+
+    @property
+    def port(self) -> int:
+        """Port the service is listening on, useful when started on port 0."""
+        if self._server is None:
+            raise RuntimeError("The service is not started.")
+        return self._server.sockets[0].getsockname()[1]
+
+    async def start(self, host: str = SERVICE_HOST, port: int = SERVICE_PORT) -> None:
+        """
+        Start listening and batching submissions.
+
+        Args:
+            host (str, optional): host to bind. Defaults to SERVICE_HOST.
+            port (int, optional): port to bind, 0 picks a free one.
+                Defaults to SERVICE_PORT.
+        """
+        # NOTE: warm up the match day index, shared by all the batches
+        await asyncio.get_running_loop().run_in_executor(
+            None, _index_match_day, self.match_day
+        )
+        self._queue = asyncio.Queue()
+        self._batcher = asyncio.ensure_future(self._run_batcher())
+        self._server = await asyncio.start_server(self._handle_connection, host, port)
+        logger.info(f"scoring service listening on {host}:{self.port}")
+
+    async def serve_forever(self) -> None:
+        """Serve until cancelled."""
+        if self._server is None:
+            raise RuntimeError("The service is not started.")
+        async with self._server:
+            await self._server.serve_forever()
+
+    async def close(self) -> None:
+        """Stop listening and batching submissions."""
+        if self._server is not None:
+            self._server.close()
+            await self._server.wait_closed()
+            self._server = None
+        if self._batcher is not None:
+            self._batcher.cancel()
+            try:
+                await self._batcher
+            except asyncio.CancelledError:
+                pass
+            self._batcher = None
+
+    async def score(self, request: TeamRequest) -> float:
+        """
+        Score a team, batched with the other submissions in the window.
+
+        Args:
+            request (TeamRequest): team submission.
+
+        Raises:
+            InvalidTeamRequest: the team is not valid, e.g., unsupported line-up.
+
+        Returns:
+            float: points for the team.
+        """
+        if self._queue is None:
+            raise RuntimeError("The service is not started.")
+        future = asyncio.get_running_loop().create_future()
+        await self._queue.put((request, future))
+        return await future
+
+    async def set_match_day(self, match_day: MatchDay) -> None:
+        """
+        Replace the match day, batches in progress complete on the previous one.
+
+        Args:
+            match_day (MatchDay): match day used to score the teams.
+        """
+        await asyncio.get_running_loop().run_in_executor(
+            None, _index_match_day, match_day
+        )
+        self.match_day = match_day
+
+    async def _next_batch(self) -> List[Tuple[TeamRequest, asyncio.Future]]:
+        """Wait for a submission and collect the ones arriving in the window."""
+        assert self._queue is not None
+        batch = [await self._queue.get()]
+        loop = asyncio.get_running_loop()
+        deadline = loop.time() + self.batch_window
+        while len(batch) < self.max_batch_size:
+            timeout = deadline - loop.time()
+            if timeout <= 0:
+                break
+            try:
+                batch.append(await asyncio.wait_for(self._queue.get(), timeout))
+            except asyncio.TimeoutError:
+                break
+        return batch
+
+    async def _run_batcher(self) -> None:
+        """Score the batches one at a time."""
+        loop = asyncio.get_running_loop()
+        while True:
+            batch = await self._next_batch()
+            self.stats["requests"] += len(batch)
+            self.stats["batches"] += 1
+            try:
+                results = await loop.run_in_executor(
+                    None,
+                    _score_batch,
+                    [request for request, _ in batch],
+                    self.match_day,
+                    self.engine,
+                )
+            except Exception as exception:
+                logger.exception("scoring batch failed")
+                results = [exception] * len(batch)
+            for (_, future), result in zip(batch, results):
+                # NOTE: the client might have disconnected in the meantime
+                if future.done():
+                    continue
+                if isinstance(result, Exception):
+                    future.set_exception(result)
+                else:
+                    future.set_result(result)
+
+    async def _handle_connection(
+        self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter
+    ) -> None:
+        """Serve the HTTP/1.1 requests of a connection."""
+        try:
+            keep_alive = True
+            while keep_alive:
+                try:
+                    request = await _read_request(reader)
+                except (asyncio.IncompleteReadError, ConnectionError):
+                    break
+                except ValueError as exception:
+                    # NOTE: the body can not be delimited, close after replying
+                    _write_response(
+                        writer,
+                        HTTPStatus.BAD_REQUEST,
+                        {"error": str(exception)},
+                        keep_alive=False,
+                    )
+                    await writer.drain()
+                    break
+                if request is None:
+                    break
+                method, path, headers, body = request
+                keep_alive = headers.get("connection", "").lower() != "close"
+                status, response = await self._route(method, path, body)
+                _write_response(writer, status, response, keep_alive)
+                await writer.drain()
+        except ConnectionError:
+            pass
+        finally:
+            writer.close()
+
+    async def _route(
+        self, method: str, path: str, body: Optional[bytes]
+    ) -> Tuple[HTTPStatus, Dict[str, Any]]:
+        """Dispatch a request to its endpoint."""
+        if body is None:
+            return HTTPStatus.REQUEST_ENTITY_TOO_LARGE, {
+                "error": f"Body larger than {SERVICE_MAX_BODY_SIZE} bytes."
+            }
+        endpoints = {
+            "/health": ("GET", self._health),
+            "/points": ("POST", self._points),
+            "/match_day": ("PUT", self._match_day),
+        }
+        if path not in endpoints:
+            return HTTPStatus.NOT_FOUND, {"error": f"Unknown path [{path}]."}
+        expected_method, endpoint = endpoints[path]
+        if method != expected_method:
+            return HTTPStatus.METHOD_NOT_ALLOWED, {
+                "error": f"Expected [{expected_method}] for [{path}]."
+            }
+        try:
+            payload = json.loads(body) if body else None
+            return HTTPStatus.OK, await endpoint(payload)
+        except (InvalidTeamRequest, UnicodeDecodeError, ValueError) as exception:
+            # NOTE: json.JSONDecodeError is a ValueError
+            return HTTPStatus.BAD_REQUEST, {"error": str(exception)}
+        except Exception:
+            logger.exception(f"request to [{path}] failed")
+            return HTTPStatus.INTERNAL_SERVER_ERROR, {"error": "Internal error."}
+
+    async def _health(self, payload: Any) -> Dict[str, Any]:
+        """Status of the service."""
+        return {"status": "ok", "players": len(self.match_day), **self.stats}
+
+    async def _points(self, payload: Any) -> Dict[str, Any]:
+        """Score a team submission."""
+        return {"points": await self.score(parse_team_request(payload))}
+
+    async def _match_day(self, payload: Any) -> Dict[str, Any]:
+        """Replace the match day with a list of players."""
+        await self.set_match_day(MatchDay(_parse_players(payload, "match_day")))
+        return {"players": len(self.match_day)}
+
+
+def _index_match_day(match_day: MatchDay) -> None:
+    """Build the match day index, so batches do not pay for it."""
+    _ = match_day.records
+    _ = match_day.rows_by_id
+
+
+def _score_batch(
+    requests: List[TeamRequest], match_day: MatchDay, engine: str
+) -> List[Union[float, Exception]]:
+    """
+    Score a batch of submissions in a single pass over the match day.
+
+    Args:
+        requests (List[TeamRequest]): team submissions.
+        match_day (MatchDay): match day used to score the teams.
+        engine (str): engine used to compute the points.
+
+    Returns:
+        List[Union[float, Exception]]: points, or the error for invalid teams,
+            for each submission.
+    """
+    results: List[Union[float, Exception]] = []
+    teams: List[Team] = []
+    is_away: List[bool] = []
+    for request in requests:
+        try:
+            teams.append(
+                Team(request.players, request.line_up, request.substitutes, engine)
+            )
+            is_away.append(request.is_away)
+            results.append(0.0)
+        except UnsupportedLineUp as exception:
+            results.append(InvalidTeamRequest(str(exception)))
+    try:
+        points: List[Union[float, Exception]] = score_teams(
+            teams, match_day, is_away=is_away
+        ).tolist()
+    except Exception:
+        # NOTE: score one team at a time, so a failure affects only its request
+        logger.exception("scoring batch failed, scoring teams one at a time")
+        points = []
+        for team, team_is_away in zip(teams, is_away):
+            try:
+                points.append(team.points(match_day, is_away=team_is_away))
+            except Exception as exception:
+                points.append(exception)
+    iterator = iter(points)
+    return [
+        result if isinstance(result, Exception) else next(iterator)
+        for result in results
+    ]
+
+
+async def _read_request(
+    reader: asyncio.StreamReader,
+) -> Optional[Tuple[str, str, Dict[str, str], Optional[bytes]]]:
+    """
+    Read an HTTP/1.1 request.
+
+    Returns:
+        Optional[Tuple[str, str, Dict[str, str], Optional[bytes]]]: method, path,
+            lower-case headers and body, None as body if too large. None if the
+            connection is closed.
+
+    Raises:
+        ValueError: the Content-Length header is malformed or negative.
+    """
+    request_line = await reader.readline()
+    if not request_line.strip():
+        return None
+    try:
+        method, target, _ = request_line.decode("latin-1").split()
+    except ValueError:
+        return None
+    headers = {}
+    while True:
+        line = await reader.readline()
+        if line in (b"\r\n", b"\n", b""):
+            break
+        name, _, value = line.decode("latin-1").partition(":")
+        headers[name.strip().lower()] = value.strip()
+    content_length = headers.get("content-length", "0") or "0"
+    # NOTE: int would also accept signs, spaces and underscores
+    if not (content_length.isascii() and content_length.isdigit()):
+        raise ValueError(f"Invalid Content-Length [{content_length}].")
+    length = int(content_length)
+    body: Optional[bytes] = b""
+    if length > SERVICE_MAX_BODY_SIZE:
+        # NOTE: the body is not read, the connection is closed after replying
+        headers["connection"] = "close"
+        body = None
+    elif length > 0:
+        body = await reader.readexactly(length)
+    return method.upper(), target.split("?", 1)[0], headers, body
+
+
+def _write_response(
+    writer: asyncio.StreamWriter,
+    status: HTTPStatus,
+    response: Dict[str, Any],
+    keep_alive: bool,
+) -> None:
+    """Write an HTTP/1.1 JSON response."""
+    body = json.dumps(response).encode("utf-8")
+    writer.write(
+        (
+            f"HTTP/1.1 {status.value} {status.phrase}\r\n"
+            "Content-Type: application/json\r\n"
+            f"Content-Length: {len(body)}\r\n"
+            f"Connection: {'keep-alive' if keep_alive else 'close'}\r\n"
+            "\r\n"
+        ).encode("latin-1")
+        + body
+    )
+
+
+def serve(
+    match_day: MatchDay, host: str = SERVICE_HOST, port: int = SERVICE_PORT, **kwargs
+) -> None:
+    """
+    Run the scoring service until interrupted.
+
+    Args:
+        match_day (MatchDay): match day used to score the teams.
+        host (str, optional): host to bind. Defaults to SERVICE_HOST.
+        port (int, optional): port to bind. Defaults to SERVICE_PORT.
+        kwargs: additional arguments for ScoringService, e.g., batch_window.
+    """
+
+    async def run() -> None:
+        service = ScoringService(match_day, **kwargs)
+        await service.start(host, port)
+        try:
+            await service.serve_forever()
+        finally:
+            await service.close()
+
+    try:
+        asyncio.run(run())
+    except KeyboardInterrupt:
+        pass
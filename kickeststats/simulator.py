@@ -0,0 +1,206 @@
+"""Monte Carlo simulation of fantasy league seasons."""
+
+from dataclasses import dataclass
+from typing import List, Optional, Sequence, Union
+
+import numpy as np
+
+from .match_day import MatchDay
+from .player import Player
+from .team import HOME_BONUS, Team, points_to_goals, score_teams
+
+WIN_POINTS = 3
+DRAW_POINTS = 1
+
+
+def round_robin(number_of_teams: int, double: bool = True) -> np.ndarray:
+    """
+    Generate a round-robin schedule with the circle method.
+
+    Args:
+        number_of_teams (int): number of teams, must be even.
+        double (bool, optional): play the second half of the season with
+            home and away swapped. Defaults to True.
+
+    Raises:
+        ValueError: odd number of teams.
+
+    Returns:
+        np.ndarray: indices of the home and away teams, with shape
+            (rounds, fixtures per round, 2).
+    """
+    if number_of_teams % 2:
+        raise ValueError(f"Expected an even number of teams, got {number_of_teams}.")
+    teams = list(range(number_of_teams))
+    rounds = []
+    for round_index in range(number_of_teams - 1):
+        fixtures = [
+            (teams[index], teams[number_of_teams - 1 - index])
+            for index in range(number_of_teams // 2)
+        ]
+        # NOTE: alternate home and away for the fixed team
+        if round_index % 2:
+            fixtures[0] = fixtures[0][::-1]
+        rounds.append(fixtures)
+        teams = [teams[0], teams[-1]] + teams[1:-1]
+    schedule = np.array(rounds, dtype=int)
+    if double:
+        schedule = np.concatenate([schedule, schedule[:, :, ::-1]])
+    return schedule
+
+
+def team_points_history(
+    teams: List[Team], match_days: Sequence[Union[List[Player], MatchDay]]
+) -> np.ndarray:
+    """
+    Compute the away points of the teams for past match days.
+
+    Args:
+        teams (List[Team]): teams to evaluate.
+        match_days (Sequence[Union[List[Player], MatchDay]]): players with
+            statistics for each match day.
+
+    Returns:
+        np.ndarray: points with shape (teams, match days).
+    """
+    return np.stack(
+        [score_teams(teams, players, is_away=True) for players in match_days], axis=1
+    )
+
+
+@dataclass
+class SeasonSimulation:
+    """Standings of the simulated seasons, arrays with shape (seasons, teams)."""
+
+    points: np.ndarray
+    goals_for: np.ndarray
+    goals_against: np.ndarray
+    team_points: np.ndarray
+    ranks: np.ndarray
+
+    def position_odds(self) -> np.ndarray:
+        """
+        Get the frequency of each final position.
+
+        Returns:
+            np.ndarray: odds with shape (teams, positions).
+        """
+        number_of_seasons, number_of_teams = self.ranks.shape
+        counts = np.zeros((number_of_teams, number_of_teams))
+        np.add.at(
+            counts,
+            (
+                np.tile(np.arange(number_of_teams), number_of_seasons),
+                self.ranks.ravel(),
+            ),
+            1,
+        )
+        return counts / number_of_seasons
+
+    def title_odds(self) -> np.ndarray:
+        """
+        Get the frequency of first positions.
+
+        Returns:
+            np.ndarray: odds for each team.
+        """
+        return (self.ranks == 0).mean(axis=0)
+
+    def relegation_odds(self, relegated: int = 1) -> np.ndarray:
+        """
+        Get the frequency of the last positions.
+
+        Args:
+            relegated (int, optional): number of relegated teams. Defaults to 1.
+
+        Returns:
+            np.ndarray: odds for each team.
+        """
+        return (self.ranks >= self.ranks.shape[1] - relegated).mean(axis=0)
+
+
+def simulate_seasons(
+    points_history: np.ndarray,
+    number_of_seasons: int = 10000,
+    schedule: Optional[np.ndarray] = None,
+    random_state: Optional[int] = None,
+) -> SeasonSimulation:
+    """
+    Simulate head-to-head seasons resampling the points of the teams.
+
+    For each fixture, the points of each team are sampled from its past match
+    days, e.g., from team_points_history, the home team gets HOME_BONUS and
+    points are converted to goals. Teams are ranked by points, goal
+    difference, goals for and team points.
+
+    Args:
+        points_history (np.ndarray): away points with shape (teams, match days).
+        number_of_seasons (int, optional): number of seasons. Defaults to 10000.
+        schedule (np.ndarray, optional): home and away team indices with shape
+            (rounds, fixtures per round, 2). Defaults to None, a.k.a., a double
+            round-robin.
+        random_state (int, optional): seed for the sampling. Defaults to None.
+
+    Returns:
+        SeasonSimulation: the simulated standings.
+    """
+    number_of_teams, number_of_match_days = points_history.shape
+    if schedule is None:
+        schedule = round_robin(number_of_teams)
+    generator = np.random.default_rng(random_state)
+    # NOTE: shape (seasons, rounds, fixtures, 2), home first
+    samples = generator.integers(
+        number_of_match_days, size=(number_of_seasons,) + schedule.shape
+    )
+    fixture_points = points_history[schedule, samples]
+    fixture_points[..., 0] += HOME_BONUS
+    goals = np.asarray(points_to_goals(fixture_points))
+    home_goals, away_goals = goals[..., 0], goals[..., 1]
+    results = np.stack(
+        [
+            np.where(
+                home_goals > away_goals,
+                WIN_POINTS,
+                np.where(home_goals == away_goals, DRAW_POINTS, 0),
+            ),
+            np.where(
+                away_goals > home_goals,
+                WIN_POINTS,
+                np.where(home_goals == away_goals, DRAW_POINTS, 0),
+            ),
+        ],
+        axis=-1,
+    )
+    # NOTE: accumulate by (season, team) with a single bincount per quantity
+    bins = (
+        np.arange(number_of_seasons).reshape(-1, 1, 1, 1) * number_of_teams
+        + np.broadcast_to(schedule, samples.shape)
+    ).ravel()
+    size = number_of_seasons * number_of_teams
+
+    def accumulate(values: np.ndarray) -> np.ndarray:
+        return np.bincount(bins, weights=values.ravel(), minlength=size).reshape(
+            number_of_seasons, number_of_teams
+        )
+
+    points = accumulate(results).astype(int)
+    goals_for = accumulate(goals).astype(int)
+    goals_against = accumulate(goals[..., ::-1]).astype(int)
+    team_points = accumulate(fixture_points)
+    order = np.lexsort(
+        (-team_points, -goals_for, goals_against - goals_for, -points), axis=-1
+    )
+    ranks = np.empty_like(order)
+    np.put_along_axis(
+        ranks,
+        order,
+        np.broadcast_to(np.arange(number_of_teams), order.shape),
+        axis=-1,
+    )
+    return SeasonSimulation(
+        points=points,
+        goals_for=goals_for,
+        goals_against=goals_against,
+        team_points=team_points,
+        ranks=ranks,
+    )
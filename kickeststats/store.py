@@ -0,0 +1,271 @@
+"""Local statistics store utilities."""
+
+from __future__ import annotations
+
+import json
+import sqlite3
+from typing import TYPE_CHECKING, Any, Iterable, List, Optional, Sequence
+
+from .helpers.data import iter_jsonl
+from .helpers.imports import LazyImport
+from .player import Player, get_player_id
+
+if TYPE_CHECKING:
+    import pandas as pd
+else:
+    pd = LazyImport("pandas")
+
+STATISTICS_COLUMNS = [
+    "season",
+    "match_day",
+    "player_id",
+    "name",
+    "position",
+    "team",
+    "value",
+    "points",
+    "minutes",
+    "statistics",
+]
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS statistics (
+    season TEXT NOT NULL,
+    match_day INTEGER NOT NULL,
+    player_id TEXT NOT NULL,
+    name TEXT NOT NULL,
+    position TEXT NOT NULL,
+    team TEXT NOT NULL,
+    value REAL,
+    points REAL,
+    minutes REAL,
+    statistics TEXT,
+    PRIMARY KEY (season, match_day, player_id)
+);
+CREATE INDEX IF NOT EXISTS statistics_player_id ON statistics (player_id);
+CREATE INDEX IF NOT EXISTS statistics_team ON statistics (team);
+CREATE INDEX IF NOT EXISTS statistics_position ON statistics (position);
+"""
+
+# NOTE: inserting the new records and then updating all of them is an upsert that
+# keeps the rowid, unlike INSERT OR REPLACE, and works with SQLite < 3.24, unlike
+# INSERT ... ON CONFLICT DO UPDATE
+UPSERT_INSERT = (
+    "INSERT OR IGNORE INTO statistics ({columns}) VALUES ({placeholders})".format(
+        columns=", ".join(STATISTICS_COLUMNS),
+        placeholders=", ".join("?" for _ in STATISTICS_COLUMNS),
+    )
+)
+UPSERT_UPDATE = (
+    "UPDATE statistics SET {updates} "
+    "WHERE season = ? AND match_day = ? AND player_id = ?"
+).format(updates=", ".join(f"{column} = ?" for column in STATISTICS_COLUMNS[3:]))
+
+
+class StatisticsStore:
+    """SQLite store for players statistics keyed by season, match day and player."""
+
+    def __init__(self, filepath: str = ":memory:") -> None:
+        """
+        Initialize the store.
+
+        Args:
+            filepath (str, optional): path to the SQLite database. Defaults to
+                ":memory:", an in-memory database.
+        """
+        self.filepath = filepath
+        self.connection = sqlite3.connect(filepath)
+        self.connection.executescript(SCHEMA)
+
+    def close(self) -> None:
+        """Close the store."""
+        self.connection.close()
+
+    def __enter__(self) -> "StatisticsStore":
+        return self
+
+    def __exit__(self, *args: Any) -> None:
+        self.close()
+
+    def upsert(self, records: Iterable[dict], season: str, match_day: int) -> int:
+        """
+        Insert or update statistics, e.g., from download_data.
+
+        Args:
+            records (Iterable[dict]): players statistics.
+            season (str): season, e.g., "2020-21".
+            match_day (int): day of the match.
+
+        Returns:
+            int: number of records upserted.
+        """
+        rows = []
+        for record in records:
+            player = Player.from_dict(record)
+            rows.append(
+                (
+                    season,
+                    match_day,
+                    get_player_id(player.name, player.position.name, player.team),
+                    player.name,
+                    player.position.name,
+                    player.team,
+                    player.value,
+                    player.points,
+                    player.minutes,
+                    json.dumps(record),
+                )
+            )
+        with self.connection:
+            self.connection.executemany(UPSERT_INSERT, rows)
+            # NOTE: in order, so the last of duplicated records wins
+            self.connection.executemany(
+                UPSERT_UPDATE, [row[3:] + row[:3] for row in rows]
+            )
+        return len(rows)
+
+    def upsert_jsonl(self, filepath: str, season: str, match_day: int) -> int:
+        """
+        Insert or update statistics from a JSONL file.
+
+        Args:
+            filepath (str): path to the JSONL file, e.g., from
+                kickeststats-download-data.
+            season (str): season, e.g., "2020-21".
+            match_day (int): day of the match.
+
+        Returns:
+            int: number of records upserted.
+        """
+        return sum(
+            self.upsert(records, season, match_day) for records in iter_jsonl(filepath)
+        )
+
+    def query(self, sql: str, parameters: Sequence[Any] = ()) -> pd.DataFrame:
+        """
+        Run a query against the store.
+
+        Args:
+            sql (str): SQL query on the statistics table.
+            parameters (Sequence[Any], optional): query parameters. Defaults
+                to (), no parameters.
+
+        Returns:
+            pd.DataFrame: the query results.
+        """
+        return pd.read_sql_query(sql, self.connection, params=parameters)
+
+    def _select(
+        self, conditions: List[str], parameters: List[Any], expand: bool
+    ) -> pd.DataFrame:
+        """
+        Select statistics matching all conditions.
+
+        Args:
+            conditions (List[str]): SQL conditions.
+            parameters (List[Any]): parameters for the conditions.
+            expand (bool): expand the raw statistics in columns.
+
+        Returns:
+            pd.DataFrame: the statistics.
+        """
+        where = f"WHERE {' AND '.join(conditions)}" if conditions else ""
+        statistics_df = self.query(
+            f"SELECT * FROM statistics {where} ORDER BY season, match_day, rowid",
+            parameters,
+        )
+        if expand:
+            statistics_df = pd.concat(
+                [
+                    statistics_df.drop(columns="statistics"),
+                    pd.DataFrame(
+                        [
+                            json.loads(statistics)
+                            for statistics in statistics_df["statistics"]
+                        ],
+                        index=statistics_df.index,
+                    ),
+                ],
+                axis=1,
+            )
+        return statistics_df
+
+    def get_statistics(
+        self,
+        season: Optional[str] = None,
+        match_day: Optional[int] = None,
+        player_id: Optional[str] = None,
+        team: Optional[str] = None,
+        position: Optional[str] = None,
+        expand: bool = False,
+    ) -> pd.DataFrame:
+        """
+        Get statistics, filtering on the given fields.
+
+        Args:
+            season (str, optional): season. Defaults to None, all seasons.
+            match_day (int, optional): day of the match. Defaults to None, all
+                match days.
+            player_id (str, optional): player identifier, see get_player_id.
+                Defaults to None, all players.
+            team (str, optional): team. Defaults to None, all teams.
+            position (str, optional): position name, e.g., "FORWARD". Defaults
+                to None, all positions.
+            expand (bool, optional): expand the raw statistics in columns.
+                Defaults to False.
+
+        Returns:
+            pd.DataFrame: the statistics.
+        """
+        conditions = []
+        parameters: List[Any] = []
+        for column, value in [
+            ("season", season),
+            ("match_day", match_day),
+            ("player_id", player_id),
+            ("team", team),
+            ("position", position),
+        ]:
+            if value is not None:
+                conditions.append(f"{column} = ?")
+                parameters.append(value)
+        return self._select(conditions, parameters, expand)
+
+    def get_players(self, season: str, match_day: int) -> List[Player]:
+        """
+        Get the players for a match day, e.g., to build a MatchDay.
+
+        Args:
+            season (str): season.
+            match_day (int): day of the match.
+
+        Returns:
+            List[Player]: list of players.
+        """
+        return [
+            Player.from_dict(json.loads(statistics))
+            for (statistics,) in self.connection.execute(
+                "SELECT statistics FROM statistics "
+                "WHERE season = ? AND match_day = ? ORDER BY rowid",
+                (season, match_day),
+            )
+        ]
+
+    def get_match_days(self, season: str) -> List[int]:
+        """
+        Get the match days stored for a season.
+
+        Args:
+            season (str): season.
+
+        Returns:
+            List[int]: sorted match days.
+        """
+        return [
+            match_day
+            for (match_day,) in self.connection.execute(
+                "SELECT DISTINCT match_day FROM statistics "
+                "WHERE season = ? ORDER BY match_day",
+                (season,),
+            )
+        ]
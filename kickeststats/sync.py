@@ -0,0 +1,197 @@
+"""Incremental season synchronization utilities."""
+
+from __future__ import annotations
+
+import json
+import os
+import re
+from datetime import datetime, timezone
+from typing import TYPE_CHECKING, Callable, Dict, Iterable, List, Optional, Set
+
+from .cache import PageCache
+from .download import download_match_days, get_url
+from .helpers.imports import LazyImport
+from .player import Player
+from .store import StatisticsStore
+
+if TYPE_CHECKING:
+    from loguru import logger
+else:
+    logger = LazyImport("loguru", "logger")
+
+SYNC_STATE_FILENAME = "sync.json"
+# NOTE: seconds a played match day might still change after it was first seen played
+SYNC_FRESHNESS_WINDOW = float(
+    os.environ.get("KICKESTSTATS_SYNC_FRESHNESS_WINDOW", 2 * 24 * 60 * 60)
+)
+JSONL_MATCH_DAY_PATTERN = re.compile(r"^(\d+)\.jsonl$")
+
+
+def get_jsonl_match_days(dirpath: str) -> Set[int]:
+    """
+    Get the match days downloaded in a directory, as <match_day>.jsonl.
+
+    Args:
+        dirpath (str): path to the directory.
+
+    Returns:
+        Set[int]: match days.
+    """
+    if not os.path.isdir(dirpath):
+        return set()
+    return {
+        int(match.group(1))
+        for match in map(JSONL_MATCH_DAY_PATTERN.match, os.listdir(dirpath))
+        if match is not None
+    }
+
+
+def is_played(players: List[dict]) -> bool:
+    """
+    Check whether any player played in a match day.
+
+    Args:
+        players (List[dict]): player statistics.
+
+    Returns:
+        bool: whether any player has minutes.
+    """
+    return any(Player.from_dict(player).minutes > 0 for player in players)
+
+
+def _load_state(filepath: str) -> Dict[int, dict]:
+    if not os.path.exists(filepath):
+        return {}
+    with open(filepath) as fp:
+        return {int(match_day): entry for match_day, entry in json.load(fp).items()}
+
+
+def _dump_state(state: Dict[int, dict], filepath: str) -> None:
+    temporary_filepath = f"{filepath}.tmp"
+    with open(temporary_filepath, "wt") as fp:
+        json.dump({str(match_day): state[match_day] for match_day in sorted(state)}, fp)
+    os.replace(temporary_filepath, filepath)
+
+
+def sync_season(
+    match_days: Iterable[int],
+    dirpath: Optional[str] = None,
+    store: Optional[StatisticsStore] = None,
+    season: Optional[str] = None,
+    state_filepath: Optional[str] = None,
+    cache: Optional[PageCache] = None,
+    download: Callable[..., Dict[int, List[dict]]] = download_match_days,
+    freshness_window: float = SYNC_FRESHNESS_WINDOW,
+    **kwargs,
+) -> Dict[str, List[int]]:
+    """
+    Download only the match days missing or stale locally.
+
+    A match day is missing when it is not in all the local sources, the
+    <match_day>.jsonl files in a directory and the store. A match day is stale
+    when, at the time it was downloaded, it was not played yet, or it was the
+    last match day played and it was first seen played within the freshness
+    window, so it might have been still live. The state of the downloads is
+    kept in a JSON file.
+
+    Args:
+        match_days (Iterable[int]): requested match days.
+        dirpath (str, optional): directory with a <match_day>.jsonl per match
+            day. Defaults to None, a.k.a., no directory.
+        store (StatisticsStore, optional): statistics store. Defaults to None,
+            a.k.a., no store.
+        season (str, optional): season, required with a store. Defaults to
+            None.
+        state_filepath (str, optional): path to the state file. Defaults to
+            None, a.k.a., SYNC_STATE_FILENAME in the directory or next to the
+            store.
+        cache (PageCache, optional): page cache, the pages of stale match days
+            are cleared before downloading them again. Defaults to None.
+        download (Callable[..., Dict[int, List[dict]]], optional): function
+            downloading the match days. Defaults to download_match_days.
+        freshness_window (float, optional): seconds a played match day might
+            still change after it was first seen played. Defaults to
+            SYNC_FRESHNESS_WINDOW.
+        kwargs: additional arguments for download, e.g., workers.
+
+    Raises:
+        ValueError: no local source, or a store without season.
+
+    Returns:
+        Dict[str, List[int]]: match days "missing", "stale" and "skipped".
+    """
+    if dirpath is None and store is None:
+        raise ValueError("Expected a directory or a store.")
+    if store is not None and season is None:
+        raise ValueError("Expected a season for the store.")
+    if state_filepath is None:
+        if dirpath is not None:
+            state_filepath = os.path.join(dirpath, SYNC_STATE_FILENAME)
+        else:
+            assert store is not None
+            state_filepath = f"{store.filepath}.{SYNC_STATE_FILENAME}"
+    match_days = sorted(set(match_days))
+    local_match_days: Optional[Set[int]] = None
+    if dirpath is not None:
+        os.makedirs(dirpath, exist_ok=True)
+        local_match_days = get_jsonl_match_days(dirpath)
+    if store is not None:
+        assert season is not None
+        stored_match_days = set(store.get_match_days(season))
+        local_match_days = (
+            stored_match_days
+            if local_match_days is None
+            else local_match_days & stored_match_days
+        )
+    assert local_match_days is not None
+    state = _load_state(state_filepath)
+    missing = [
+        match_day for match_day in match_days if match_day not in local_match_days
+    ]
+    stale = [
+        match_day
+        for match_day in match_days
+        if match_day in local_match_days and state.get(match_day, {}).get("live", False)
+    ]
+    skipped = [
+        match_day for match_day in match_days if match_day not in missing + stale
+    ]
+    logger.info(
+        f"Syncing match days, missing {missing}, stale {stale}, skipped {skipped}"
+    )
+    if cache is not None:
+        for match_day in stale:
+            cache.clear(get_url(match_day))
+    players_by_match_day = download(
+        missing + stale, output_dirpath=dirpath, cache=cache, **kwargs
+    )
+    now = datetime.now(timezone.utc)
+    fetched_at = now.isoformat()
+    for match_day, players in players_by_match_day.items():
+        if store is not None:
+            assert season is not None
+            store.upsert(players, season, match_day)
+        played = is_played(players)
+        played_at = state.get(match_day, {}).get("played_at")
+        if played_at is None and played:
+            played_at = fetched_at
+        state[match_day] = {
+            "fetched_at": fetched_at,
+            "played": played,
+            "played_at": played_at if played else None,
+        }
+    # NOTE: the last match day played might be still live, but only for a while,
+    # otherwise the last match day of a season would be downloaded forever
+    played_match_days = [
+        match_day for match_day, entry in state.items() if entry.get("played", True)
+    ]
+    last_played = max(played_match_days, default=0)
+    for match_day in players_by_match_day:
+        entry = state[match_day]
+        entry["live"] = not entry["played"] or (
+            match_day >= last_played
+            and (now - datetime.fromisoformat(entry["played_at"])).total_seconds()
+            < freshness_window
+        )
+    _dump_state(state, state_filepath)
+    return {"missing": missing, "stale": stale, "skipped": skipped}
@@ -1,13 +1,19 @@
 """Team utilities."""
+
+from __future__ import annotations
+
 import os
+import time
+from bisect import bisect_left
 from collections import Counter
-from typing import List
+from dataclasses import dataclass, field
+from itertools import chain
+from typing import TYPE_CHECKING, Dict, List, Mapping, Optional, Sequence, Tuple, Union
 
 import numpy as np
-import pandas as pd
-from loguru import logger
 
-from .exceptions import InvalidTeamLineup, UnsupportedLineUp
+from .exceptions import UnsupportedEngine, UnsupportedLineUp
+from .helpers.imports import LazyImport
 from .line_up import (
     LINE_UP_FACTORY,
     POSITION_MAXIMUM,
@@ -15,7 +21,15 @@ from .line_up import (
     POSITION_NAMES_TO_ATTRIBUTES,
     SORTED_LINE_UPS,
 )
-from .player import Player
+from .match_day import MatchDay, MatchDayRecord
+from .player import PLAYER_REGISTRY, Player
+
+if TYPE_CHECKING:
+    import pandas as pd
+    from loguru import logger
+else:
+    pd = LazyImport("pandas")
+    logger = LazyImport("loguru", "logger")
 
 MAX_SUBSTITUTIONS = int(os.environ.get("KICKESTSTATS_MAX_SUBSTITUTIONS", 5))
 GOAL_THRESHOLD = float(os.environ.get("KICKESTSTATS_GOAL_THRESHOLD", 140))
@@ -24,37 +38,420 @@ MINUTES_THRESHOLD = float(os.environ.get("KICKESTSTATS_MINUTES_THRESHOLD", 15))
 POINTS_THRESHOLD = float(os.environ.get("KICKESTSTATS_POINTS_THRESHOLD", 15))
 HOME_BONUS = float(os.environ.get("KICKESTSTATS_HOME_BONUS", 6))
 CAPTAIN_MODIFIER = float(os.environ.get("KICKESTSTATS_CAPTAIN_MODIFIER", 1.5))
+ENGINE = os.environ.get("KICKESTSTATS_ENGINE", "pandas")
+SUPPORTED_ENGINES = {"pandas", "native"}
+HOME_WIN = "1"
+DRAW = "X"
+AWAY_WIN = "2"
+STAGES = (
+    "data_frame",
+    "candidates",
+    "goalkeeper",
+    "position_limits",
+    "line_up",
+    "points",
+)
+# NOTE: Team._validate_line_up only logs the mismatches, so probing the line-ups
+# from the most to the least offensive with all the substitutes always accepts
+# the first one, a.k.a., no probing is needed
+PROBED_LINE_UP = SORTED_LINE_UPS[0]
+# NOTE: upper bounds in seconds of the histogram buckets, the last one is open
+PROFILE_BUCKETS = (1e-6, 1e-5, 1e-4, 1e-3, 1e-2, 1e-1, 1.0)
 
 
-def points_to_goals(points: float) -> int:
+def points_to_goals(
+    points: Union[float, Sequence[float], np.ndarray],
+) -> Union[int, List[int], np.ndarray]:
     """
     Convert points to goals.
 
+    The first goal is scored at GOAL_THRESHOLD points and another one every
+    GOAL_GAP points after it.
+
     Args:
-        points (float): points.
+        points (Union[float, Sequence[float], np.ndarray]): points, either a
+            number, a list or an array.
+
+    Raises:
+        ValueError: infinite points.
 
     Returns:
-        int: [description]
+        Union[int, List[int], np.ndarray]: goals, with the same type and shape
+            of the points.
+    """
+    points_array = np.asarray(points, dtype=float)
+    if np.isposinf(points_array).any():
+        raise ValueError("Infinite points can not be converted to goals.")
+    # NOTE: NaN points never reach the threshold
+    reached = points_array >= GOAL_THRESHOLD
+    goals = np.zeros(points_array.shape, dtype=int)
+    goals[reached] = (
+        np.floor((points_array[reached] - GOAL_THRESHOLD) / GOAL_GAP).astype(int) + 1
+    )
+    # NOTE: thresholds are accumulated adding GOAL_GAP one step at a time,
+    # goals are corrected where rounding differs at the boundaries
+    thresholds = np.cumsum(
+        np.concatenate(
+            [[GOAL_THRESHOLD], np.full(int(goals.max(initial=0)) + 1, GOAL_GAP)]
+        )
+    )
+    goals -= reached & (points_array < thresholds[np.maximum(goals - 1, 0)])
+    goals += reached & (points_array >= thresholds[goals])
+    if points_array.ndim == 0:
+        return int(goals)
+    if isinstance(points, np.ndarray):
+        return goals
+    return goals.tolist()
+
+
+@dataclass
+class SubstitutionTrace:
     """
-    goals = 0
-    threshold = GOAL_THRESHOLD
-    while points >= threshold:
-        goals += 1
-        threshold += GOAL_GAP
-    return goals
+    Trace of the substitutions applied when evaluating a team.
+
+    Players are referred by identifier, see get_player_id. Pass an instance to
+    Team.points to fill it, nothing is recorded otherwise.
+    """
+
+    captain: Optional[str] = None
+    candidates: List[str] = field(default_factory=list)
+    substitutes: List[str] = field(default_factory=list)
+    replaced: List[str] = field(default_factory=list)
+    replacements: List[str] = field(default_factory=list)
+    line_up: Optional[str] = None
+    captain_substitute: Optional[str] = None
+    players: List[str] = field(default_factory=list)
+
+
+@dataclass
+class StageProfile:
+    """
+    Time spent in the stages of Team.points, accumulated across calls.
+
+    Stages are timed as laps between checkpoints, see STAGES, and stages
+    skipped in a call, e.g., without substitutions, are not recorded. Pass an
+    instance to Team.points to fill it, nothing is timed otherwise. An
+    instance should not be shared across threads.
+    """
+
+    calls: Dict[str, int] = field(default_factory=dict)
+    seconds: Dict[str, float] = field(default_factory=dict)
+    histograms: Dict[str, List[int]] = field(default_factory=dict)
+    _last: float = field(default=0.0, repr=False, compare=False)
+
+    def start(self) -> None:
+        """Start timing a call."""
+        self._last = time.perf_counter()
+
+    def lap(self, stage: str) -> None:
+        """
+        Record the time since the last checkpoint for a stage.
+
+        Args:
+            stage (str): name of the stage.
+        """
+        now = time.perf_counter()
+        self.record(stage, now - self._last)
+        self._last = now
+
+    def record(self, stage: str, seconds: float) -> None:
+        """
+        Record the time spent in a stage.
+
+        Args:
+            stage (str): name of the stage.
+            seconds (float): time spent.
+        """
+        self.calls[stage] = self.calls.get(stage, 0) + 1
+        self.seconds[stage] = self.seconds.get(stage, 0.0) + seconds
+        if stage not in self.histograms:
+            self.histograms[stage] = [0] * (len(PROFILE_BUCKETS) + 1)
+        self.histograms[stage][bisect_left(PROFILE_BUCKETS, seconds)] += 1
+
+    def summary(self) -> Dict[str, Dict[str, float]]:
+        """
+        Summarize the stages.
+
+        Returns:
+            Dict[str, Dict[str, float]]: calls, total and mean seconds by stage,
+                in STAGES order.
+        """
+        return {
+            stage: {
+                "calls": self.calls[stage],
+                "seconds": self.seconds[stage],
+                "mean": self.seconds[stage] / self.calls[stage],
+            }
+            for stage in sorted(
+                self.calls,
+                key=lambda stage: (
+                    STAGES.index(stage) if stage in STAGES else len(STAGES)
+                ),
+            )
+        }
+
+    def reset(self) -> None:
+        """Reset the profile."""
+        self.calls.clear()
+        self.seconds.clear()
+        self.histograms.clear()
+
+
+def _to_player_ids(uids: Sequence[int]) -> List[str]:
+    """
+    Convert integer identifiers to player identifiers, for tracing.
+
+    Args:
+        uids (Sequence[int]): integer identifiers.
+
+    Returns:
+        List[str]: player identifiers.
+    """
+    return [PLAYER_REGISTRY.player_id(int(uid)) for uid in uids]
+
+
+def _native_points(
+    players_ids: Sequence[int],
+    substitutes_ids: Sequence[int],
+    captain_id: int,
+    line_up: str,
+    records: Dict[int, MatchDayRecord],
+    is_away: bool = True,
+    trace: Optional[SubstitutionTrace] = None,
+    profile: Optional[StageProfile] = None,
+) -> float:
+    """
+    Evaluate a team on plain tuples, mirroring Team._points_from_df.
+
+    Args:
+        players_ids (Sequence[int]): integer identifiers of the players in the
+            line-up.
+        substitutes_ids (Sequence[int]): integer identifiers of the substitutes
+            in bench order.
+        captain_id (int): integer identifier of the captain.
+        line_up (str): type of line-up.
+        records (Dict[int, MatchDayRecord]): players statistics indexed by
+            integer identifier, see MatchDay.records.
+        is_away (bool, optional): is the team away. Defaults to True.
+        trace (SubstitutionTrace, optional): trace to fill. Defaults to None,
+            no tracing.
+        profile (StageProfile, optional): profile to fill, already started.
+            Defaults to None, no profiling.
+
+    Returns:
+        float: points for the team.
+    """
+    # candidate players in match day order, as (record, is captain) pairs
+    playing_players: List[Tuple[MatchDayRecord, bool]] = [
+        (record, record.player_id == captain_id)
+        for record in sorted(
+            (
+                records[player_id]
+                for player_id in set(players_ids)
+                if player_id in records
+            ),
+            key=lambda record: record.row,
+        )
+    ]
+    # substitutes with valid points in bench order
+    substitutes = [
+        records[player_id]
+        for player_id in substitutes_ids
+        if player_id in records
+        and (
+            records[player_id].points >= POINTS_THRESHOLD
+            or records[player_id].minutes >= MINUTES_THRESHOLD
+        )
+    ]
+    ordered_substitutes_ids_from_bench = [record.player_id for record in substitutes]
+    if profile is not None:
+        profile.lap("data_frame")
+    if substitutes:
+        candidates_for_substitution = sorted(
+            (
+                (record, is_captain)
+                for record, is_captain in playing_players
+                if record.points < POINTS_THRESHOLD
+                and record.minutes < MINUTES_THRESHOLD
+            ),
+            key=lambda candidate: (not candidate[1], candidate[0].points),
+        )[:MAX_SUBSTITUTIONS]
+        to_be_substituted_ids = [
+            record.player_id for record, _ in candidates_for_substitution
+        ]
+        captain_to_be_substituted = captain_id in to_be_substituted_ids
+        if profile is not None:
+            profile.lap("candidates")
+        # NOTE: handling the goalkeeper
+        if "GOALKEEPER" not in {
+            record.position_name for record, _ in candidates_for_substitution
+        }:
+            substitutes = [
+                record for record in substitutes if record.position_name != "GOALKEEPER"
+            ]
+        else:
+            substitutes = [
+                record for record in substitutes if record.position_name == "GOALKEEPER"
+            ][:1] + [
+                record for record in substitutes if record.position_name != "GOALKEEPER"
+            ]
+        if profile is not None:
+            profile.lap("goalkeeper")
+        # NOTE: handling position limits
+        position_counts = Counter(
+            record.position_name
+            for record, _ in playing_players
+            if record.player_id not in to_be_substituted_ids
+        )
+        ordered_position_names = [
+            position_name
+            for position_name in dict.fromkeys(
+                record.position_name for record in substitutes
+            )
+            if position_name in {"DEFENDER", "MIDFIELDER", "FORWARD"}
+        ]
+        for position_name in ordered_position_names:
+            position_maximum_delta = (
+                POSITION_MAXIMUM[position_name] - position_counts[position_name]
+            )
+            position_minimum_delta = (
+                POSITION_MINIMUM[position_name] - position_counts[position_name]
+            )
+            if position_maximum_delta <= 0:
+                substitutes = [
+                    record
+                    for record in substitutes
+                    if record.position_name != position_name
+                ]
+            else:
+                if position_minimum_delta > 0:
+                    priority_ids = {
+                        record.player_id
+                        for record in [
+                            record
+                            for record in substitutes
+                            if record.position_name == position_name
+                        ][:position_minimum_delta]
+                    }
+                    substitutes = [
+                        record
+                        for record in substitutes
+                        if record.player_id in priority_ids
+                    ] + [
+                        record
+                        for record in substitutes
+                        if record.player_id not in priority_ids
+                    ]
+                kept_ids = {
+                    record.player_id
+                    for record in [
+                        record
+                        for record in substitutes
+                        if record.position_name == position_name
+                    ][:position_maximum_delta]
+                }
+                substitutes = [
+                    record
+                    for record in substitutes
+                    if record.position_name != position_name
+                    or record.player_id in kept_ids
+                ]
+        # NOTE: final list of substitutes following the order of the bench
+        sorter = dict(
+            zip(
+                ordered_substitutes_ids_from_bench,
+                range(len(ordered_substitutes_ids_from_bench)),
+            )
+        )
+        substitutes = sorted(
+            substitutes[: len(candidates_for_substitution)],
+            key=lambda record: sorter[record.player_id],
+        )
+        substitutes_ids = [record.player_id for record in substitutes]
+        if trace is not None:
+            trace.candidates = _to_player_ids(to_be_substituted_ids)
+            trace.substitutes = _to_player_ids(substitutes_ids)
+        if profile is not None:
+            profile.lap("position_limits")
+        captain_substitute_id: Optional[int] = None
+        if substitutes_ids:
+            captain_record: Optional[MatchDayRecord] = next(
+                (
+                    record
+                    for record, _ in playing_players
+                    if record.player_id == captain_id
+                ),
+                None,
+            )
+            if captain_record is None:
+                # NOTE: the reference engine fails as well, see Team._points_from_df
+                raise IndexError(
+                    f"Captain {PLAYER_REGISTRY.player_id(captain_id)} not found."
+                )
+            candidate_captain_substitute_id = next(
+                (
+                    record.player_id
+                    for record in substitutes
+                    if record.position_name == captain_record.position_name
+                ),
+                substitutes_ids[0],
+            )
+            replaced_ids = to_be_substituted_ids[: len(substitutes_ids)]
+            replaced_ids_set = set(replaced_ids)
+            playing_players = [
+                (record, is_captain)
+                for record, is_captain in playing_players
+                if record.player_id not in replaced_ids_set
+            ] + [(record, record.captain) for record in substitutes]
+            if PROBED_LINE_UP != line_up:  # use subsitute order
+                captain_substitute_id = substitutes_ids[0]
+            else:  # use the found id
+                captain_substitute_id = candidate_captain_substitute_id
+            if trace is not None:
+                trace.replaced = _to_player_ids(replaced_ids)
+                trace.replacements = _to_player_ids(substitutes_ids)
+                trace.line_up = PROBED_LINE_UP
+        if captain_substitute_id is not None and captain_to_be_substituted:
+            playing_players = [
+                (record, record.player_id == captain_substitute_id)
+                for record, _ in playing_players
+            ]
+            if trace is not None:
+                trace.captain_substitute = PLAYER_REGISTRY.player_id(
+                    captain_substitute_id
+                )
+        if profile is not None:
+            profile.lap("line_up")
+    if trace is not None:
+        trace.captain = PLAYER_REGISTRY.player_id(int(captain_id))
+        trace.players = _to_player_ids(
+            [record.player_id for record, _ in playing_players]
+        )
+    # compute the points
+    points = 0.0 if is_away else HOME_BONUS
+    for record, is_captain in playing_players:
+        points += CAPTAIN_MODIFIER * record.points if is_captain else record.points
+    if profile is not None:
+        profile.lap("points")
+    return np.round(points, 2)
 
 
 class Team:
     """Team definition."""
 
     def __init__(
-        self, players: List[Player], line_up: str, substitutes: List[Player] = []
+        self,
+        players: Union[List[Player], MatchDay],
+        line_up: str,
+        substitutes: Union[List[Player], MatchDay] = [],
+        engine: str = ENGINE,
     ):
         """
         Initialize the team.
 
         Args:
-            players (List[Player]): players in the starting line-up.
+            players (Union[List[Player], MatchDay]): players in the starting
+                line-up, e.g., selected with MatchDay.select.
             line_up (str): type of line-up.
                 Currently supported:
                 - "3-4-3"
@@ -64,14 +461,31 @@ class Team:
                 - "5-3-2"
                 - "4-5-1"
                 - "5-4-1"
-            substitutes (List[Player], optional): players on the bench. Defaults to [],
-                a.k.a., no substitutes.
+            substitutes (Union[List[Player], MatchDay], optional): players on the
+                bench. Defaults to [], a.k.a., no substitutes.
+            engine (str, optional): engine used to compute the points.
+                Currently supported:
+                - "pandas": data-frame based.
+                - "native": plain Python tuples, faster for a single team.
+                Defaults to ENGINE, "pandas" unless KICKESTSTATS_ENGINE is set.
 
         Raises:
             UnsupportedLineUp: the line-up requested is not supported.
+            UnsupportedEngine: the engine requested is not supported.
         """
-        self.players = Player.from_list_to_df(players)
-        self.substitutes = Player.from_list_to_df(substitutes)
+        if engine not in SUPPORTED_ENGINES:
+            raise UnsupportedEngine(engine)
+        self.engine = engine
+        self.players = (
+            players.players_df
+            if isinstance(players, MatchDay)
+            else Player.from_list_to_df(players)
+        )
+        self.substitutes = (
+            substitutes.players_df
+            if isinstance(substitutes, MatchDay)
+            else Player.from_list_to_df(substitutes)
+        )
         self.line_up = line_up
         self._validate_line_up(self.players, line_up)
 
@@ -101,43 +515,132 @@ class Team:
                     f"not compatible with {line_up_object}, substitutions will take place."
                 )
 
-    def points(self, players: List[Player], is_away: bool = True) -> float:
+    def points(
+        self,
+        players: Union[List[Player], MatchDay],
+        is_away: bool = True,
+        trace: Optional[SubstitutionTrace] = None,
+        profile: Optional[StageProfile] = None,
+    ) -> float:
         """
         Evaluate the team.
 
         Args:
-            players (List[Player]): players with statistics.
+            players (Union[List[Player], MatchDay]): players with statistics.
+                Pass a MatchDay to reuse it across teams.
             is_away (bool, optional): is the team away. Defaults to False.
+            trace (SubstitutionTrace, optional): trace to fill with the
+                substitutions applied. Defaults to None, no tracing.
+            profile (StageProfile, optional): profile to fill with the time
+                spent in each stage. Defaults to None, no profiling.
+
+        Returns:
+            float: points for the team.
+        """
+        if profile is not None:
+            profile.start()
+        match_day = players if isinstance(players, MatchDay) else MatchDay(players)
+        if self.engine == "native":
+            return self._points_from_match_day(
+                match_day, is_away=is_away, trace=trace, profile=profile
+            )
+        return self._points_from_df(
+            match_day.rows(chain(self.players["_uid"], self.substitutes["_uid"])),
+            is_away=is_away,
+            trace=trace,
+            profile=profile,
+        )
+
+    def _get_captain_id(self) -> int:
+        """
+        Get the captain identifier, picking a random one if not provided.
+
+        Returns:
+            int: integer identifier of the captain.
+        """
+        if self.players["captain"].any():
+            return self.players[self.players["captain"]].iloc[0]["_uid"]
+        else:
+            logger.warning("Captain not provided picking a random one")
+            return self.players.sample(1, random_state=42).iloc[0]["_uid"]
+
+    def _points_from_match_day(
+        self,
+        match_day: MatchDay,
+        is_away: bool = True,
+        trace: Optional[SubstitutionTrace] = None,
+        profile: Optional[StageProfile] = None,
+    ) -> float:
+        """
+        Evaluate the team against indexed players statistics using the native engine.
+
+        Args:
+            match_day (MatchDay): players statistics.
+            is_away (bool, optional): is the team away. Defaults to True.
+            trace (SubstitutionTrace, optional): trace to fill with the
+                substitutions applied. Defaults to None, no tracing.
+            profile (StageProfile, optional): profile to fill, already
+                started. Defaults to None, no profiling.
+
+        Returns:
+            float: points for the team.
+        """
+        return _native_points(
+            tuple(self.players["_uid"]),
+            tuple(self.substitutes["_uid"]),
+            self._get_captain_id(),
+            self.line_up,
+            match_day.records,
+            is_away=is_away,
+            trace=trace,
+            profile=profile,
+        )
+
+    def _points_from_df(
+        self,
+        all_players: pd.DataFrame,
+        is_away: bool = True,
+        trace: Optional[SubstitutionTrace] = None,
+        profile: Optional[StageProfile] = None,
+    ) -> float:
+        """
+        Evaluate the team against a data-frame of players.
+
+        Args:
+            all_players (pd.DataFrame): players with statistics, as returned by
+                Player.from_list_to_df. Only rows for the team players and
+                substitutes are used.
+            is_away (bool, optional): is the team away. Defaults to True.
+            trace (SubstitutionTrace, optional): trace to fill with the
+                substitutions applied. Defaults to None, no tracing.
+            profile (StageProfile, optional): profile to fill, already
+                started. Defaults to None, no profiling.
 
         Returns:
             float: points for the team.
         """
-        all_players = Player.from_list_to_df(players)
         all_players_with_valid_points = (all_players["points"] >= POINTS_THRESHOLD) | (
             all_players["minutes"] >= MINUTES_THRESHOLD
         )
         # candidate players
         playing_players = all_players[
-            all_players["_id"].isin(self.players["_id"])
+            all_players["_uid"].isin(self.players["_uid"])
         ].copy()
-        if self.players["captain"].any():
-            captain_id = self.players[self.players["captain"]].iloc[0]["_id"]
-        else:
-            logger.warning("Captain not provided picking a random one")
-            captain_id = self.players.sample(1, random_state=42).iloc[0]["_id"]
-        playing_players.loc[:, "captain"] = playing_players["_id"] == captain_id
-        logger.debug(f"Playing players: {playing_players}")
+        captain_id = self._get_captain_id()
+        playing_players.loc[:, "captain"] = playing_players["_uid"] == captain_id
         # substitutes (preserve bench order)
         substitutes = all_players[
             all_players_with_valid_points
-            & all_players["_id"].isin(self.substitutes["_id"])
+            & all_players["_uid"].isin(self.substitutes["_uid"])
         ]
-        logger.debug(f"Potential substitutes: {substitutes}")
         # sort substitutes by order on the bench
-        substitutes.index = substitutes["_id"]
-        substitutes = substitutes.reindex(self.substitutes["_id"]).dropna()
-        logger.debug(f"Reordered substitutes: {substitutes}")
-        ordered_substitutes_ids_from_bench = substitutes["_id"].tolist()
+        substitutes.index = substitutes["_uid"]
+        substitutes = substitutes.reindex(self.substitutes["_uid"]).dropna()
+        # NOTE: missing substitutes turn identifiers to float, restoring them
+        substitutes["_uid"] = substitutes["_uid"].astype(np.int32)
+        ordered_substitutes_ids_from_bench = substitutes["_uid"].tolist()
+        if profile is not None:
+            profile.lap("data_frame")
         if not substitutes.empty:
             # get and sort for ascending points the candidates
             # (we keep captain first to make sure that if needed, it's substituted)
@@ -150,15 +653,15 @@ class Team:
                 :MAX_SUBSTITUTIONS
             ]
             captain_to_be_substituted = captain_id in set(
-                candidates_for_substitution["_id"].tolist()
+                candidates_for_substitution["_uid"].tolist()
             )
-            logger.debug(f"Candidates for substitution: {candidates_for_substitution}")
+            if profile is not None:
+                profile.lap("candidates")
             # NOTE: handling the goalkeeper
             remove_goalkeeper_from_substitutes = "GOALKEEPER" not in set(
                 candidates_for_substitution["position_name"]
             )
             if remove_goalkeeper_from_substitutes:
-                logger.debug("Optionally removing goalkeeper from substitutes")
                 substitutes = substitutes[
                     ~(substitutes["position_name"] == "GOALKEEPER")
                 ]
@@ -170,12 +673,11 @@ class Team:
                         substitutes[~(substitutes["position_name"] == "GOALKEEPER")],
                     ]
                 )
-                logger.debug(
-                    f"Making sure goalkeeper is substituted first: {substitutes}"
-                )
+            if profile is not None:
+                profile.lap("goalkeeper")
             # NOTE: handling position limits
             players_not_substituted = playing_players[
-                ~playing_players["_id"].isin(candidates_for_substitution["_id"])
+                ~playing_players["_uid"].isin(candidates_for_substitution["_uid"])
             ]
             position_counts = Counter(players_not_substituted["position_name"])
             # NOTE: sort them following the bench
@@ -194,22 +696,15 @@ class Team:
                     POSITION_MINIMUM[position_name] - position_counts[position_name]
                 )
                 if position_maximum_delta <= 0:
-                    logger.debug(
-                        f"Reached limit for postion: {position_name}, adjusting substitutes"
-                    )
                     substitutes = substitutes[
                         ~(substitutes["position_name"] == position_name)
                     ]
                 else:
                     if position_minimum_delta > 0:
-                        logger.debug(
-                            f"Giving priority to at least {position_minimum_delta} "
-                            f"substitutes for position: {position_name}"
-                        )
-                        priority_slicing = substitutes["_id"].isin(
+                        priority_slicing = substitutes["_uid"].isin(
                             substitutes[substitutes["position_name"] == position_name][
                                 :position_minimum_delta
-                            ]["_id"]
+                            ]["_uid"]
                         )
                         substitutes = pd.concat(
                             [
@@ -217,22 +712,16 @@ class Team:
                                 substitutes[~priority_slicing],
                             ]
                         )
-                    logger.debug(
-                        f"Keeping at most {position_maximum_delta} substitutes for position: {position_name}"
-                    )
                     current_position = substitutes["position_name"] == position_name
                     other_positions = ~current_position
                     substitutes = substitutes[
-                        substitutes["_id"].isin(
+                        substitutes["_uid"].isin(
                             substitutes[current_position][:position_maximum_delta][
-                                "_id"
+                                "_uid"
                             ]
                         )
                         | other_positions
                     ]
-                logger.debug(
-                    f"Substitute list after processing {position_name}: {substitutes}"
-                )
             # NOTE: this could be enabled to help boost points
             # substitutes = substitutes.sort_values(by="points", ascending=False)
             # NOTE: final list of substitutes
@@ -244,83 +733,70 @@ class Team:
                     range(len(ordered_substitutes_ids_from_bench)),
                 )
             )
-            substitutes["sorter"] = substitutes["_id"].map(sorter)
+            substitutes["sorter"] = substitutes["_uid"].map(sorter)
             substitutes = substitutes.sort_values(by="sorter")
             substitutes.drop("sorter", axis=1)
-            logger.debug(f"Potential replacements: {substitutes}")
-            to_be_substituted_ids: List[str] = candidates_for_substitution[
-                "_id"
+            to_be_substituted_ids: List[int] = candidates_for_substitution[
+                "_uid"
             ].tolist()
-            substitutes_ids: List[str] = substitutes["_id"].tolist()
-            captain_substitute_id: str = ""
-            # try to find a match between the line-ups and the substitutes configuration
-            line_up_found: bool = False
-            for index in range(len(substitutes_ids)):
-                if line_up_found:
-                    break
-                merge_index = len(substitutes_ids) - index
-                candidate_to_be_substituted_ids = to_be_substituted_ids[:merge_index]
-                candidate_substitutes_ids = substitutes_ids[:merge_index]
+            substitutes_ids: List[int] = substitutes["_uid"].tolist()
+            if trace is not None:
+                trace.candidates = _to_player_ids(to_be_substituted_ids)
+                trace.substitutes = _to_player_ids(substitutes_ids)
+            if profile is not None:
+                profile.lap("position_limits")
+            captain_substitute_id: Optional[int] = None
+            if substitutes_ids:
+                replaced_ids = to_be_substituted_ids[: len(substitutes_ids)]
                 # handling captain
-                candidate_captain_substitute_id = ""
+                candidate_captain_substitute_id: Optional[int] = None
                 try:
                     captain_row = playing_players[
-                        playing_players["_id"] == captain_id
+                        playing_players["_uid"] == captain_id
                     ].iloc[0]
                     captain_substitutes_with_same_position = substitutes[
-                        substitutes["_id"].isin(candidate_substitutes_ids)
+                        substitutes["_uid"].isin(substitutes_ids)
                         & (substitutes["position_name"] == captain_row["position_name"])
                     ]
                     if not captain_substitutes_with_same_position.empty:
                         candidate_captain_substitute_id = (
-                            captain_substitutes_with_same_position.iloc[0]["_id"]
+                            captain_substitutes_with_same_position.iloc[0]["_uid"]
                         )
                     else:
-                        logger.debug(
-                            "Could not replace the captain by position, picking the first substitute as captain"
-                        )
-                        candidate_captain_substitute_id = candidate_substitutes_ids[0]
+                        # NOTE: could not replace the captain by position
+                        candidate_captain_substitute_id = substitutes_ids[0]
                 except ValueError:
-                    logger.debug("Substitution is not about the captain")
-                candidate_playing_players = pd.concat(
+                    # NOTE: substitution is not about the captain
+                    pass
+                playing_players = pd.concat(
                     [
-                        playing_players[
-                            ~playing_players["_id"].isin(
-                                candidate_to_be_substituted_ids
-                            )
-                        ],
-                        substitutes[substitutes["_id"].isin(candidate_substitutes_ids)],
+                        playing_players[~playing_players["_uid"].isin(replaced_ids)],
+                        substitutes[substitutes["_uid"].isin(substitutes_ids)],
                     ],
                     axis=0,
                 )
-                logger.debug(
-                    f"Candidate line-up with {merge_index} substitution/s: {candidate_playing_players}"
-                )
-                # probing line-ups from the most to the least offensive
-                for line_up in SORTED_LINE_UPS:
-                    try:
-                        self._validate_line_up(candidate_playing_players, line_up)
-                        playing_players = candidate_playing_players.copy()
-                        # found the proper line-up
-                        logger.info(
-                            f"{line_up} is valid for: {candidate_playing_players}"
-                        )
-                        if len(candidate_captain_substitute_id):
-                            if line_up != self.line_up:  # use subsitute order
-                                captain_substitute_id = candidate_substitutes_ids[0]
-                            else:  # use the found id
-                                captain_substitute_id = candidate_captain_substitute_id
-                        line_up_found = True
-                        break
-                    except InvalidTeamLineup:
-                        logger.debug(
-                            f"{line_up} is invalid for: {candidate_playing_players}"
-                        )
-            if len(captain_substitute_id) and captain_to_be_substituted:
+                if candidate_captain_substitute_id is not None:
+                    if PROBED_LINE_UP != self.line_up:  # use subsitute order
+                        captain_substitute_id = substitutes_ids[0]
+                    else:  # use the found id
+                        captain_substitute_id = candidate_captain_substitute_id
+                if trace is not None:
+                    trace.replaced = _to_player_ids(replaced_ids)
+                    trace.replacements = _to_player_ids(substitutes_ids)
+                    trace.line_up = PROBED_LINE_UP
+            if captain_substitute_id is not None and captain_to_be_substituted:
                 playing_players.loc[:, "captain"] = (
-                    playing_players["_id"] == captain_substitute_id
+                    playing_players["_uid"] == captain_substitute_id
                 )
-            logger.info(f"Final list: {playing_players}")
+                if trace is not None:
+                    trace.captain_substitute = PLAYER_REGISTRY.player_id(
+                        int(captain_substitute_id)
+                    )
+            if profile is not None:
+                profile.lap("line_up")
+        if trace is not None:
+            trace.captain = PLAYER_REGISTRY.player_id(int(captain_id))
+            trace.players = _to_player_ids(playing_players["_uid"].tolist())
         # compute the points
         points = 0.0 if is_away else HOME_BONUS
         for _, player in playing_players.iterrows():
@@ -329,4 +805,98 @@ class Team:
                 if player["captain"]
                 else player["points"]
             )
+        if profile is not None:
+            profile.lap("points")
         return np.round(points, 2)
+
+
+def score_teams(
+    teams: List[Team],
+    players: Union[List[Player], MatchDay],
+    is_away: Union[bool, Sequence[bool]] = True,
+    profile: Optional[StageProfile] = None,
+) -> np.ndarray:
+    """
+    Evaluate many teams against the same match day.
+
+    The match day is indexed once and each team is evaluated only on the rows
+    of its own players and substitutes, so the cost per team does not depend
+    on the size of the match day.
+
+    Args:
+        teams (List[Team]): teams to evaluate.
+        players (Union[List[Player], MatchDay]): players with statistics.
+        is_away (Union[bool, Sequence[bool]], optional): is the team away.
+            Either a flag for all teams or one flag per team. Defaults to True.
+        profile (StageProfile, optional): profile to fill with the time spent
+            in each stage across teams. Defaults to None, no profiling.
+
+    Returns:
+        np.ndarray: points for each team, same as calling Team.points.
+    """
+    if isinstance(is_away, bool):
+        is_away = [is_away] * len(teams)
+    elif len(is_away) != len(teams):
+        raise ValueError(
+            f"Expected {len(teams)} is_away flags, got {len(is_away)} instead."
+        )
+    match_day = players if isinstance(players, MatchDay) else MatchDay(players)
+    return np.array(
+        [
+            team.points(match_day, is_away=team_is_away, profile=profile)
+            for team, team_is_away in zip(teams, is_away)
+        ],
+        dtype=float,
+    )
+
+
+def evaluate_round(
+    fixtures: Sequence[Tuple[str, str]],
+    teams: Mapping[str, Team],
+    players: Union[List[Player], MatchDay],
+) -> pd.DataFrame:
+    """
+    Evaluate the fixtures of a round.
+
+    The match day is indexed once and each team is evaluated once per side,
+    the home team gets HOME_BONUS.
+
+    Args:
+        fixtures (Sequence[Tuple[str, str]]): home and away team names.
+        teams (Mapping[str, Team]): teams by name.
+        players (Union[List[Player], MatchDay]): players with statistics.
+
+    Raises:
+        KeyError: a team in the fixtures is missing.
+
+    Returns:
+        pd.DataFrame: a row per fixture with teams, points, goals and result,
+            one of HOME_WIN, DRAW and AWAY_WIN.
+    """
+    match_day = players if isinstance(players, MatchDay) else MatchDay(players)
+    sides = dict.fromkeys(
+        side for home, away in fixtures for side in [(home, False), (away, True)]
+    )
+    points = {
+        (name, is_away): teams[name].points(match_day, is_away=is_away)
+        for name, is_away in sides
+    }
+    home_points = np.array([points[(home, False)] for home, _ in fixtures], dtype=float)
+    away_points = np.array([points[(away, True)] for _, away in fixtures], dtype=float)
+    home_goals = np.asarray(points_to_goals(home_points))
+    away_goals = np.asarray(points_to_goals(away_points))
+    return pd.DataFrame(
+        {
+            "home": [home for home, _ in fixtures],
+            "away": [away for _, away in fixtures],
+            "home_points": home_points,
+            "away_points": away_points,
+            "home_goals": home_goals,
+            "away_goals": away_goals,
+            "result": np.where(
+                home_goals > away_goals,
+                HOME_WIN,
+                np.where(home_goals < away_goals, AWAY_WIN, DRAW),
+            ),
+        }
+    )
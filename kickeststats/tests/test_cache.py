@@ -0,0 +1,49 @@
+"""Testing cache utilities."""
+
+from ..cache import Page, PageCache, parse_pages
+
+HEADER = "<tr><th>Giocatore</th><th>PTS</th></tr>"
+PAGINATION = "<ul><li><a>1</a></li><li><a>2</a></li><li><a>&raquo;</a></li></ul>"
+PAGES = [
+    Page(
+        header=HEADER,
+        data="<tr><td>A. Uno</td><td>1</td></tr><tr><td>B. Due</td><td>2</td></tr>",
+        pagination=PAGINATION,
+    ),
+    Page(
+        header=HEADER,
+        data="<tr><td>C. Tre</td><td>3</td></tr>",
+        pagination=PAGINATION,
+    ),
+]
+URL = "https://localhost/stats?matchdays=1"
+
+
+def test_parse_pages():
+    """Testing the parsing of pages."""
+    assert parse_pages(PAGES) == [
+        {"Giocatore": "A. Uno", "PTS": 1.0},
+        {"Giocatore": "B. Due", "PTS": 2.0},
+        {"Giocatore": "C. Tre", "PTS": 3.0},
+    ]
+    assert parse_pages([]) == []
+
+
+def test_page_cache(tmp_path):
+    """Testing the page cache."""
+    cache = PageCache(str(tmp_path))
+    assert cache.get(URL, 1) is None
+    assert cache.load(URL) is None
+    cache.put(URL, 1, PAGES[0])
+    assert cache.get(URL, 1) == PAGES[0]
+    assert cache.pages(URL) == [1]
+    assert cache.pages(URL.replace("matchdays=1", "matchdays=2")) == []
+    # incomplete
+    assert cache.load(URL) is None
+    cache.put(URL, 2, PAGES[1])
+    assert cache.pages(URL) == [1, 2]
+    assert cache.load(URL) == parse_pages(PAGES)
+    # persistent
+    assert PageCache(str(tmp_path)).load(URL) == parse_pages(PAGES)
+    cache.clear(URL)
+    assert cache.pages(URL) == []
@@ -0,0 +1,64 @@
+"""Testing columnar storage utilities."""
+
+import numpy as np
+import pandas as pd
+import pkg_resources
+
+from ..columnar import read_columns, read_columns_df, read_records, write_columns
+from ..convert import jsonl_to_columns
+from ..helpers.data import iter_jsonl
+from ..match_day import MatchDay
+from ..player import Player
+
+PLAYER_JSONL_FILEPATH = pkg_resources.resource_filename(
+    "kickeststats", "resources/tests/players.jsonl"
+)
+
+
+def test_write_and_read_columns(tmp_path):
+    """Testing the roundtrip of records in columnar format."""
+    records = [
+        record for chunk in iter_jsonl(PLAYER_JSONL_FILEPATH) for record in chunk
+    ]
+    dirpath = str(tmp_path / "columns")
+    write_columns(records, dirpath)
+    assert read_records(dirpath) == records
+    arrays = read_columns(dirpath, columns=["PTS", "Giocatore", "missing"])
+    assert list(arrays) == ["PTS", "Giocatore"]
+    assert isinstance(arrays["PTS"], np.memmap)
+    assert arrays["PTS"].dtype == float
+    players_df = read_columns_df(dirpath, columns=["Minuti", "Tiri"])
+    assert players_df.shape == (len(records), 2)
+
+
+def test_write_columns_missing_values(tmp_path):
+    """Testing missing values in columnar format."""
+    dirpath = str(tmp_path / "columns")
+    write_columns([{"a": 1.0, "b": "x"}, {"a": None}], dirpath)
+    records = read_records(dirpath)
+    assert np.isnan(records[1]["a"])
+    assert records[1]["b"] == ""
+
+
+def test_players_from_columns(tmp_path):
+    """Testing the initialization of players from columnar format."""
+    dirpath = str(tmp_path / "columns")
+    assert jsonl_to_columns(PLAYER_JSONL_FILEPATH, dirpath) > 1
+    players = Player.from_jsonl(PLAYER_JSONL_FILEPATH)
+    assert Player.from_columns(dirpath) == players
+    assert len(MatchDay.from_columns(dirpath)) == len(players)
+
+
+def test_match_day_from_columns(tmp_path, monkeypatch):
+    """Testing match days are loaded from columnar format without players."""
+    dirpath = str(tmp_path / "columns")
+    jsonl_to_columns(PLAYER_JSONL_FILEPATH, dirpath)
+    expected_df = Player.from_list_to_df(Player.from_jsonl(PLAYER_JSONL_FILEPATH))
+
+    def from_dict(player_dictionary):
+        raise AssertionError("Unexpected player creation.")
+
+    monkeypatch.setattr(Player, "from_dict", staticmethod(from_dict))
+    match_day = MatchDay.from_columns(dirpath)
+    pd.testing.assert_frame_equal(match_day.players_df, expected_df)
+    assert match_day.records == MatchDay(players_df=expected_df).records
@@ -0,0 +1,74 @@
+"""Testing conversion utilities."""
+
+import os
+import shutil
+
+import pandas as pd
+import pkg_resources
+import pytest
+
+from ..convert import jsonl_files_to_csv, jsonl_to_csv, resolve_jsonl_filepaths
+from ..player import Player
+
+PLAYER_JSONL_FILEPATH = pkg_resources.resource_filename(
+    "kickeststats", "resources/tests/players.jsonl"
+)
+TEST_CASE_JSONL_FILEPATH = pkg_resources.resource_filename(
+    "kickeststats", "resources/tests/players_test_case.jsonl"
+)
+
+
+def _read_reference(filepath: str) -> pd.DataFrame:
+    """Convert a JSONL file loading it in memory."""
+    players_df = Player.from_list_to_df(Player.from_jsonl(filepath))
+    return players_df.drop(columns="_uid").astype({"position": str})
+
+
+def test_jsonl_to_csv(tmp_path):
+    """Testing the streaming conversion of a JSONL file."""
+    csv_filepath = str(tmp_path / "players.csv")
+    assert jsonl_to_csv(PLAYER_JSONL_FILEPATH, csv_filepath, chunk_size=100) == 551
+    pd.testing.assert_frame_equal(
+        pd.read_csv(csv_filepath, index_col=0),
+        _read_reference(PLAYER_JSONL_FILEPATH),
+        check_dtype=False,
+    )
+
+
+def test_jsonl_files_to_csv(tmp_path):
+    """Testing the conversion of multiple JSONL files."""
+    jsonl_directory = tmp_path / "jsonl"
+    jsonl_directory.mkdir()
+    shutil.copy(PLAYER_JSONL_FILEPATH, jsonl_directory / "1.jsonl")
+    shutil.copy(TEST_CASE_JSONL_FILEPATH, jsonl_directory / "2.jsonl")
+    jsonl_filepaths = resolve_jsonl_filepaths(str(jsonl_directory))
+    assert jsonl_filepaths == resolve_jsonl_filepaths(str(jsonl_directory / "*"))
+    with pytest.raises(FileNotFoundError):
+        _ = resolve_jsonl_filepaths(str(tmp_path / "*.jsonl"))
+    # combined
+    csv_filepath = str(tmp_path / "players.csv")
+    jsonl_files_to_csv(jsonl_filepaths, csv_filepath, jobs=2, chunk_size=100)
+    reference_df = pd.concat(
+        [
+            _read_reference(PLAYER_JSONL_FILEPATH),
+            _read_reference(TEST_CASE_JSONL_FILEPATH),
+        ],
+        ignore_index=True,
+    )
+    pd.testing.assert_frame_equal(
+        pd.read_csv(csv_filepath, index_col=0), reference_df, check_dtype=False
+    )
+    # one per input
+    csv_directory = str(tmp_path / "csv")
+    csv_filepaths = jsonl_files_to_csv(
+        jsonl_filepaths, csv_directory, combine=False, jobs=2
+    )
+    assert [os.path.basename(filepath) for filepath in csv_filepaths] == [
+        "1.csv",
+        "2.csv",
+    ]
+    pd.testing.assert_frame_equal(
+        pd.read_csv(csv_filepaths[1], index_col=0),
+        _read_reference(TEST_CASE_JSONL_FILEPATH),
+        check_dtype=False,
+    )
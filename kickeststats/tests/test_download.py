@@ -0,0 +1,348 @@
+"""Testing download utilities."""
+
+import json
+import re
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import List
+from urllib.parse import parse_qs, urlsplit
+
+import pkg_resources
+import pytest
+
+from .. import download
+from ..cache import PageCache
+from ..download import (
+    NextPage,
+    Pagination,
+    TableData,
+    TableHeader,
+    HTTPFetcher,
+    WaitMetrics,
+    download_from_browser,
+    download_from_http,
+    download_match_days,
+    wait_for,
+)
+from ..exceptions import (
+    DownloadFailed,
+    FetchFailed,
+    ParsingException,
+    UnsupportedDownloadBackend,
+    WaitTimeout,
+)
+from ..helpers.parsers import HeaderParser, RowParser
+
+PAGE_FILEPATHS = [
+    pkg_resources.resource_filename(
+        "kickeststats", f"resources/tests/stats_table_page_{page}.html"
+    )
+    for page in range(1, 4)
+]
+PAGES = [open(filepath).read() for filepath in PAGE_FILEPATHS]
+ELEMENTS_PATTERNS = {
+    TableHeader.xpath: r'<thead id="statsTableTHead"><tr>(.*?)</tr></thead>',
+    TableData.xpath: r'<tbody id="statsTableTBody">(.*?)</tbody>',
+    Pagination.xpath: r'<div id="statsTablePagination"><div><div>(.*?)</div>',
+}
+
+
+def _search_element(xpath, html):
+    """Inner HTML of an element in a fixture."""
+    match = re.search(ELEMENTS_PATTERNS[xpath], html)
+    assert match is not None
+    return match.group(1)
+
+
+class FakeElement:
+    """Stand-in for a browser element."""
+
+    def __init__(self, html, on_click=None):
+        self.html = html
+        self.first = self
+        self._on_click = on_click
+
+    def click(self):
+        self._on_click()
+
+
+class FakeBrowser:
+    """Stand-in for a browser serving the pages from local HTML fixtures."""
+
+    def __init__(self, failing_urls=(), render_delay=0, stuck=False, last_page=None):
+        self.failing_urls = set(failing_urls)
+        # pages after the last one fail to render
+        self.last_page = last_page
+        self.visited = []
+        self.closed = False
+        self.page = 0
+        # number of lookups before a page is rendered
+        self.render_delay = render_delay
+        self.stuck = stuck
+        self._lookups = 0
+
+    def visit(self, url):
+        if url in self.failing_urls:
+            raise RuntimeError(f"Failed loading {url}")
+        self.visited.append(url)
+        self.page = 0
+        self._lookups = 0
+
+    def _next_page(self):
+        if not self.stuck:
+            self.page = min(self.page + 1, len(PAGES) - 1)
+            self._lookups = 0
+
+    def find_by_xpath(self, xpath):
+        self._lookups += 1
+        if self._lookups <= self.render_delay:
+            raise LookupError(f"Element {xpath} not rendered yet")
+        if self.last_page is not None and self.page >= self.last_page:
+            raise RuntimeError("Page not rendered")
+        if xpath in ELEMENTS_PATTERNS:
+            return FakeElement(_search_element(xpath, PAGES[self.page]))
+        if xpath == NextPage.xpath.format(len(PAGES) + 1):
+            return FakeElement("&raquo;", on_click=self._next_page)
+        raise ValueError(f"Unexpected xpath {xpath}")
+
+    def quit(self):
+        self.closed = True
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *args):
+        self.quit()
+
+
+class StatsTableServer(ThreadingHTTPServer):
+    """Local HTTP server recording connections and requests."""
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.connections = set()
+        self.requests = []
+        self.paging = True
+        self.url = f"http://127.0.0.1:{self.server_address[1]}/stats?iframe=yes"
+
+
+class StatsTableHandler(BaseHTTPRequestHandler):
+    """Stand-in for the statistics pages, served from local HTML fixtures."""
+
+    server: StatsTableServer
+    protocol_version = "HTTP/1.1"
+    disable_nagle_algorithm = True
+
+    def do_GET(self):
+        split_url = urlsplit(self.path)
+        query = parse_qs(split_url.query)
+        self.server.connections.add(self.client_address)
+        self.server.requests.append(self.path)
+        page = int(query.get("page", ["1"])[0])
+        if split_url.path == "/empty":
+            body, status = b"<html><body></body></html>", 200
+        elif split_url.path != "/stats" or not 1 <= page <= len(PAGES):
+            body, status = b"Not found", 404
+        elif self.server.paging:
+            body, status = PAGES[page - 1].encode(), 200
+        else:
+            body, status = PAGES[0].encode(), 200
+        self.send_response(status)
+        self.send_header("Content-Type", "text/html; charset=utf-8")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, *args):
+        pass
+
+
+@pytest.fixture
+def server():
+    """Local HTTP server for the statistics pages."""
+    http_server = StatsTableServer(("127.0.0.1", 0), StatsTableHandler)
+    thread = threading.Thread(target=http_server.serve_forever, daemon=True)
+    thread.start()
+    yield http_server
+    http_server.shutdown()
+    http_server.server_close()
+
+
+def _expected_players():
+    """Players in the HTML fixtures."""
+    header_parser = HeaderParser()
+    header_parser.feed(_search_element(TableHeader.xpath, PAGES[0]))
+    header = header_parser.out()
+    players = []
+    for page in PAGES:
+        row_parser = RowParser()
+        row_parser.feed(_search_element(TableData.xpath, page))
+        players.extend(row_parser.out(header))
+    return players
+
+
+def test_wait_for():
+    """Testing the waits for a condition."""
+    metrics = WaitMetrics()
+    checks = iter([False, ValueError, True])
+
+    def condition():
+        check = next(checks)
+        if check is ValueError:
+            raise check("Not ready")
+        return check
+
+    assert wait_for(condition, timeout=5.0, poll_interval=0.01, metrics=metrics) > 0
+    assert (metrics.waits, metrics.timeouts) == (1, 0)
+    with pytest.raises(WaitTimeout):
+        _ = wait_for(lambda: False, timeout=0.05, poll_interval=0.01, metrics=metrics)
+    assert (metrics.waits, metrics.timeouts) == (2, 1)
+    assert metrics.seconds >= 0.05
+    metrics.reset()
+    assert metrics == WaitMetrics()
+
+
+def test_download_from_browser():
+    """Testing the download of all pages."""
+    browser = FakeBrowser()
+    players = download_from_browser(browser, download.get_url(1))
+    assert browser.visited == [download.get_url(1)]
+    assert len(players) == 30
+    assert players == _expected_players()
+    assert players[0]["Giocatore"] == "R. Leao"
+    # pages rendered after some lookups
+    assert (
+        download_from_browser(
+            FakeBrowser(render_delay=3), download.get_url(1), poll_interval=0.001
+        )
+        == players
+    )
+    # pages not changing after moving to the next one
+    with pytest.raises(WaitTimeout):
+        _ = download_from_browser(
+            FakeBrowser(stuck=True), download.get_url(1), timeout=0.05
+        )
+
+
+def test_download_match_days(tmp_path):
+    """Testing the download of many match days with a pool of browsers."""
+    browsers: List[FakeBrowser] = []
+
+    def browser_factory():
+        # the first session always fails on match day 2
+        browser = FakeBrowser(failing_urls=[] if browsers else [download.get_url(2)])
+        browsers.append(browser)
+        return browser
+
+    players_by_match_day = download_match_days(
+        range(1, 6),
+        workers=2,
+        retries=1,
+        output_dirpath=str(tmp_path),
+        browser_factory=browser_factory,
+        backend="browser",
+    )
+    assert list(players_by_match_day) == [1, 2, 3, 4, 5]
+    expected_players = _expected_players()
+    for match_day, players in players_by_match_day.items():
+        assert players == expected_players
+        with open(tmp_path / f"{match_day}.jsonl") as fp:
+            assert [json.loads(line) for line in fp] == expected_players
+    assert 2 <= len(browsers) <= 3
+    assert all(browser.closed for browser in browsers)
+    visited = sorted(url for browser in browsers for url in browser.visited)
+    assert visited == sorted(download.get_url(match_day) for match_day in range(1, 6))
+    # failing on every attempt
+    with pytest.raises(DownloadFailed):
+        _ = download_match_days(
+            [1, 2],
+            workers=2,
+            retries=1,
+            browser_factory=lambda: FakeBrowser(failing_urls=[download.get_url(2)]),
+            backend="browser",
+        )
+
+
+def test_download_from_http(server):
+    """Testing the download of all pages over HTTP."""
+    with HTTPFetcher() as fetcher:
+        players = download_from_http(server.url, fetcher)
+        assert players == _expected_players()
+        assert server.requests == [
+            "/stats?iframe=yes",
+            "/stats?iframe=yes&page=2",
+            "/stats?iframe=yes&page=3",
+        ]
+        # a single keep-alive connection
+        assert len(server.connections) == 1
+        with pytest.raises(FetchFailed):
+            _ = fetcher.get(server.url.replace("/stats", "/missing"))
+        with pytest.raises(ParsingException):
+            _ = download_from_http(server.url.replace("/stats", "/empty"), fetcher)
+    # paging not supported
+    server.paging = False
+    with pytest.raises(FetchFailed):
+        _ = download_from_http(server.url)
+
+
+def test_download_match_days_http(server, monkeypatch):
+    """Testing the download of many match days over HTTP."""
+    monkeypatch.setattr(download, "KICKEST_URL", server.url)
+    players_by_match_day = download_match_days(
+        range(1, 5), workers=2, browser_factory=FakeBrowser, backend="http"
+    )
+    assert list(players_by_match_day) == [1, 2, 3, 4]
+    assert all(
+        players == _expected_players() for players in players_by_match_day.values()
+    )
+    assert len(server.requests) == 12
+    assert len(server.connections) <= 2
+    # falling back to browsers
+    server.paging = False
+    browsers: List[FakeBrowser] = []
+
+    def browser_factory():
+        browsers.append(FakeBrowser())
+        return browsers[-1]
+
+    players_by_match_day = download_match_days(
+        [1, 2], workers=2, browser_factory=browser_factory, backend="http"
+    )
+    assert all(
+        players == _expected_players() for players in players_by_match_day.values()
+    )
+    assert sorted(url for browser in browsers for url in browser.visited) == [
+        download.get_url(1),
+        download.get_url(2),
+    ]
+    with pytest.raises(UnsupportedDownloadBackend):
+        _ = download_match_days([1], backend="carrier pigeon")
+
+
+def test_download_resume(server, tmp_path):
+    """Testing downloads resuming from the page cache."""
+    url = download.get_url(1)
+    cache = PageCache(str(tmp_path / "browser"))
+    with pytest.raises(WaitTimeout):
+        _ = download_from_browser(
+            FakeBrowser(last_page=2), url, timeout=0.05, cache=cache
+        )
+    assert cache.pages(url) == [1, 2]
+    browser = FakeBrowser()
+    assert download_from_browser(browser, url, cache=cache) == _expected_players()
+    assert cache.pages(url) == [1, 2, 3]
+    # complete downloads are loaded without visiting the pages
+    browser = FakeBrowser()
+    assert download_from_browser(browser, url, cache=cache) == _expected_players()
+    assert browser.visited == []
+    assert download.download_data(1, cache=cache) == _expected_players()
+    # over HTTP, only the pages not cached are fetched
+    cache = PageCache(str(tmp_path / "http"))
+    with HTTPFetcher() as fetcher:
+        assert download_from_http(server.url, fetcher, cache) == _expected_players()
+        assert len(server.requests) == 3
+        assert download_from_http(server.url, fetcher, cache) == _expected_players()
+        assert len(server.requests) == 3
+        (tmp_path / "http" / cache._get_dirpath(server.url) / "2.json").unlink()
+        assert download_from_http(server.url, fetcher, cache) == _expected_players()
+        assert server.requests[3:] == ["/stats?iframe=yes&page=2"]
@@ -1,12 +1,18 @@
 """Testing exception utilities."""
+
 import pytest
 
 from ..exceptions import (
+    DownloadFailed,
     EnvVariableNotSet,
+    FetchFailed,
     InvalidLineUp,
     InvalidTeamLineup,
     ParsingException,
+    UnsupportedDownloadBackend,
+    UnsupportedEngine,
     UnsupportedLineUp,
+    WaitTimeout,
 )
 
 
@@ -37,3 +43,38 @@ def test_unsupported_line_up():
 def test_invalid_team_line_up():
     with pytest.raises(Exception):
         raise InvalidTeamLineup("An invalid team line-up error.")
+
+
+def test_unsupported_engine():
+    with pytest.raises(Exception):
+        exception = UnsupportedEngine("X")
+        assert str(exception) == "Engine [X] is not supported."
+        raise exception
+
+
+def test_download_failed():
+    with pytest.raises(Exception):
+        exception = DownloadFailed(3, 2)
+        assert str(exception) == "Download of match day [3] failed after 2 attempts."
+        raise exception
+
+
+def test_wait_timeout():
+    with pytest.raises(Exception):
+        exception = WaitTimeout(1.5)
+        assert str(exception) == "Waited more than [1.5] seconds."
+        raise exception
+
+
+def test_fetch_failed():
+    with pytest.raises(Exception):
+        exception = FetchFailed("http://localhost", 404)
+        assert str(exception) == "Fetching [http://localhost] failed with status [404]."
+        raise exception
+
+
+def test_unsupported_download_backend():
+    with pytest.raises(Exception):
+        exception = UnsupportedDownloadBackend("X")
+        assert str(exception) == "Download backend [X] is not supported."
+        raise exception
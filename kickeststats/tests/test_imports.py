@@ -0,0 +1,93 @@
+"""Testing lazy import utilities and the startup time."""
+
+import os
+import subprocess
+import sys
+import time
+
+import pytest
+
+from ..helpers.imports import LazyImport
+
+# NOTE: generous default, CI machines can be slow
+STARTUP_BUDGET = float(os.environ.get("KICKESTSTATS_STARTUP_BUDGET", 1.0))
+HEAVY_MODULES = ["loguru", "pandas", "pkg_resources", "selenium", "splinter"]
+MODULES = [
+    "kickeststats.constants",
+    "kickeststats.convert",
+    "kickeststats.download",
+    "kickeststats.optimizer",
+    "kickeststats.service",
+    "kickeststats.simulator",
+    "kickeststats.store",
+    "kickeststats.sync",
+    "kickeststats.team",
+]
+BIN_DIRPATH = os.path.join(os.path.dirname(__file__), os.pardir, os.pardir, "bin")
+STARTUP_SCRIPT = """
+import sys
+import time
+
+start = time.perf_counter()
+import {module}
+
+print(time.perf_counter() - start)
+print(",".join(sorted(set(sys.modules) & set({heavy_modules}))))
+"""
+
+
+def test_lazy_import():
+    """Testing modules and attributes are imported on first access."""
+    module = LazyImport("json")
+    assert module.dumps([1]) == "[1]"
+    function = LazyImport("json", "dumps")
+    assert function.__name__ == "dumps"
+    with pytest.raises(ModuleNotFoundError):
+        _ = LazyImport("kickeststats.missing").attribute
+
+
+@pytest.mark.parametrize("module", MODULES)
+def test_startup(module):
+    """Testing modules are imported without heavy dependencies and in budget."""
+    output = subprocess.run(
+        [
+            sys.executable,
+            "-c",
+            STARTUP_SCRIPT.format(module=module, heavy_modules=HEAVY_MODULES),
+        ],
+        check=True,
+        stdout=subprocess.PIPE,
+        universal_newlines=True,
+    ).stdout.splitlines()
+    assert float(output[0]) < STARTUP_BUDGET
+    assert output[1] == ""
+
+
+@pytest.mark.parametrize(
+    "script",
+    [
+        "kickeststats-download-data",
+        "kickeststats-jsonl-to-csv",
+        "kickeststats-serve",
+        "kickeststats-sync-season",
+    ],
+)
+def test_script_help_startup(script):
+    """Testing scripts print their help within the budget."""
+    filepath = os.path.join(BIN_DIRPATH, script)
+    if not os.path.exists(filepath):
+        pytest.skip("scripts not available")
+    start = time.perf_counter()
+    subprocess.run(
+        [sys.executable, filepath, "--help"],
+        check=True,
+        stdout=subprocess.PIPE,
+        env={
+            **os.environ,
+            "PYTHONPATH": os.pathsep.join(
+                [os.path.join(BIN_DIRPATH, os.pardir)] + sys.path
+            ),
+        },
+    )
+    # NOTE: the budget includes the interpreter startup
+    assert time.perf_counter() - start < 2 * STARTUP_BUDGET
@@ -1,4 +1,5 @@
 """Testing line-up utilities."""
+
 from ..line_up import LU343, LU352, LU433, LU442, LU451, LU532, LU541
 
 
@@ -0,0 +1,58 @@
+"""Testing match day utilities."""
+
+import pkg_resources
+import pytest
+
+from ..match_day import MatchDay
+from ..player import Player
+from ..team import Team
+from .test_team import TEAM_PLAYERS, TEAM_SUBSTITUTES
+
+TEST_CASE_JSONL_FILEPATH = pkg_resources.resource_filename(
+    "kickeststats", "resources/tests/players_test_case.jsonl"
+)
+PLAYERS_TEST_CASE = Player.from_jsonl(TEST_CASE_JSONL_FILEPATH)
+
+
+def test_match_day_initialization():
+    """Testing the initialization of a match day."""
+    with pytest.raises(ValueError):
+        _ = MatchDay()
+    match_day = MatchDay.from_jsonl(TEST_CASE_JSONL_FILEPATH)
+    assert len(match_day) == len(PLAYERS_TEST_CASE)
+    players_df = Player.from_list_to_df(PLAYERS_TEST_CASE)
+    assert MatchDay(players_df=players_df).records == match_day.records
+    assert all(player_id in match_day for player_id in players_df["_id"])
+    assert "missing" not in match_day
+
+
+def test_match_day_rows():
+    """Testing the rows lookup keeps the match day order."""
+    match_day = MatchDay(PLAYERS_TEST_CASE)
+    player_ids = match_day.players_df["_uid"].tolist()
+    rows = match_day.rows([player_ids[10], -1, player_ids[2]])
+    assert rows["_uid"].tolist() == [player_ids[2], player_ids[10]]
+
+
+def test_match_day_select():
+    """Testing the selection of a team from a match day."""
+    match_day = MatchDay(PLAYERS_TEST_CASE)
+    team_players_df = Player.from_list_to_df(TEAM_PLAYERS)
+    substitutes_df = Player.from_list_to_df(TEAM_SUBSTITUTES)
+    captain_id = team_players_df[team_players_df["captain"]].iloc[0]["_id"]
+    players = match_day.select(team_players_df["_id"], captain_id=captain_id)
+    assert players.players_df["_id"].tolist() == team_players_df["_id"].tolist()
+    assert players.players_df["captain"].sum() == 1
+    with pytest.raises(KeyError):
+        _ = match_day.select(["missing"])
+    team = Team(
+        players=players,
+        substitutes=match_day.select(substitutes_df["_id"]),
+        line_up="4-4-2",
+    )
+    reference_team = Team(
+        players=TEAM_PLAYERS, substitutes=TEAM_SUBSTITUTES, line_up="4-4-2"
+    )
+    for engine in ["pandas", "native"]:
+        team.engine = engine
+        assert team.points(match_day) == reference_team.points(PLAYERS_TEST_CASE)
@@ -0,0 +1,128 @@
+"""Testing optimizer utilities."""
+
+from itertools import combinations, product
+
+import numpy as np
+import pkg_resources
+import pytest
+
+from ..exceptions import InvalidLineUp
+from ..line_up import LINE_UP_FACTORY, POSITION_NAMES_TO_ATTRIBUTES
+from ..optimizer import POSITION_NAMES, build_squad
+from ..player import Player, Position
+from ..team import CAPTAIN_MODIFIER
+
+PLAYER_JSONL_FILEPATH = pkg_resources.resource_filename(
+    "kickeststats", "resources/tests/players.jsonl"
+)
+PLAYERS = Player.from_jsonl(PLAYER_JSONL_FILEPATH)
+SUBSTITUTES = {"GOALKEEPER": 1, "DEFENDER": 2, "MIDFIELDER": 2, "FORWARD": 2}
+
+
+def _brute_force(players, projected_points, budget):
+    """Best starters points enumerating all line-ups."""
+    best = None
+    for line_up_type in LINE_UP_FACTORY.values():
+        selections = [
+            combinations(
+                [
+                    (player, points)
+                    for player, points in zip(players, projected_points)
+                    if player.position.name == position_name
+                ],
+                getattr(line_up_type, POSITION_NAMES_TO_ATTRIBUTES[position_name]),
+            )
+            for position_name in POSITION_NAMES
+        ]
+        for selection in product(*selections):
+            picked = [player_points for group in selection for player_points in group]
+            if sum(round(player.value * 10) for player, _ in picked) > budget * 10:
+                continue
+            points = [points for _, points in picked]
+            total = sum(points) + (CAPTAIN_MODIFIER - 1) * max(points)
+            best = total if best is None else max(best, total)
+    return best
+
+
+def test_build_squad():
+    """Testing the squad building on the full pool."""
+    projected_points = np.random.RandomState(42).uniform(-2.0, 12.0, len(PLAYERS))
+    squad = build_squad(
+        PLAYERS,
+        150.0,
+        substitutes=SUBSTITUTES,
+        projected_points=projected_points.tolist(),
+    )
+    assert len(squad.players) == 11
+    assert sum(player.captain for player in squad.players) == 1
+    assert len(squad.substitutes) == 7
+    assert squad.value <= 150.0
+    line_up = LINE_UP_FACTORY[squad.line_up]()
+    for position_name in POSITION_NAMES:
+        assert sum(
+            player.position.name == position_name for player in squad.players
+        ) == getattr(line_up, POSITION_NAMES_TO_ATTRIBUTES[position_name])
+        assert (
+            sum(player.position.name == position_name for player in squad.substitutes)
+            == SUBSTITUTES[position_name]
+        )
+    squad_players = squad.players + squad.substitutes
+    assert len({(player.name, player.team) for player in squad_players}) == 18
+    # substitutes sorted by descending points
+    points_by_name = {
+        player.name: points for player, points in zip(PLAYERS, projected_points)
+    }
+    substitutes_points = [points_by_name[player.name] for player in squad.substitutes]
+    assert substitutes_points == sorted(substitutes_points, reverse=True)
+    _ = squad.to_team()
+    with pytest.raises(InvalidLineUp):
+        _ = build_squad(PLAYERS, 10.0)
+    with pytest.raises(ValueError):
+        _ = build_squad(PLAYERS, 150.0, projected_points=[1.0])
+
+
+def test_build_squad_optimality():
+    """Testing the squad building against a brute force on small pools."""
+    random_state = np.random.RandomState(0)
+    for _ in range(10):
+        indices = random_state.choice(len(PLAYERS), 20, replace=False)
+        players = [PLAYERS[index] for index in indices]
+        projected_points = random_state.uniform(-2.0, 12.0, len(players)).tolist()
+        budget = float(random_state.uniform(60.0, 140.0))
+        expected = _brute_force(players, projected_points, budget)
+        if expected is None:
+            with pytest.raises(InvalidLineUp):
+                _ = build_squad(players, budget, projected_points=projected_points)
+        else:
+            squad = build_squad(players, budget, projected_points=projected_points)
+            assert squad.points == pytest.approx(expected, abs=1e-2)
+
+
+def test_build_squad_cheapest_starters():
+    """Testing the bench budget when the cheapest players are the best starters."""
+    players = [
+        Player("GK", Position.GOALKEEPER, "A", value=1.0, points=10.0),
+        Player("Backup GK", Position.GOALKEEPER, "B", value=3.0, points=1.0),
+    ]
+    for position, value, points, count in [
+        (Position.DEFENDER, 2.0, 12.0, 5),
+        (Position.DEFENDER, 1.0, 10.0, 5),
+        (Position.MIDFIELDER, 1.0, 10.0, 5),
+        (Position.FORWARD, 1.0, 10.0, 3),
+    ]:
+        players.extend(
+            Player(
+                f"{position.name} {value} {index}",
+                position,
+                "A",
+                value=value,
+                points=points,
+            )
+            for index in range(count)
+        )
+    # NOTE: the best starters for 16 leave 1 for the bench, the backup costs 3
+    squad = build_squad(players, 17.0, substitutes={"GOALKEEPER": 1})
+    assert [player.name for player in squad.substitutes] == ["Backup GK"]
+    assert squad.value <= 17.0
+    # 3 of the best defenders, captain included, with the cheap goalkeeper
+    assert squad.points == pytest.approx(10.0 * 8 + 12.0 * 3 + 6.0)
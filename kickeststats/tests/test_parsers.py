@@ -0,0 +1,141 @@
+"""Testing parsing utilities."""
+
+import numpy as np
+import pkg_resources
+import pytest
+
+from ..exceptions import ParsingException
+from ..helpers.parsers import ElementParser, HeaderParser, RowParser, TableParser
+
+PAGE_FILEPATH = pkg_resources.resource_filename(
+    "kickeststats", "resources/tests/stats_table_page_1.html"
+)
+PAGE = open(PAGE_FILEPATH).read()
+
+
+def _get_element(element_id):
+    """Inner HTML of an element in the page."""
+    parser = ElementParser(element_id)
+    parser.feed(PAGE)
+    return parser.out()
+
+
+def test_element_parser():
+    """Testing the extraction of elements."""
+    assert _get_element("statsTableTHead").startswith("<tr><th>#</th>")
+    assert _get_element("statsTablePagination").startswith("<div><div><ul>")
+    with pytest.raises(ParsingException):
+        _ = _get_element("missing")
+    # many elements in a single pass
+    parser = ElementParser("statsTableTHead", "statsTableTBody", "missing")
+    parser.feed(PAGE[:100])
+    parser.feed(PAGE[100:])
+    assert parser.out() == _get_element("statsTableTHead")
+    assert parser.out("statsTableTBody") == _get_element("statsTableTBody")
+    with pytest.raises(ParsingException):
+        _ = parser.out("missing")
+
+
+def test_element_parser_tags():
+    """Testing nested tags, comments, scripts and attributes are handled."""
+    parser = ElementParser("a", "b", "c", "d")
+    parser.feed(
+        "<script>var s = '<div id=\"a\">script</div>';</script>"
+        '<div id="a"><div>x</div><span title="1 > 0">y</span>'
+        "<!-- </div> --></div>"
+        "<p data-id='b'>data</p><p id='b'>b</p><br id=c /><style>#d {}</style>"
+    )
+    assert parser.out("a") == (
+        '<div>x</div><span title="1 > 0">y</span><!-- </div> -->'
+    )
+    assert parser.out("b") == "b"
+    assert parser.out("c") == ""
+    with pytest.raises(ParsingException):
+        _ = parser.out("d")
+
+
+def test_table_parser():
+    """Testing the parsing of a table page."""
+    header_parser = HeaderParser()
+    header_parser.feed(_get_element("statsTableTHead"))
+    row_parser = RowParser()
+    row_parser.feed(_get_element("statsTableTBody"))
+    expected = row_parser.out(header_parser.out())
+    # header learned from the <th> cells
+    parser = TableParser()
+    parser.feed(_get_element("statsTableTHead"))
+    parser.feed(_get_element("statsTableTBody"))
+    assert parser.header == header_parser.out()
+    assert parser.out() == expected
+    assert len(parser) == 10
+    # given header, fed in chunks
+    body = _get_element("statsTableTBody")
+    parser = TableParser(header_parser.out())
+    for start in range(0, len(body), 7):
+        parser.feed(body[start : start + 7])
+    assert parser.out() == expected
+    columns = parser.columns()
+    assert columns["PTS"].dtype == float
+    assert columns["Giocatore"].tolist() == [player["Giocatore"] for player in expected]
+    players_df = parser.to_df()
+    assert players_df.shape == (10, len(header_parser.out()))
+    assert players_df["Minuti"].dtype == float
+
+
+def test_table_parser_ragged_rows():
+    """Testing the parsing of rows with missing, empty and extra cells."""
+    parser = TableParser()
+    parser.feed(
+        "<table><thead><tr><th>Giocatore</th><th>PTS</th><th>CR</th></tr></thead>"
+        "<tbody>"
+        "<tr><td>A. Uno</td><td></td><td>4.5</td></tr>"
+        "<tr><td><a href='#'>B. <b>Due</b></a></td><td> 7 </td></tr>"
+        "<tr><td>C. Tre &amp; Co</td><td>1</td><td>n.d.</td><td>extra</td></tr>"
+        "<!-- <tr><td>commented</td></tr> -->"
+        "</tbody></table>"
+    )
+    assert parser.out() == [
+        {"Giocatore": "A. Uno", "PTS": None, "CR": 4.5},
+        {"Giocatore": "B. Due", "PTS": 7.0, "CR": None},
+        {"Giocatore": "C. Tre & Co", "PTS": 1.0, "CR": "n.d."},
+    ]
+    columns = parser.columns()
+    np.testing.assert_array_equal(columns["PTS"], [np.nan, 7.0, 1.0])
+    assert columns["CR"].dtype == object
+
+
+def test_table_parser_close():
+    """Testing the text pending at the end of the last chunk is parsed on close."""
+    parser = TableParser(["Giocatore", "Note"])
+    for chunk in [
+        "<tr><td>A. Uno</td><td>1 <",
+        " 2</td></tr><tr><td>B. Due",
+        "</td><td>3 < 4",
+    ]:
+        parser.feed(chunk)
+    assert parser.out() == [
+        {"Giocatore": "A. Uno", "Note": "1 < 2"},
+        {"Giocatore": "B. Due", "Note": "3 < 4"},
+    ]
+
+
+def test_table_parser_column_types():
+    """Testing the column types are learned from the header."""
+    parser = TableParser()
+    parser.feed(
+        "<tr><th>Giocatore</th><th>Nazione</th><th>Maglia</th><th>CR</th></tr>"
+        "<tr><td>A. Uno</td><td>ITA</td><td>9</td><td>4.5</td></tr>"
+        "<tr><td>007</td><td>10</td><td>10</td><td>n.d.</td></tr>"
+    )
+    assert parser.column_types == {
+        "Giocatore": str,
+        "Nazione": None,
+        "Maglia": None,
+        "CR": float,
+    }
+    columns = parser.columns()
+    # unseen columns are numbers only if all the cells are numbers
+    assert columns["Nazione"].tolist() == ["ITA", "10"]
+    assert columns["Maglia"].dtype == float
+    assert columns["Giocatore"].tolist() == ["A. Uno", "007"]
+    assert columns["CR"].tolist() == [4.5, "n.d."]
@@ -1,9 +1,17 @@
 """Testing player utilities."""
+
+import pickle
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import replace
 from typing import Any, Dict
 
+import numpy as np
+import pandas as pd
 import pkg_resources
+import pytest
 
-from ..player import POSITION_MAPPINGS, Player
+from ..exceptions import ParsingException
+from ..player import POSITION_MAPPINGS, Player, PlayerBatch, PlayerRegistry
 
 PLAYER_EXAMPLE: Dict[str, Any] = {
     "Giocatore": "R. Leao",
@@ -33,7 +41,96 @@ def test_players_from_jsonl():
     assert len(players) > 1
 
 
+def test_players_iter_jsonl(tmp_path):
+    """Testing the streaming of players from a jsonl."""
+    players = Player.from_jsonl(PLAYER_JSONL_FILEPATH)
+    chunks = list(Player.iter_jsonl(PLAYER_JSONL_FILEPATH, chunk_size=100))
+    assert max(len(chunk) for chunk in chunks) == 100
+    assert [player for chunk in chunks for player in chunk] == players
+    # single quotes and blank lines
+    filepath = tmp_path / "players.jsonl"
+    filepath.write_text(f"{PLAYER_EXAMPLE}\n\n{PLAYER_EXAMPLE}\n")
+    assert Player.from_jsonl(str(filepath)) == [Player.from_dict(PLAYER_EXAMPLE)] * 2
+    # code is not evaluated
+    filepath.write_text("__import__('os').getcwd()\n")
+    with pytest.raises(ParsingException):
+        _ = Player.from_jsonl(str(filepath))
+
+
 def test_players_from_list_to_df():
     """Testing the transformation from list of players to data-frame."""
     players = Player.from_jsonl(PLAYER_JSONL_FILEPATH)
     assert Player.from_list_to_df(players).shape[0] == len(players)
+
+
+def test_player_registry():
+    """Testing the interning of player identifiers."""
+    registry = PlayerRegistry()
+    uids = registry.intern(["a", "b", "a"])
+    assert uids.dtype == "int32"
+    assert uids.tolist() == [0, 1, 0]
+    assert registry.intern(["c", "b"]).tolist() == [2, 1]
+    assert len(registry) == 3
+    assert registry.get("c") == 2
+    assert registry.get("d") is None
+    assert registry.player_id(1) == "b"
+
+
+def test_player_registry_threads():
+    """Testing concurrent interning assigns distinct identifiers."""
+    registry = PlayerRegistry()
+    player_ids = [[f"{index}-{thread}" for index in range(2000)] for thread in range(8)]
+    with ThreadPoolExecutor(max_workers=8) as executor:
+        uids = list(executor.map(registry.intern, player_ids))
+    assert len(registry) == 8 * 2000
+    assert sorted(np.concatenate(uids).tolist()) == list(range(8 * 2000))
+    for thread_player_ids, thread_uids in zip(player_ids, uids):
+        assert [registry.player_id(uid) for uid in thread_uids] == thread_player_ids
+
+
+def test_players_from_list_to_df_reuses_integer_ids():
+    """Testing integer identifiers are reused across data-frames."""
+    players = Player.from_jsonl(PLAYER_JSONL_FILEPATH)
+    players_df = Player.from_list_to_df(players)
+    reversed_players_df = Player.from_list_to_df(players[::-1])
+    assert players_df["_uid"].dtype == "int32"
+    assert (
+        players_df.set_index("_id")["_uid"].to_dict()
+        == reversed_players_df.set_index("_id")["_uid"].to_dict()
+    )
+
+
+def test_player_slots():
+    """Testing players are compact records."""
+    player = Player.from_dict(PLAYER_EXAMPLE)
+    assert not hasattr(player, "__dict__")
+    with pytest.raises(AttributeError):
+        setattr(player, "goals", 1)
+    assert replace(player, captain=True).captain
+    assert pickle.loads(pickle.dumps(player)) == player
+    players = Player.from_jsonl(PLAYER_JSONL_FILEPATH)
+    milan_players = [player for player in players if player.team == "MIL"]
+    assert milan_players[0].team is milan_players[1].team
+
+
+def test_player_batch(tmp_path):
+    """Testing the batch of players stored as parallel arrays."""
+    players = Player.from_jsonl(PLAYER_JSONL_FILEPATH)
+    players[3] = replace(players[3], captain=True)
+    batch = PlayerBatch(players)
+    assert len(batch) == len(players)
+    assert batch[3] == players[3]
+    assert batch.to_players() == players
+    assert batch.positions.dtype == "int8"
+    assert len(batch.teams) < len(players)
+    assert batch.nbytes == 32 * len(players)
+    pd.testing.assert_frame_equal(batch.to_df(), Player.from_list_to_df(players))
+    assert PlayerBatch.from_jsonl(
+        PLAYER_JSONL_FILEPATH, chunk_size=100
+    ).to_players() == [replace(player, captain=False) for player in players]
+    # concatenating batches merges the tables
+    concatenated = PlayerBatch.concatenate([batch, PlayerBatch(players[::-1])])
+    assert concatenated.to_players() == players + players[::-1]
+    assert concatenated.names == batch.names
+    assert len(PlayerBatch.concatenate([])) == 0
+    assert PlayerBatch().to_df().empty
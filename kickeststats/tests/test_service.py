@@ -0,0 +1,206 @@
+"""Testing the scoring service."""
+
+import asyncio
+import json
+from dataclasses import asdict, replace
+
+import pkg_resources
+import pytest
+
+from ..exceptions import InvalidTeamRequest, UnsupportedEngine
+from ..match_day import MatchDay
+from ..player import Player
+from ..service import ScoringService, parse_team_request
+from ..team import Team
+
+TEST_CASE_JSONL_FILEPATH = pkg_resources.resource_filename(
+    "kickeststats", "resources/tests/players_test_case.jsonl"
+)
+PLAYERS = Player.from_jsonl(TEST_CASE_JSONL_FILEPATH)
+LINE_UP = {"GOALKEEPER": 1, "DEFENDER": 4, "MIDFIELDER": 4, "FORWARD": 2}
+
+
+def _pick_team(offset):
+    """Starting players and substitutes from the test case, shifted by offset."""
+    players, substitutes = [], []
+    for position_name, count in LINE_UP.items():
+        position_players = [
+            player for player in PLAYERS if player.position.name == position_name
+        ][offset : offset + count + 1]
+        players.extend(position_players[:count])
+        substitutes.extend(position_players[count:])
+    return players, substitutes
+
+
+def _to_dict(player):
+    """Player as submitted to the service."""
+    return {
+        key: value.name if key == "position" else value
+        for key, value in asdict(player).items()
+        if key in {"name", "position", "team"}
+    }
+
+
+def _payload(offset, is_away=True):
+    """Team submission and its expected points."""
+    players, substitutes = _pick_team(offset)
+    captain = players[-1].name
+    team = Team(
+        players[:-1] + [replace(players[-1], captain=True)], "4-4-2", substitutes
+    )
+    return (
+        {
+            "players": [_to_dict(player) for player in players],
+            "line_up": "4-4-2",
+            "substitutes": [_to_dict(player) for player in substitutes],
+            "captain": captain,
+            "is_away": is_away,
+        },
+        team.points(PLAYERS, is_away=is_away),
+    )
+
+
+async def _request(port, method, path, payload=None, body=None, content_length=None):
+    """Send a request, returning the status and the decoded response."""
+    reader, writer = await asyncio.open_connection("127.0.0.1", port)
+    if body is None:
+        body = json.dumps(payload).encode("utf-8") if payload is not None else b""
+    if content_length is None:
+        content_length = len(body)
+    writer.write(
+        (
+            f"{method} {path} HTTP/1.1\r\n"
+            "Host: localhost\r\n"
+            f"Content-Length: {content_length}\r\n"
+            "Connection: close\r\n"
+            "\r\n"
+        ).encode("latin-1")
+        + body
+    )
+    await writer.drain()
+    response = await reader.read()
+    writer.close()
+    head, _, response_body = response.partition(b"\r\n\r\n")
+    return int(head.split()[1]), json.loads(response_body)
+
+
+def _run(coroutine_function, **kwargs):
+    """Run a coroutine function against a started service."""
+
+    async def run():
+        service = ScoringService(MatchDay(PLAYERS), **kwargs)
+        await service.start("127.0.0.1", 0)
+        try:
+            return await coroutine_function(service)
+        finally:
+            await service.close()
+
+    return asyncio.run(run())
+
+
+def test_parse_team_request():
+    """Testing the parsing of team submissions."""
+    payload, _ = _payload(0)
+    request = parse_team_request(payload)
+    assert [player.captain for player in request.players].count(True) == 1
+    assert request.players[-1].captain
+    assert len(request.substitutes) == 4
+    assert request.is_away
+    for invalid_payload in [
+        [],
+        {**payload, "line_up": None},
+        {**payload, "players": {}},
+        {**payload, "players": [{"name": "A"}]},
+        {**payload, "players": [{**payload["players"][0], "position": "ROOK"}]},
+        {**payload, "captain": "Nobody"},
+        {**payload, "is_away": "yes"},
+    ]:
+        with pytest.raises(InvalidTeamRequest):
+            parse_team_request(invalid_payload)
+    with pytest.raises(UnsupportedEngine):
+        ScoringService(MatchDay(PLAYERS), engine="unknown")
+
+
+def test_service_points():
+    """Testing concurrent submissions are batched and scored as Team.points."""
+    payloads = [_payload(offset, is_away=offset % 2 == 0) for offset in range(8)]
+
+    async def run(service):
+        responses = await asyncio.gather(
+            *(
+                _request(service.port, "POST", "/points", payload)
+                for payload, _ in payloads
+            )
+        )
+        return responses, service.stats
+
+    responses, stats = _run(run, batch_window=0.1)
+    for (status, response), (_, points) in zip(responses, payloads):
+        assert status == 200
+        assert response["points"] == pytest.approx(points)
+    assert stats["requests"] == len(payloads)
+    assert stats["batches"] < len(payloads)
+
+
+def test_service_errors():
+    """Testing invalid requests are rejected."""
+    payload, _ = _payload(0)
+
+    async def run(service):
+        return [
+            await _request(service.port, "POST", "/points", body=b"{"),
+            await _request(service.port, "POST", "/points", {"line_up": "4-4-2"}),
+            await _request(
+                service.port, "POST", "/points", {**payload, "line_up": "1-1-8"}
+            ),
+            await _request(service.port, "GET", "/points"),
+            await _request(service.port, "GET", "/unknown"),
+        ]
+
+    statuses = [status for status, _ in _run(run)]
+    assert statuses == [400, 400, 400, 405, 404]
+
+
+def test_service_content_length():
+    """Testing malformed Content-Length headers are rejected."""
+    payload, _ = _payload(0)
+    body = json.dumps(payload).encode("utf-8")
+
+    async def run(service):
+        return [
+            await _request(
+                service.port, "POST", "/points", body=body, content_length=length
+            )
+            for length in ["abc", "-1", "+12", "1_0", str(len(body))]
+        ]
+
+    statuses = [status for status, _ in _run(run)]
+    assert statuses == [400, 400, 400, 400, 200]
+
+
+def test_service_match_day():
+    """Testing health and the replacement of the match day."""
+    payload, _ = _payload(0)
+
+    async def run(service):
+        health = await _request(service.port, "GET", "/health")
+        replaced = await _request(
+            service.port,
+            "PUT",
+            "/match_day",
+            [
+                {**_to_dict(player), "points": 1.0, "minutes": 90.0}
+                for player in PLAYERS
+            ],
+        )
+        points = await _request(service.port, "POST", "/points", payload)
+        return health, replaced, points
+
+    health, replaced, points = _run(run)
+    assert health == (
+        200,
+        {"status": "ok", "players": len(PLAYERS), "requests": 0, "batches": 0},
+    )
+    assert replaced == (200, {"players": len(PLAYERS)})
+    # 10 players and the captain, no home bonus
+    assert points == (200, {"points": pytest.approx(11.5)})
@@ -0,0 +1,70 @@
+"""Testing simulation utilities."""
+
+import numpy as np
+import pkg_resources
+import pytest
+
+from ..optimizer import build_squad
+from ..player import Player
+from ..simulator import round_robin, simulate_seasons, team_points_history
+from ..team import score_teams
+
+PLAYER_JSONL_FILEPATH = pkg_resources.resource_filename(
+    "kickeststats", "resources/tests/players.jsonl"
+)
+PLAYERS = Player.from_jsonl(PLAYER_JSONL_FILEPATH)
+
+
+def test_round_robin():
+    """Testing the generation of a round-robin schedule."""
+    schedule = round_robin(10)
+    assert schedule.shape == (18, 5, 2)
+    for fixtures in schedule:
+        assert sorted(fixtures.ravel().tolist()) == list(range(10))
+    pairs = {(home, away) for home, away in schedule.reshape(-1, 2).tolist()}
+    assert len(pairs) == 90
+    assert round_robin(10, double=False).shape == (9, 5, 2)
+    with pytest.raises(ValueError):
+        _ = round_robin(9)
+
+
+def test_simulate_seasons():
+    """Testing the simulation of seasons."""
+    random_state = np.random.RandomState(42)
+    points_history = random_state.normal(
+        np.linspace(120.0, 160.0, 10).reshape(-1, 1), 15.0, size=(10, 30)
+    )
+    simulation = simulate_seasons(points_history, 1000, random_state=42)
+    assert simulation.points.shape == (1000, 10)
+    # 3 points per win, 2 in total per draw
+    played = simulation.points.sum(axis=1)
+    assert np.all((played >= 2 * 90) & (played <= 3 * 90))
+    np.testing.assert_array_equal(
+        simulation.goals_for.sum(axis=1), simulation.goals_against.sum(axis=1)
+    )
+    np.testing.assert_array_equal(
+        np.sort(simulation.ranks, axis=1), np.tile(np.arange(10), (1000, 1))
+    )
+    champions = np.argmin(simulation.ranks, axis=1)
+    assert np.all(
+        simulation.points[np.arange(1000), champions] == simulation.points.max(axis=1)
+    )
+    assert simulation.title_odds().sum() == pytest.approx(1.0)
+    assert simulation.relegation_odds(3).sum() == pytest.approx(3.0)
+    np.testing.assert_allclose(simulation.position_odds().sum(axis=0), 1.0)
+    # the strongest team is the most likely champion
+    assert np.argmax(simulation.title_odds()) == 9
+    # reproducible
+    np.testing.assert_array_equal(
+        simulate_seasons(points_history, 1000, random_state=42).ranks,
+        simulation.ranks,
+    )
+
+
+def test_team_points_history():
+    """Testing the computation of the points of teams for past match days."""
+    teams = [build_squad(PLAYERS, budget).to_team() for budget in [100.0, 200.0]]
+    points_history = team_points_history(teams, [PLAYERS, PLAYERS[::-1]])
+    assert points_history.shape == (2, 2)
+    np.testing.assert_array_equal(points_history[:, 0], score_teams(teams, PLAYERS))
+    np.testing.assert_array_equal(points_history[:, 0], points_history[:, 1])
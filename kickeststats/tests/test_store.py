@@ -0,0 +1,71 @@
+"""Testing statistics store utilities."""
+
+import pkg_resources
+
+from ..helpers.data import iter_jsonl
+from ..player import Player
+from ..store import StatisticsStore
+
+PLAYER_JSONL_FILEPATH = pkg_resources.resource_filename(
+    "kickeststats", "resources/tests/players.jsonl"
+)
+TEST_CASE_JSONL_FILEPATH = pkg_resources.resource_filename(
+    "kickeststats", "resources/tests/players_test_case.jsonl"
+)
+
+
+def test_statistics_store(tmp_path):
+    """Testing upsert and queries of the statistics store."""
+    filepath = str(tmp_path / "statistics.db")
+    with StatisticsStore(filepath) as store:
+        assert store.upsert_jsonl(PLAYER_JSONL_FILEPATH, "2020-21", 1) > 1
+        assert store.upsert_jsonl(TEST_CASE_JSONL_FILEPATH, "2020-21", 2) > 1
+    with StatisticsStore(filepath) as store:
+        assert store.get_match_days("2020-21") == [1, 2]
+        assert store.get_match_days("2021-22") == []
+        players = Player.from_jsonl(TEST_CASE_JSONL_FILEPATH)
+        assert store.get_players("2020-21", 2) == players
+        statistics_df = store.get_statistics(season="2020-21", match_day=2)
+        assert statistics_df.shape[0] == len(players)
+        forwards_df = store.get_statistics(position="FORWARD", team="ATA")
+        assert set(forwards_df["position"]) == {"FORWARD"}
+        assert set(forwards_df["team"]) == {"ATA"}
+        player_id = statistics_df.iloc[0]["player_id"]
+        player_df = store.get_statistics(player_id=player_id, expand=True)
+        assert player_df["match_day"].tolist() == [1, 2]
+        assert "Minuti" in player_df.columns
+        # upsert updates existing records
+        records = next(iter_jsonl(TEST_CASE_JSONL_FILEPATH))
+        records[0]["PTS"] = 100.0
+        assert store.upsert(records[:1], "2020-21", 2) == 1
+        assert store.get_statistics(season="2020-21", match_day=2).shape[0] == len(
+            players
+        )
+        assert store.get_players("2020-21", 2)[0].points == 100.0
+        assert (
+            store.query("SELECT COUNT(*) AS count FROM statistics").iloc[0]["count"]
+            == statistics_df.shape[0] + store.get_statistics(match_day=1).shape[0]
+        )
+
+
+def test_statistics_store_upsert():
+    """Testing repeated upserts of the same records."""
+    records = next(iter_jsonl(TEST_CASE_JSONL_FILEPATH))[:2]
+    with StatisticsStore() as store:
+        for points in [1.0, 2.0]:
+            assert (
+                store.upsert(
+                    [{**record, "PTS": points} for record in records], "2020-21", 1
+                )
+                == 2
+            )
+        # the last of duplicated records wins
+        assert store.upsert([records[0], {**records[0], "PTS": 3.0}], "2020-21", 1) == 2
+        assert [player.points for player in store.get_players("2020-21", 1)] == [
+            3.0,
+            2.0,
+        ]
+        assert (
+            store.query("SELECT COUNT(*) AS count FROM statistics").iloc[0]["count"]
+            == 2
+        )
@@ -0,0 +1,140 @@
+"""Testing season synchronization utilities."""
+
+import json
+import os
+from typing import List
+
+import pkg_resources
+import pytest
+
+from ..cache import Page, PageCache
+from ..download import get_url
+from ..helpers.data import iter_jsonl
+from ..store import StatisticsStore
+from ..sync import SYNC_STATE_FILENAME, get_jsonl_match_days, is_played, sync_season
+
+PLAYER_JSONL_FILEPATH = pkg_resources.resource_filename(
+    "kickeststats", "resources/tests/players.jsonl"
+)
+TEST_CASE_JSONL_FILEPATH = pkg_resources.resource_filename(
+    "kickeststats", "resources/tests/players_test_case.jsonl"
+)
+NOT_PLAYED = next(iter_jsonl(PLAYER_JSONL_FILEPATH))
+PLAYED = next(iter_jsonl(TEST_CASE_JSONL_FILEPATH))
+
+
+class FakeDownload:
+    """Download returning played match days up to a given one."""
+
+    def __init__(self, last_played: int) -> None:
+        self.last_played = last_played
+        self.calls: List[List[int]] = []
+
+    def __call__(self, match_days, output_dirpath=None, cache=None):
+        self.calls.append(list(match_days))
+        players_by_match_day = {
+            match_day: PLAYED if match_day <= self.last_played else NOT_PLAYED
+            for match_day in match_days
+        }
+        if output_dirpath is not None:
+            for match_day, players in players_by_match_day.items():
+                with open(
+                    os.path.join(output_dirpath, f"{match_day}.jsonl"), "wt"
+                ) as fp:
+                    fp.writelines(f"{json.dumps(player)}\n" for player in players)
+        return players_by_match_day
+
+
+def test_is_played():
+    assert is_played(PLAYED)
+    assert not is_played(NOT_PLAYED)
+    assert not is_played([])
+
+
+def test_sync_season(tmp_path):
+    """Testing only missing and stale match days are downloaded."""
+    dirpath = str(tmp_path / "season")
+    download = FakeDownload(last_played=2)
+    result = sync_season(range(1, 5), dirpath, download=download)
+    assert result == {"missing": [1, 2, 3, 4], "stale": [], "skipped": []}
+    assert get_jsonl_match_days(dirpath) == {1, 2, 3, 4}
+    # the last played and the following match days might be live
+    result = sync_season(range(1, 6), dirpath, download=download)
+    assert result == {"missing": [5], "stale": [2, 3, 4], "skipped": [1]}
+    # match day 2 is settled once match day 3 is played
+    download.last_played = 3
+    result = sync_season(range(1, 6), dirpath, download=download)
+    assert result == {"missing": [], "stale": [2, 3, 4, 5], "skipped": [1]}
+    result = sync_season(range(1, 6), dirpath, download=download)
+    assert result == {"missing": [], "stale": [3, 4, 5], "skipped": [1, 2]}
+    # files without a state are considered complete
+    os.remove(os.path.join(dirpath, "4.jsonl"))
+    with open(os.path.join(dirpath, "6.jsonl"), "wt"):
+        pass
+    result = sync_season([4, 6], dirpath, download=download)
+    assert result == {"missing": [4], "stale": [], "skipped": [6]}
+    assert download.calls[-1] == [4]
+
+
+def test_sync_season_finished(tmp_path):
+    """Testing a finished season is settled once the freshness window elapsed."""
+    dirpath = str(tmp_path / "season")
+    download = FakeDownload(last_played=3)
+    result = sync_season(range(1, 4), dirpath, download=download, freshness_window=0)
+    assert result == {"missing": [1, 2, 3], "stale": [], "skipped": []}
+    result = sync_season(range(1, 4), dirpath, download=download, freshness_window=0)
+    assert result == {"missing": [], "stale": [], "skipped": [1, 2, 3]}
+    assert download.calls == [[1, 2, 3], []]
+    # the last match day is live until first seen played for longer than the window
+    dirpath = str(tmp_path / "other_season")
+    sync_season(range(1, 4), dirpath, download=download)
+    result = sync_season(range(1, 4), dirpath, download=download)
+    assert result == {"missing": [], "stale": [3], "skipped": [1, 2]}
+    state_filepath = os.path.join(dirpath, SYNC_STATE_FILENAME)
+    with open(state_filepath) as fp:
+        state = json.load(fp)
+    state["3"]["played_at"] = "2020-01-01T00:00:00+00:00"
+    with open(state_filepath, "wt") as fp:
+        json.dump(state, fp)
+    result = sync_season(range(1, 4), dirpath, download=download)
+    assert result == {"missing": [], "stale": [3], "skipped": [1, 2]}
+    result = sync_season(range(1, 4), dirpath, download=download)
+    assert result == {"missing": [], "stale": [], "skipped": [1, 2, 3]}
+    assert download.calls[-1] == []
+
+
+def test_sync_season_store(tmp_path):
+    """Testing synchronization of a store."""
+    download = FakeDownload(last_played=1)
+    with StatisticsStore(str(tmp_path / "statistics.db")) as store:
+        store.upsert(PLAYED, "2020-21", 1)
+        result = sync_season([1, 2], store=store, season="2020-21", download=download)
+        assert result == {"missing": [2], "stale": [], "skipped": [1]}
+        assert store.get_match_days("2020-21") == [1, 2]
+        assert os.path.exists(str(tmp_path / "statistics.db.sync.json"))
+        # a day missing from the store is missing even if the file exists
+        dirpath = str(tmp_path / "season")
+        os.makedirs(dirpath)
+        with open(os.path.join(dirpath, "3.jsonl"), "wt"):
+            pass
+        result = sync_season(
+            [3], dirpath, store=store, season="2020-21", download=download
+        )
+        assert result == {"missing": [3], "stale": [], "skipped": []}
+    with pytest.raises(ValueError):
+        sync_season([1])
+    with pytest.raises(ValueError):
+        sync_season([1], store=StatisticsStore())
+
+
+def test_sync_season_cache(tmp_path):
+    """Testing cached pages of stale match days are cleared."""
+    dirpath = str(tmp_path / "season")
+    cache = PageCache(str(tmp_path / "cache"))
+    download = FakeDownload(last_played=0)
+    sync_season([1], dirpath, cache=cache, download=download)
+    cache.put(get_url(1), 1, Page("", "", ""))
+    cache.put(get_url(2), 1, Page("", "", ""))
+    sync_season([1, 2], dirpath, cache=cache, download=download)
+    assert cache.pages(get_url(1)) == []
+    assert cache.pages(get_url(2)) == [1]
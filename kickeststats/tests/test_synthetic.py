@@ -0,0 +1,74 @@
+"""Testing synthetic data generation utilities."""
+
+import pkg_resources
+
+from ..helpers.data import iter_jsonl
+from ..helpers.parsers import ElementParser, TableParser
+from ..helpers.synthetic import (
+    BENCH,
+    generate_players_data,
+    generate_teams,
+    render_stats_table,
+    write_players_jsonl,
+)
+from ..player import Player
+from ..team import score_teams
+
+TEST_CASE_JSONL_FILEPATH = pkg_resources.resource_filename(
+    "kickeststats", "resources/tests/players_test_case.jsonl"
+)
+TABLE_FILEPATH = pkg_resources.resource_filename(
+    "kickeststats", "resources/tests/stats_table.html"
+)
+TEMPLATE = next(iter_jsonl(TEST_CASE_JSONL_FILEPATH))
+
+
+def _parse_table(html):
+    """Player statistics in a rendered table."""
+    header_parser = ElementParser("statsTableTHead")
+    header_parser.feed(html)
+    data_parser = ElementParser("statsTableTBody")
+    data_parser.feed(html)
+    parser = TableParser()
+    parser.feed(header_parser.out())
+    parser.feed(data_parser.out())
+    return parser.out()
+
+
+def test_generate_players_data(tmp_path):
+    """Testing the generation of player statistics."""
+    players_data = generate_players_data(TEMPLATE, 2000, random_state=42)
+    assert len(players_data) == 2000
+    assert len({player["Giocatore"] for player in players_data}) == 2000
+    assert [player["#"] for player in players_data[:3]] == [1.0, 2.0, 3.0]
+    assert players_data == generate_players_data(TEMPLATE, 2000, random_state=42)
+    filepath = str(tmp_path / "players.jsonl")
+    write_players_jsonl(players_data, filepath)
+    players = Player.from_jsonl(filepath)
+    assert players == [Player.from_dict(player) for player in players_data]
+
+
+def test_render_stats_table():
+    """Testing the rendered table is parsed back to the same statistics."""
+    players_data = generate_players_data(TEMPLATE, 100, random_state=42)
+    assert _parse_table(render_stats_table(players_data)) == players_data
+    # the saved fixture is the rendered test case
+    assert _parse_table(open(TABLE_FILEPATH).read()) == TEMPLATE
+
+
+def test_generate_teams():
+    """Testing the generation of valid teams."""
+    players = [Player.from_dict(player) for player in TEMPLATE]
+    teams = generate_teams(players, 20, random_state=42)
+    assert len(teams) == 20
+    for team in teams:
+        assert team.players.shape[0] == 11
+        assert team.players["captain"].sum() == 1
+        assert team.substitutes.shape[0] == sum(BENCH.values())
+        assert set(team.players["_id"]).isdisjoint(team.substitutes["_id"])
+        counts = team.players["position_name"].value_counts().to_dict()
+        assert "-".join(
+            str(counts[position_name])
+            for position_name in ("DEFENDER", "MIDFIELDER", "FORWARD")
+        ) == str(team.line_up)
+    assert score_teams(teams, players).shape == (20,)
@@ -1,12 +1,33 @@
 """Testing team utilities."""
+
+import numpy as np
 import pandas as pd
 import pkg_resources
 import pytest
 from loguru import logger
 
-from kickeststats.exceptions import InvalidTeamLineup, UnsupportedLineUp
-from kickeststats.player import Player, Position
-from kickeststats.team import GOAL_GAP, GOAL_THRESHOLD, Team, points_to_goals
+from kickeststats.exceptions import (
+    InvalidTeamLineup,
+    UnsupportedEngine,
+    UnsupportedLineUp,
+)
+from kickeststats.player import Player, Position, get_player_id
+from kickeststats.team import (
+    AWAY_WIN,
+    DRAW,
+    GOAL_GAP,
+    GOAL_THRESHOLD,
+    HOME_WIN,
+    PROBED_LINE_UP,
+    PROFILE_BUCKETS,
+    STAGES,
+    StageProfile,
+    SubstitutionTrace,
+    Team,
+    evaluate_round,
+    points_to_goals,
+    score_teams,
+)
 
 PLAYER_JSONL_FILEPATH = pkg_resources.resource_filename(
     "kickeststats", "resources/tests/players.jsonl"
@@ -259,6 +280,13 @@ def test_team_initialization():
         _ = Team(
             players=_get_team("3-3-4"), substitutes=_get_team("2-2-2"), line_up="3-3-4"
         )
+    with pytest.raises(UnsupportedEngine):
+        _ = Team(
+            players=_get_team("4-3-3"),
+            substitutes=_get_team("2-2-2"),
+            line_up="4-3-3",
+            engine="X",
+        )
     _ = Team(
         players=_get_team("4-3-3"), substitutes=_get_team("2-2-2"), line_up="4-3-3"
     )
@@ -277,6 +305,182 @@ def test_team_points():
     assert team.points(PLAYERS_TEST_CASE, is_away=False) == 169.1
 
 
+def test_team_points_native_engine():
+    """Testing the native engine returns the same points as the pandas one."""
+    team = Team(
+        players=TEAM_PLAYERS,
+        substitutes=TEAM_SUBSTITUTES,
+        line_up="4-4-2",
+        engine="native",
+    )
+    reference_team = Team(
+        players=TEAM_PLAYERS, substitutes=TEAM_SUBSTITUTES, line_up="4-4-2"
+    )
+    for is_away in [True, False]:
+        assert team.points(PLAYERS_TEST_CASE, is_away=is_away) == (
+            reference_team.points(PLAYERS_TEST_CASE, is_away=is_away)
+        )
+    for line_up in ["3-4-3", "4-3-3", "3-5-2", "5-3-2", "4-5-1"]:
+        players = _get_team(line_up)
+        substitutes = _get_team("2-2-2")
+        team = Team(
+            players=players, substitutes=substitutes, line_up=line_up, engine="native"
+        )
+        reference_team = Team(players=players, substitutes=substitutes, line_up=line_up)
+        assert team.points(PLAYERS_TEST_CASE) == reference_team.points(
+            PLAYERS_TEST_CASE
+        )
+
+
+def test_team_points_substitutions():
+    """Testing substitutions and captaincy do not depend on the line-up."""
+
+    def player(name, position, points, minutes=90.0, captain=False):
+        return Player(name, position, "ATA", captain, 10.0, points, minutes)
+
+    players = (
+        [
+            player("GK", Position.GOALKEEPER, 2.0, minutes=0.0, captain=True),
+            player("D0", Position.DEFENDER, 1.0, minutes=0.0),
+        ]
+        + [player(f"D{index}", Position.DEFENDER, 10.0) for index in range(1, 5)]
+        + [player(f"M{index}", Position.MIDFIELDER, 10.0) for index in range(4)]
+        + [player("F0", Position.FORWARD, 10.0)]
+    )
+    substitutes = [player("S0", Position.DEFENDER, 20.0)]
+    for engine in ["pandas", "native"]:
+        team = Team(players, "5-4-1", substitutes, engine=engine)
+        trace = SubstitutionTrace()
+        # the captain is replaced first, by the only substitute left after the
+        # position limits, who becomes captain: 91 + 1.5 * 20
+        assert team.points(players + substitutes, trace=trace) == 121.0
+        assert trace.replaced == [get_player_id("GK", "GOALKEEPER", "ATA")]
+        assert trace.captain_substitute == get_player_id("S0", "DEFENDER", "ATA")
+        assert trace.line_up == PROBED_LINE_UP
+
+
+def test_team_points_trace():
+    """Testing the trace of the substitutions."""
+    captain = TEAM_PLAYERS[5]
+    substitute = TEAM_SUBSTITUTES[0]
+    traces = []
+    for engine in ["pandas", "native"]:
+        team = Team(
+            players=TEAM_PLAYERS,
+            substitutes=TEAM_SUBSTITUTES,
+            line_up="4-4-2",
+            engine=engine,
+        )
+        trace = SubstitutionTrace()
+        _ = team.points(PLAYERS_TEST_CASE, trace=trace)
+        assert trace.captain == get_player_id(
+            captain.name, captain.position.name, captain.team
+        )
+        assert trace.captain in trace.candidates
+        assert trace.replaced[0] == trace.captain
+        assert len(trace.replaced) == len(trace.replacements) == 2
+        assert trace.captain_substitute == get_player_id(
+            substitute.name, substitute.position.name, substitute.team
+        )
+        assert trace.line_up is not None
+        assert len(trace.players) == 11
+        traces.append(trace)
+    assert traces[0] == traces[1]
+
+
+def test_team_points_profile():
+    """Testing the profile of the stages."""
+    for engine in ["pandas", "native"]:
+        team = Team(
+            players=TEAM_PLAYERS,
+            substitutes=TEAM_SUBSTITUTES,
+            line_up="4-4-2",
+            engine=engine,
+        )
+        profile = StageProfile()
+        points = [team.points(PLAYERS_TEST_CASE, profile=profile) for _ in range(3)]
+        assert points == [team.points(PLAYERS_TEST_CASE)] * 3
+        summary = profile.summary()
+        assert list(summary) == list(STAGES)
+        for stage, stage_summary in summary.items():
+            assert stage_summary["calls"] == 3
+            assert stage_summary["seconds"] > 0.0
+            assert stage_summary["mean"] == stage_summary["seconds"] / 3
+            assert len(profile.histograms[stage]) == len(PROFILE_BUCKETS) + 1
+            assert sum(profile.histograms[stage]) == 3
+        # without substitutes only building and summing are timed
+        team = Team(players=TEAM_PLAYERS, line_up="4-4-2", engine=engine)
+        profile.reset()
+        _ = score_teams([team, team], PLAYERS_TEST_CASE, profile=profile)
+        assert profile.calls == {"data_frame": 2, "points": 2}
+    profile = StageProfile()
+    profile.record("points", 5e-4)
+    profile.record("points", 2.0)
+    assert profile.histograms["points"] == [0, 0, 0, 1, 0, 0, 0, 1]
+
+
+def test_score_teams():
+    """Testing the points calculation of many teams at once."""
+    teams = [
+        Team(players=TEAM_PLAYERS, substitutes=TEAM_SUBSTITUTES, line_up="4-4-2")
+    ] + [
+        Team(
+            players=_get_team(line_up),
+            substitutes=_get_team("2-2-2"),
+            line_up=line_up,
+        )
+        for line_up in ["3-4-3", "4-3-3", "3-5-2", "5-4-1"]
+    ]
+    teams.append(
+        Team(
+            players=TEAM_PLAYERS,
+            substitutes=TEAM_SUBSTITUTES,
+            line_up="4-4-2",
+            engine="native",
+        )
+    )
+    points = score_teams(teams, PLAYERS_TEST_CASE)
+    assert points.tolist() == [team.points(PLAYERS_TEST_CASE) for team in teams]
+    is_away = [index % 2 == 0 for index in range(len(teams))]
+    points = score_teams(teams, PLAYERS_TEST_CASE, is_away=is_away)
+    assert points.tolist() == [
+        team.points(PLAYERS_TEST_CASE, is_away=team_is_away)
+        for team, team_is_away in zip(teams, is_away)
+    ]
+    with pytest.raises(ValueError):
+        _ = score_teams(teams, PLAYERS_TEST_CASE, is_away=[True])
+
+
+def test_evaluate_round():
+    """Testing the evaluation of the fixtures of a round."""
+    teams = {
+        line_up: Team(
+            players=_get_team(line_up),
+            substitutes=_get_team("2-2-2"),
+            line_up=line_up,
+        )
+        for line_up in ["3-4-3", "4-3-3", "3-5-2", "5-4-1"]
+    }
+    fixtures = [("3-4-3", "4-3-3"), ("5-4-1", "3-5-2")]
+    round_df = evaluate_round(fixtures, teams, PLAYERS_TEST_CASE)
+    assert list(round_df[["home", "away"]].itertuples(index=False, name=None)) == (
+        fixtures
+    )
+    for (home, away), row in zip(fixtures, round_df.itertuples()):
+        assert row.home_points == teams[home].points(PLAYERS_TEST_CASE, is_away=False)
+        assert row.away_points == teams[away].points(PLAYERS_TEST_CASE, is_away=True)
+        assert row.home_goals == points_to_goals(row.home_points)
+        assert row.away_goals == points_to_goals(row.away_points)
+        if row.home_goals > row.away_goals:
+            assert row.result == HOME_WIN
+        elif row.home_goals < row.away_goals:
+            assert row.result == AWAY_WIN
+        else:
+            assert row.result == DRAW
+    with pytest.raises(KeyError):
+        _ = evaluate_round([("3-4-3", "4-4-2")], teams, PLAYERS_TEST_CASE)
+
+
 def test_points_to_goals():
     """Testing the conversion from points to goals."""
     points = GOAL_THRESHOLD - GOAL_GAP // 2
@@ -287,3 +491,49 @@ def test_points_to_goals():
         assert goals == converted_goals
         goals += 1
         points += GOAL_GAP
+
+
+def _points_to_goals_loop(points: float, goal_threshold: float, goal_gap: float) -> int:
+    """Reference conversion from points to goals."""
+    goals = 0
+    threshold = goal_threshold
+    while points >= threshold:
+        goals += 1
+        threshold += goal_gap
+    return goals
+
+
+@pytest.mark.parametrize(
+    "goal_threshold,goal_gap", [(GOAL_THRESHOLD, GOAL_GAP), (0.3, 0.1), (66.6, 6.6)]
+)
+def test_points_to_goals_vectorized(monkeypatch, goal_threshold, goal_gap):
+    """Testing the conversion from points to goals of lists and arrays."""
+    monkeypatch.setattr("kickeststats.team.GOAL_THRESHOLD", goal_threshold)
+    monkeypatch.setattr("kickeststats.team.GOAL_GAP", goal_gap)
+    # boundaries accumulated like the loop and their neighbours
+    thresholds = [goal_threshold]
+    for _ in range(50):
+        thresholds.append(thresholds[-1] + goal_gap)
+    points = np.concatenate(
+        [
+            thresholds,
+            np.nextafter(thresholds, -np.inf),
+            np.nextafter(thresholds, np.inf),
+            np.linspace(-10.0, thresholds[-1], 1000),
+            [np.nan, -np.inf, 0.0],
+        ]
+    )
+    expected = [
+        _points_to_goals_loop(value, goal_threshold, goal_gap) for value in points
+    ]
+    goals = points_to_goals(points)
+    assert isinstance(goals, np.ndarray)
+    assert goals.tolist() == expected
+    assert points_to_goals(points.tolist()) == expected
+    np.testing.assert_array_equal(
+        points_to_goals(points.reshape(-1, 2)), np.reshape(expected, (-1, 2))
+    )
+    assert [points_to_goals(value) for value in points.tolist()] == expected
+    assert isinstance(points_to_goals(float(points[0])), int)
+    with pytest.raises(ValueError):
+        _ = points_to_goals([np.inf])
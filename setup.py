@@ -21,9 +21,16 @@ setup(
             "py.typed",
             "resources/tests/players.jsonl",
             "resources/tests/players_test_case.jsonl",
+            "resources/tests/stats_table.html",
+            "resources/tests/stats_table_page_*.html",
             "resources/drivers/chromedriver",
         ]
     },
     install_requires=REQUIRED,
-    scripts=["bin/kickeststats-download-data", "bin/kickeststats-jsonl-to-csv"],
+    scripts=[
+        "bin/kickeststats-download-data",
+        "bin/kickeststats-jsonl-to-csv",
+        "bin/kickeststats-serve",
+        "bin/kickeststats-sync-season",
+    ],
 )